@@ -0,0 +1,126 @@
+"""Shared set-up and measurements of pathway model benchmarks."""
+
+import calliope
+from pyomo.repn import generate_standard_repn
+
+# `asv` timeouts are per benchmark (in seconds); solving larger models takes a while.
+TIMEOUT = 1800
+
+NATIONAL_SCALE_NODES = ["region1", "region2", "region1_1", "region1_2", "region1_3"]
+
+# Scenarios of the national-scale example model, as `override_dict`s.
+NATIONAL_SCALE_SCENARIOS = {
+    "base": {},
+    "flow_cap_new_max_rate": {
+        "parameters.flow_cap_new_max_rate": {
+            "data": 0.75,
+            "index": [2020, 2030, 2040, 2050],
+            "dims": "investsteps",
+        }
+    },
+}
+
+
+def national_scale_overrides(
+    time_resample: str = "24h", n_nodes: int = 5, scenario: str = "base"
+) -> dict:
+    """Overrides to initialise the national-scale example model with, deactivating all but its first `n_nodes` nodes."""
+    return {
+        "config.init.time_resample": time_resample,
+        **{f"nodes.{node}.active": False for node in NATIONAL_SCALE_NODES[n_nodes:]},
+        **NATIONAL_SCALE_SCENARIOS[scenario],
+    }
+
+
+def keep_investsteps(model: calliope.Model, n_investsteps: int) -> calliope.Model:
+    """Reduce an initialised model to its first `n_investsteps` investsteps (and the vintages commissioned in them)."""
+    investsteps = model._model_data.investsteps[:n_investsteps]
+    model._model_data = model._model_data.sel(
+        investsteps=investsteps, vintagesteps=investsteps.values
+    )
+    return model
+
+
+def lp_size(model: calliope.Model) -> dict[str, int]:
+    """Number of variables, constraints and (linear) non-zero coefficients of a built model."""
+    instance = model.backend._instance
+    constraints = [c for cs in instance.constraints.values() for c in cs if c.active]
+    return {
+        "variables": sum(len(v) for v in instance.variables.values()),
+        "constraints": len(constraints),
+        "nonzeros": sum(
+            len(generate_standard_repn(c.body).linear_vars) for c in constraints
+        ),
+    }
+
+
+class InitBenchmarks:
+    """Time of initialising and pre-processing a model.
+
+    Benchmark classes combine these with a model definition class, which defines
+    `params`, `param_names`, `init_model(*params)` and `preprocess(*params)`
+    (and optionally `setup_preprocess(*params)`, to prepare the input of `preprocess`).
+    """
+
+    timeout = TIMEOUT
+
+    def setup(self, *params):
+        self.setup_preprocess(*params)
+
+    def setup_preprocess(self, *params):
+        pass
+
+    def time_init(self, *params):
+        self.init_model(*params)
+
+    def time_preprocess(self, *params):
+        self.preprocess(*params)
+
+
+class BuildBenchmarks:
+    """Time, peak memory and optimisation problem size of building a model."""
+
+    timeout = TIMEOUT
+
+    def setup(self, *params):
+        self.model = self.init_model(*params)
+
+    def time_build(self, *params):
+        self.model.build(force=True)
+
+    def peakmem_build(self, *params):
+        self.model.build(force=True)
+
+    def track_lp_variables(self, *params):
+        self.model.build(force=True)
+        return lp_size(self.model)["variables"]
+
+    track_lp_variables.unit = "variables"
+
+    def track_lp_constraints(self, *params):
+        self.model.build(force=True)
+        return lp_size(self.model)["constraints"]
+
+    track_lp_constraints.unit = "constraints"
+
+    def track_lp_nonzeros(self, *params):
+        self.model.build(force=True)
+        return lp_size(self.model)["nonzeros"]
+
+    track_lp_nonzeros.unit = "nonzeros"
+
+
+class SolveBenchmarks:
+    """Time and peak memory of solving a built model."""
+
+    timeout = TIMEOUT
+
+    def setup(self, *params):
+        self.model = self.init_model(*params)
+        self.model.build()
+
+    def time_solve(self, *params):
+        self.model.solve(force=True)
+
+    def peakmem_solve(self, *params):
+        self.model.solve(force=True)
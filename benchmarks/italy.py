@@ -0,0 +1,49 @@
+"""Benchmarks of the Italy example model (`calliope_pathways.models.italy`).
+
+Pre-processing downloads its inputs on first use (see `calliope_pathways.resolver`).
+"""
+
+from calliope_pathways import models
+from calliope_pathways.model_configs import parse_lombardi
+
+from . import common
+
+FIRST_YEAR = 2025
+
+
+class Italy:
+    params = ([2035, 2050], [5, 10], [None, "flow_cap_new_max_rate"])
+    param_names = ["final_year", "investstep_resolution", "scenario"]
+
+    def init_model(self, final_year, investstep_resolution, scenario):
+        _check_params(final_year, investstep_resolution, scenario)
+        # The first initialisation pre-processes input data into the on-disk cache, so later ones only time initialisation.
+        return models.italy(
+            FIRST_YEAR, final_year, investstep_resolution, scenario=scenario
+        )
+
+    def setup_preprocess(self, final_year, investstep_resolution, scenario):
+        _check_params(final_year, investstep_resolution, scenario)
+
+    def preprocess(self, final_year, investstep_resolution, scenario):
+        parse_lombardi.data_tables(FIRST_YEAR, final_year, investstep_resolution)
+
+
+def _check_params(final_year, investstep_resolution, scenario):
+    if scenario == "flow_cap_new_max_rate" and (
+        investstep_resolution != 5 or final_year != 2050
+    ):
+        # The scenario is only defined for 5-yearly investsteps up to 2050.
+        raise NotImplementedError
+
+
+class ItalyInit(Italy, common.InitBenchmarks):
+    pass
+
+
+class ItalyBuild(Italy, common.BuildBenchmarks):
+    pass
+
+
+class ItalySolve(Italy, common.SolveBenchmarks):
+    pass
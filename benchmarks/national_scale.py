@@ -0,0 +1,42 @@
+"""Benchmarks of the national-scale example model (`calliope_pathways.models.national_scale`)."""
+
+from calliope_pathways import compact, models
+from calliope_pathways.util import src_dir_ref
+
+from . import common
+
+
+class NationalScale:
+    params = (["24h", "6h"], [2, 4], [2, 5], list(common.NATIONAL_SCALE_SCENARIOS))
+    param_names = ["time_resample", "n_investsteps", "n_nodes", "scenario"]
+
+    def init_model(self, time_resample, n_investsteps, n_nodes, scenario):
+        model = models.national_scale(
+            override_dict=common.national_scale_overrides(
+                time_resample, n_nodes, scenario
+            )
+        )
+        return common.keep_investsteps(model, n_investsteps)
+
+    def preprocess(self, *params):
+        compact.compact_investsteps(self.raw_data)
+
+    def setup_preprocess(self, time_resample, n_investsteps, n_nodes, scenario):
+        self.raw_data = models._init_model(
+            src_dir_ref("model_configs") / "national_scale" / "model.yaml",
+            override_dict=common.national_scale_overrides(
+                time_resample, n_nodes, scenario
+            ),
+        )._model_data
+
+
+class NationalScaleInit(NationalScale, common.InitBenchmarks):
+    pass
+
+
+class NationalScaleBuild(NationalScale, common.BuildBenchmarks):
+    pass
+
+
+class NationalScaleSolve(NationalScale, common.SolveBenchmarks):
+    pass
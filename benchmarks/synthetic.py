@@ -0,0 +1,50 @@
+"""Benchmarks of synthetic pathway models (`calliope_pathways.models.synthetic`), swept over their size."""
+
+from calliope_pathways import compact, models, synthetic
+
+from . import common
+
+
+class Synthetic:
+    params = ([4, 16, 64], [168, 720], [4, 8], synthetic.VINTAGE_PATTERNS)
+    param_names = ["nodes", "timesteps", "investsteps", "vintage_pattern"]
+
+    def init_model(self, nodes, timesteps, investsteps, vintage_pattern):
+        return models.synthetic(_scale(nodes, timesteps, investsteps, vintage_pattern))
+
+    def setup_preprocess(self, nodes, timesteps, investsteps, vintage_pattern):
+        model_definition, data_source_dfs = synthetic.model_definition(
+            **_scale(nodes, timesteps, investsteps, vintage_pattern)
+        )
+        self.raw_data = models._init_model(
+            model_definition, data_source_dfs=data_source_dfs
+        )._model_data
+
+    def preprocess(self, *params):
+        compact.compact_investsteps(self.raw_data)
+
+
+def _scale(nodes, timesteps, investsteps, vintage_pattern) -> dict:
+    return {
+        "nodes": nodes,
+        "timesteps": timesteps,
+        "investsteps": investsteps,
+        "investstep_resolution": 40 // investsteps,
+        "vintage_pattern": vintage_pattern,
+    }
+
+
+class SyntheticInit(Synthetic, common.InitBenchmarks):
+    pass
+
+
+class SyntheticBuild(Synthetic, common.BuildBenchmarks):
+    pass
+
+
+class SyntheticSolve(Synthetic, common.SolveBenchmarks):
+    def setup(self, nodes, timesteps, investsteps, vintage_pattern):
+        if nodes > 16:
+            # Solving the largest models takes longer than the benchmark timeout.
+            raise NotImplementedError
+        super().setup(nodes, timesteps, investsteps, vintage_pattern)
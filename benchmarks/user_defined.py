@@ -0,0 +1,44 @@
+"""Benchmarks of loading a user-defined model (`calliope_pathways.models.load`), using the Calliope national-scale example model."""
+
+import calliope
+
+from calliope_pathways import compact, models
+
+from . import common
+
+MODEL_DEFINITION = (
+    calliope.examples._EXAMPLE_MODEL_DIR / "national_scale" / "model.yaml"
+)
+
+
+class UserDefined:
+    params = [False, True]
+    param_names = ["add_pathways_math"]
+
+    def init_model(self, add_pathways_math):
+        return models.load(MODEL_DEFINITION, add_pathways_math=add_pathways_math)
+
+    def setup_preprocess(self, add_pathways_math):
+        self.raw_data = models._init_model(MODEL_DEFINITION)._model_data
+
+    def preprocess(self, add_pathways_math):
+        compact.compact_investsteps(self.raw_data)
+
+
+class UserDefinedInit(UserDefined, common.InitBenchmarks):
+    pass
+
+
+class UserDefinedBuild(UserDefined, common.BuildBenchmarks):
+    def setup(self, add_pathways_math):
+        if add_pathways_math:
+            # The example model has no investsteps to build the pathways math over.
+            raise NotImplementedError
+        super().setup(add_pathways_math)
+
+
+class UserDefinedSolve(UserDefined, common.SolveBenchmarks):
+    def setup(self, add_pathways_math):
+        if add_pathways_math:
+            raise NotImplementedError
+        super().setup(add_pathways_math)
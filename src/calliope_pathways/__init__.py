@@ -1,4 +1,5 @@
-from calliope_pathways import models
+import importlib
+
 from calliope_pathways._version import __version__
 
 __title__ = "Calliope pathway optimisation"
@@ -6,3 +7,37 @@ __author__ = "Calliope pathways contributors listed in AUTHORS"
 __copyright__ = (
     "Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS"
 )
+
+# Submodules are only imported on first access (e.g., `calliope_pathways.models`),
+# so that importing the package does not import Calliope and its dependencies.
+_SUBMODULES = [
+    "batch",
+    "cache",
+    "clustering",
+    "coarse_to_fine",
+    "compact",
+    "decomposition",
+    "export",
+    "helper_functions",
+    "model_configs",
+    "models",
+    "myopic",
+    "profiling",
+    "resampling",
+    "resolver",
+    "scenarios",
+    "snapshots",
+    "synthetic",
+    "util",
+    "validation",
+]
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_SUBMODULES])
@@ -0,0 +1,201 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Parallel batch runs of scenarios over a shared base model.
+
+The input data of the base model is written once to `<out_dir>/inputs/<hash of the input data>`,
+with numeric arrays stored as `.npy` files that every worker process memory-maps read-only,
+so that they are shared between workers through the operating system page cache.
+The parameters each scenario changes (see `calliope_pathways.scenarios.changed_parameters`) are found in the main process,
+one run at a time, and only these are passed to the worker running it.
+Each worker therefore only holds in memory the parameters its scenario changes and the optimisation problem it builds.
+
+Results of each run are written to `<out_dir>/results/<run name>.nc` as soon as it finishes.
+Runs with a results file are skipped, so an interrupted batch (e.g., after a worker crashed) resumes where it stopped.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import xarray as xr
+from calliope import io
+from calliope.model import Model
+
+from calliope_pathways import cache, scenarios
+from calliope_pathways.util import register_extensions
+
+LOGGER = logging.getLogger(__name__)
+
+_INPUTS_DIR = "inputs"
+_RESULTS_DIR = "results"
+_MEMMAPPED = "memmapped_arrays"
+
+
+def run_batch(
+    model: Model,
+    runs: dict[str, dict],
+    out_dir: str | Path,
+    processes: Optional[int] = None,
+    **kwargs,
+) -> dict[str, Path]:
+    """Build and solve scenarios of a base model in parallel, writing the results of each to file.
+
+    Args:
+        model (Model): Initialised pathway model loaded from file (e.g., `models.italy()`).
+        runs (dict[str, dict]):
+            Per run name, the `scenario` and/or `override_dict` to apply to `model` (see `calliope_pathways.scenarios.scenario_inputs`).
+            E.g., `{"base": {}, "slow_expansion": {"scenario": "flow_cap_new_max_rate"}}`.
+        out_dir (str | Path): Directory to store shared inputs and results in.
+        processes (Optional[int], optional):
+            Number of worker processes.
+            Defaults to None (as many as there are runs, up to the number of CPUs).
+        **kwargs: Solve configuration overrides (e.g., `solver`), as in `model.solve(...)`.
+
+    Returns:
+        dict[str, Path]: Per successful run name, path to its results file.
+    """
+    out_dir = Path(out_dir)
+    results_dir = out_dir / _RESULTS_DIR
+    results_dir.mkdir(parents=True, exist_ok=True)
+    inputs = model._model_data.filter_by_attrs(is_result=0)
+    inputs.attrs = model._model_data.attrs
+    inputs_dir = out_dir / _INPUTS_DIR / _inputs_key(inputs)
+    if not (inputs_dir / "inputs.nc").exists():
+        # Inputs of a different base model are stale.
+        shutil.rmtree(out_dir / _INPUTS_DIR, ignore_errors=True)
+        write_shared_inputs(inputs, inputs_dir)
+
+    paths = {name: results_dir / f"{name}.nc" for name in runs}
+    to_run = {name: run for name, run in runs.items() if not paths[name].exists()}
+    if len(to_run) < len(runs):
+        LOGGER.info(
+            f"Batch | skipping {len(runs) - len(to_run)} run(s) with existing results."
+        )
+    processes = processes or min(len(to_run), os.cpu_count() or 1) or 1
+    failed = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {}
+        # Submitted one at a time, so that workers start solving while later scenarios are being compared to the base model.
+        for name, run in to_run.items():
+            try:
+                changes, attrs = _scenario_changes(model, inputs, run)
+            except Exception as error:
+                LOGGER.error(f"Batch | {name} | failed: {error}")
+                failed.append(name)
+                continue
+            future = executor.submit(
+                _run, inputs_dir, changes, attrs, paths[name], kwargs
+            )
+            futures[future] = name
+            del changes
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+            except BrokenProcessPool:
+                raise
+            except Exception as error:
+                LOGGER.error(f"Batch | {name} | failed: {error}")
+                failed.append(name)
+            else:
+                LOGGER.info(f"Batch | {name} | results written to {paths[name]}.")
+    if failed:
+        LOGGER.warning(
+            f"Batch | {len(failed)} run(s) failed and can be retried by re-running the batch: {failed}."
+        )
+    return {name: path for name, path in paths.items() if path.exists()}
+
+
+def write_shared_inputs(inputs: xr.Dataset, path: str | Path) -> None:
+    """Write model input data to a directory, with numeric arrays stored such that they can be memory-mapped (see `read_shared_inputs`)."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    memmapped = {}
+    for name, da in inputs.data_vars.items():
+        if da.dtype.kind not in "fiub":
+            continue
+        np.save(path / f"{name}.npy", da.values)
+        memmapped[name] = {"dims": list(da.dims), "attrs": da.attrs}
+    skeleton = inputs.drop_vars(list(memmapped))
+    skeleton.attrs = {**inputs.attrs, _MEMMAPPED: memmapped}
+    # Written last, so that an existing `inputs.nc` marks a complete set of inputs.
+    io.save_netcdf(skeleton, path / "inputs.nc.tmp")
+    os.replace(path / "inputs.nc.tmp", path / "inputs.nc")
+
+
+def read_shared_inputs(path: str | Path) -> xr.Dataset:
+    """Read model input data written by `write_shared_inputs`, with numeric arrays memory-mapped read-only."""
+    path = Path(path)
+    inputs = io.read_netcdf(path / "inputs.nc")
+    memmapped = inputs.attrs.pop(_MEMMAPPED)
+    for name, meta in memmapped.items():
+        inputs[name] = xr.DataArray(
+            np.load(path / f"{name}.npy", mmap_mode="r"),
+            dims=meta["dims"],
+            attrs=meta["attrs"],
+        )
+    return inputs
+
+
+def _inputs_key(inputs: xr.Dataset) -> str:
+    """Content hash of model input data, computed array by array without copying arrays."""
+    digest = hashlib.sha256()
+    for name in sorted(inputs.variables):
+        da = inputs.variables[name]
+        digest.update(
+            cache.fingerprint(name, da.dims, str(da.dtype), da.attrs).encode()
+        )
+        if da.dtype.kind in "fiub":
+            digest.update(memoryview(np.ascontiguousarray(da.values)).cast("B"))
+        else:
+            digest.update(cache.fingerprint(da.values.tolist()).encode())
+    digest.update(cache.fingerprint(inputs.attrs).encode())
+    return digest.hexdigest()
+
+
+def _scenario_changes(
+    model: Model, inputs: xr.Dataset, run: dict
+) -> tuple[dict[str, Optional[xr.DataArray]], dict]:
+    """Parameters that a run changes with respect to the base model inputs (None if it removes them), and the attributes of its inputs."""
+    new_inputs = scenarios.scenario_inputs(model, **run)
+    changes = {
+        name: new_inputs[name] if name in new_inputs else None
+        for name in scenarios.changed_parameters(inputs, new_inputs)
+    }
+    return changes, new_inputs.attrs
+
+
+def _run(
+    inputs_dir: Path,
+    changes: dict[str, Optional[xr.DataArray]],
+    attrs: dict,
+    results_path: Path,
+    solve_kwargs: dict,
+) -> None:
+    register_extensions()
+    inputs = read_shared_inputs(inputs_dir)
+    for name, values in changes.items():
+        if values is not None:
+            inputs[name] = values
+        else:
+            inputs = inputs.drop_vars(name)
+    inputs.attrs = attrs
+
+    model = Model(inputs)
+    model.build()
+    model.solve(**solve_kwargs)
+    if model._model_data.attrs["termination_condition"] != "optimal":
+        raise ValueError(
+            f"optimisation problem is {model._model_data.attrs['termination_condition']}."
+        )
+    tmp_path = results_path.with_suffix(".nc.tmp")
+    model.to_netcdf(tmp_path)
+    os.replace(tmp_path, results_path)
@@ -0,0 +1,159 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Content-addressed on-disk cache for pre-processed model data.
+
+Cache entries are directories stored under `<cache root>/<namespace>/<key>`,
+where the key is a hash of everything that influences the directory contents.
+Entries are created atomically and evicted least-recently-used first once the total size of a namespace exceeds its limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR = "CALLIOPE_PATHWAYS_CACHE_DIR"
+CACHE_MAX_BYTES_ENV_VAR = "CALLIOPE_PATHWAYS_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 500 * 1024**2
+_LAST_USED_FILE = ".last_used"
+
+
+def cache_root() -> Path:
+    """Top-level cache directory.
+
+    Set by the `CALLIOPE_PATHWAYS_CACHE_DIR` environment variable, otherwise `$XDG_CACHE_HOME/calliope_pathways` (default: `~/.cache/calliope_pathways`).
+    """
+    if CACHE_DIR_ENV_VAR in os.environ:
+        return Path(os.environ[CACHE_DIR_ENV_VAR])
+    xdg_cache = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(xdg_cache) / "calliope_pathways"
+
+
+def file_hash(path: str | Path) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024**2), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 hex digest of JSON-serialisable (or `str`-able) objects."""
+    serialised = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(serialised.encode()).hexdigest()
+
+
+def cached_directory(
+    namespace: str,
+    key: str,
+    builder: Callable[[Path], Any],
+    root: Optional[str | Path] = None,
+    max_bytes: Optional[int] = None,
+) -> Path:
+    """Get a cache entry directory, building it first if it does not exist.
+
+    Args:
+        namespace (str): Cache sub-directory, to separate entries of different types.
+        key (str): Content hash identifying the entry (see `fingerprint`).
+        builder (Callable[[Path], Any]):
+            Function to populate an empty directory with the entry contents.
+            Only called on a cache miss.
+        root (Optional[str | Path], optional): Cache root directory. Defaults to `cache_root()`.
+        max_bytes (Optional[int], optional):
+            Maximum size of all entries in `namespace`.
+            Defaults to the `CALLIOPE_PATHWAYS_CACHE_MAX_BYTES` environment variable, or 500MB if that is not set.
+
+    Returns:
+        Path: Cache entry directory.
+    """
+    namespace_dir = Path(root if root is not None else cache_root()) / namespace
+    entry_dir = namespace_dir / key
+    if entry_dir.is_dir():
+        LOGGER.debug(f"Cache | {namespace} | Hit on entry {key}.")
+        _touch(entry_dir)
+        return entry_dir
+
+    LOGGER.info(f"Cache | {namespace} | Building entry {key}.")
+    namespace_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=namespace_dir))
+    try:
+        builder(tmp_dir)
+        _touch(tmp_dir)
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        # Another process created the same entry while we were building ours.
+        if not entry_dir.is_dir():
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    evict(namespace, root=root, max_bytes=max_bytes, keep=key)
+    return entry_dir
+
+
+def evict(
+    namespace: str,
+    root: Optional[str | Path] = None,
+    max_bytes: Optional[int] = None,
+    keep: Optional[str] = None,
+) -> list[str]:
+    """Remove least-recently-used entries until a namespace fits within its size limit.
+
+    Args:
+        namespace (str): Cache sub-directory.
+        root (Optional[str | Path], optional): Cache root directory. Defaults to `cache_root()`.
+        max_bytes (Optional[int], optional): Size limit. Defaults as in `cached_directory`.
+        keep (Optional[str], optional): Entry key that should never be evicted. Defaults to None.
+
+    Returns:
+        list[str]: Keys of evicted entries.
+    """
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV_VAR, DEFAULT_MAX_BYTES))
+    namespace_dir = Path(root if root is not None else cache_root()) / namespace
+    if not namespace_dir.is_dir():
+        return []
+
+    entries = [
+        entry
+        for entry in namespace_dir.iterdir()
+        if entry.is_dir() and not entry.name.startswith(".")
+    ]
+    sizes = {entry.name: _dir_size(entry) for entry in entries}
+    total = sum(sizes.values())
+    evicted = []
+    for entry in sorted(entries, key=_last_used):
+        if total <= max_bytes:
+            break
+        if entry.name == keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry.name]
+        evicted.append(entry.name)
+        LOGGER.debug(f"Cache | {namespace} | Evicted entry {entry.name}.")
+    return evicted
+
+
+def _touch(entry_dir: Path) -> None:
+    (entry_dir / _LAST_USED_FILE).write_text(str(time.time()))
+
+
+def _last_used(entry_dir: Path) -> float:
+    try:
+        return float((entry_dir / _LAST_USED_FILE).read_text())
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
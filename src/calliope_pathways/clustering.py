@@ -0,0 +1,220 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Representative day clustering of pathway model timeseries, per investstep.
+
+Days are clustered by k-medoids on their (normalised) timeseries inputs, e.g. demand and resource availability,
+separately for each investstep since these can change between investsteps.
+The number of representative days can also differ between investsteps.
+
+All representative days are kept in the model timeseries, with `timestep_weights` indexed over `investsteps`:
+in each investstep, a representative day is weighted by the number of days it represents (zero if it does not represent any).
+Storage is cyclic within each representative day, so there is no storage level to carry over between investsteps
+and `link_storage_level` is deactivated.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from calliope.model import Model
+
+LOGGER = logging.getLogger(__name__)
+
+_TIME_PARAMS = ["timestep_resolution", "timestep_weights"]
+_MAX_ITERATIONS = 100
+
+
+def cluster_days(
+    model: Model,
+    n_clusters: int | dict,
+    parameters: Optional[list[str]] = None,
+    seed: int = 0,
+) -> Model:
+    """Reduce the model timeseries to representative days per investstep, in place.
+
+    Args:
+        model (Model): Initialised (not built) pathway model.
+        n_clusters (int | dict):
+            Number of representative days per investstep.
+            If a dictionary, the number for each investstep (e.g., `{2020: 6, 2030: 12}`).
+        parameters (Optional[list[str]], optional):
+            Timeseries parameters to cluster days on.
+            Defaults to None (all numeric timeseries parameters).
+        seed (int, optional): Seed of the random initial choice of medoids. Defaults to 0.
+
+    Raises:
+        ValueError: Model is already built.
+
+    Returns:
+        Model: `model`, with clustered timeseries.
+    """
+    if model._is_built:
+        raise ValueError("Clustering must be applied before building a model.")
+    clusters = day_clusters(model._model_data, n_clusters, parameters, seed)
+    model._model_data = apply_day_clusters(model._model_data, clusters)
+    if "link_storage_level" in model.math["constraints"]:
+        model.math["constraints"]["link_storage_level"]["active"] = False
+        LOGGER.info(
+            "Clustering | storage is cyclic within representative days; deactivated `link_storage_level`."
+        )
+    return model
+
+
+def day_clusters(
+    model_data: xr.Dataset,
+    n_clusters: int | dict,
+    parameters: Optional[list[str]] = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Map each day to its representative day, per investstep.
+
+    Args:
+        model_data (xr.Dataset): Model data with (sub-daily or daily) `timesteps` and `investsteps`.
+        n_clusters (int | dict): Number of representative days, for all or per investstep (see `cluster_days`).
+        parameters (Optional[list[str]], optional): Timeseries parameters to cluster days on (see `cluster_days`).
+        seed (int, optional): Seed of the random initial choice of medoids. Defaults to 0.
+
+    Raises:
+        ValueError: Days do not all have the same number of timesteps.
+        ValueError: More representative days are requested than there are days.
+
+    Returns:
+        pd.DataFrame: Representative date (values) of each date (index) in each investstep (columns).
+    """
+    if parameters is None:
+        parameters = [
+            name
+            for name, da in model_data.filter_by_attrs(is_result=0).data_vars.items()
+            if "timesteps" in da.dims
+            and da.dtype.kind in "fiu"
+            and name not in _TIME_PARAMS
+            and not name.startswith("lookup_")
+        ]
+    dates = model_data.timesteps.dt.floor("D").to_index()
+    days = dates.unique()
+    if (
+        len(dates) % len(days)
+        or not (dates.value_counts() == len(dates) // len(days)).all()
+    ):
+        raise ValueError(
+            "Clustering requires all days to have the same number of timesteps."
+        )
+
+    investsteps = model_data.investsteps.to_index()
+    if not isinstance(n_clusters, dict):
+        n_clusters = {investstep: n_clusters for investstep in investsteps}
+    n_clusters = {pd.Timestamp(str(k)): v for k, v in n_clusters.items()}
+
+    mapping = {}
+    for investstep in investsteps:
+        features = _day_features(model_data[parameters], investstep, len(days))
+        k = n_clusters[investstep]
+        if k > len(days):
+            raise ValueError(
+                f"Cannot cluster {len(days)} days into {k} representative days."
+            )
+        medoids, labels = _k_medoids(features, k, np.random.default_rng(seed))
+        mapping[investstep] = days[medoids[labels]]
+    return pd.DataFrame(mapping, index=days).rename_axis(
+        index="datesteps", columns="investsteps"
+    )
+
+
+def apply_day_clusters(model_data: xr.Dataset, clusters: pd.DataFrame) -> xr.Dataset:
+    """Reduce model timeseries to representative days (see `day_clusters`), reweighting them per investstep.
+
+    Args:
+        model_data (xr.Dataset): Model data.
+        clusters (pd.DataFrame): Representative date of each date in each investstep.
+
+    Returns:
+        xr.Dataset: Model data with only the timesteps of representative days.
+    """
+    representative_days = pd.DatetimeIndex(np.unique(clusters.values))
+    dates = model_data.timesteps.dt.floor("D")
+    model_data = model_data.sel(timesteps=dates.isin(representative_days).values)
+    dates = model_data.timesteps.dt.floor("D")
+
+    counts = xr.DataArray(
+        clusters.apply(lambda days: days.value_counts())
+        .reindex(representative_days)
+        .fillna(0)
+        .rename_axis(index="dates", columns="investsteps")
+    ).assign_coords(investsteps=model_data.investsteps)
+    weights = counts.sel(dates=dates).drop_vars("dates") * model_data.timestep_weights
+    if (weights == weights.isel(investsteps=0)).all():
+        weights = weights.isel(investsteps=0, drop=True)
+    model_data["timestep_weights"] = weights.transpose("timesteps", ...).assign_attrs(
+        model_data.timestep_weights.attrs
+    )
+
+    timesteps = model_data.timesteps.to_series()
+    by_date = timesteps.groupby(dates.to_index())
+    model_data["timestep_cluster"] = xr.DataArray(
+        by_date.ngroup().values, dims="timesteps"
+    ).assign_attrs(is_result=0)
+    model_data["lookup_cluster_first_timestep"] = xr.DataArray(
+        timesteps.isin(by_date.first()).values, dims="timesteps"
+    ).assign_attrs(is_result=0)
+    model_data["lookup_cluster_last_timestep"] = xr.DataArray(
+        by_date.transform("last").values, dims="timesteps"
+    ).assign_attrs(is_result=0)
+    model_data.attrs["allow_operate_mode"] = 0
+    return model_data
+
+
+def _day_features(data: xr.Dataset, investstep, n_days: int) -> np.ndarray:
+    """Min-max normalised timeseries of each day in an investstep, as a (days x features) array."""
+    features = []
+    for da in data.data_vars.values():
+        if "investsteps" in da.dims:
+            da = da.sel(investsteps=investstep, drop=True)
+        values = da.transpose("timesteps", ...).values.astype(float)
+        values = np.nan_to_num(values.reshape(n_days, -1), posinf=0, neginf=0)
+        span = values.max() - values.min()
+        features.append((values - values.min()) / span if span > 0 else values * 0)
+    return np.concatenate(features, axis=1)
+
+
+def _k_medoids(
+    features: np.ndarray, k: int, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Cluster rows of `features` by alternating k-medoids, with k-means++ initialisation.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Indices of medoid rows, and the cluster of each row.
+    """
+    distances = np.sqrt(
+        np.maximum(
+            (features**2).sum(axis=1)[:, None]
+            + (features**2).sum(axis=1)[None, :]
+            - 2 * features @ features.T,
+            0,
+        )
+    )
+    medoids = [rng.integers(len(features))]
+    for _ in range(1, k):
+        closest = distances[:, medoids].min(axis=1) ** 2
+        if closest.sum() == 0:
+            medoids.append(rng.choice(np.setdiff1d(np.arange(len(features)), medoids)))
+        else:
+            medoids.append(rng.choice(len(features), p=closest / closest.sum()))
+    medoids = np.array(medoids)
+
+    for _ in range(_MAX_ITERATIONS):
+        labels = distances[:, medoids].argmin(axis=1)
+        new_medoids = medoids.copy()
+        for cluster in range(k):
+            members = np.flatnonzero(labels == cluster)
+            if members.size:
+                within = distances[np.ix_(members, members)].sum(axis=1)
+                new_medoids[cluster] = members[within.argmin()]
+        if (new_medoids == medoids).all():
+            break
+        medoids = new_medoids
+    labels = distances[:, medoids].argmin(axis=1)
+    return medoids, labels
@@ -0,0 +1,293 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Coarse-to-fine solve of pathway models.
+
+The pathway is first optimised with timeseries resampled to a coarse resolution (e.g., daily),
+a problem that is a fraction of the size of the full-resolution one.
+Its capacity decisions (i.e., the `*_new` vintage decisions) are then used to reduce and warm-start the full-resolution problem:
+
+- New capacity is bounded to `headroom` times the coarse new capacity (or its original upper bound, if lower).
+New capacity in vintages that the coarse solution does not build is left unbounded,
+as capacity built later at coarse resolution may be needed earlier at full resolution.
+- If `prune` is True, new capacity of technologies at nodes (and carriers) where the coarse solution never builds them is fixed to zero
+(the decisions remain in the optimisation problem, with an upper bound of zero).
+- Vintage decisions start from their coarse values (for solvers supporting warm starts).
+
+The reduced problem is re-solved until none of the tightened bounds is binding, releasing binding bounds to their original value each time.
+Since the optimisation problem is a linear programme, an optimum at which no tightened bound is binding is also the full-resolution optimum.
+Pruning is a heuristic: the reduced optimum is only guaranteed to be the full-resolution optimum if `prune` is False (the default).
+Results in which pruned decisions are still fixed to zero are marked with the `coarse_to_fine_pruned` attribute.
+If the reduced problem is not solved to optimality, or it relies on unmet demand / unused supply (see `config.build.ensure_feasibility`),
+all bounds are released and the full-resolution problem is solved without any reduction.
+"""
+
+import logging
+import time
+
+import numpy as np
+import xarray as xr
+from calliope.backend.backend_model import BackendModel
+from calliope.model import Model
+from calliope.preprocess import time as preprocess_time
+from calliope.util.schema import update_then_validate_config
+
+from calliope_pathways.util import register_extensions, store_results
+
+LOGGER = logging.getLogger(__name__)
+
+_VINTAGE_VARIABLES = [
+    "flow_cap_new",
+    "storage_cap_new",
+    "source_cap_new",
+    "area_use_new",
+]
+# Solvers for which Calliope disables warm starts.
+_NO_WARMSTART = ["cbc", "glpk"]
+# Relative tolerance within which a decision is considered to be at its upper bound.
+_BINDING_RTOL = 1e-6
+
+
+def solve_coarse_to_fine(
+    model: Model,
+    coarse_resolution: str = "1D",
+    headroom: float = 1.5,
+    prune: bool = False,
+    max_iterations: int = 5,
+    **kwargs,
+) -> None:
+    """Solve a pathway model at full resolution, reduced and warm-started by a solve at coarse resolution, storing the results in the model as `model.solve()` would.
+
+    Args:
+        model (Model): Initialised (not necessarily built) pathway model.
+        coarse_resolution (str, optional): Resolution (pandas frequency string) of the coarse solve. Defaults to "1D".
+        headroom (float, optional): Upper bound of new capacity relative to the coarse new capacity. Defaults to 1.5.
+        prune (bool, optional):
+            If True, technologies (at nodes) without new capacity in the coarse solve get none in the full-resolution problem,
+            in which case the results are not guaranteed to be the full-resolution optimum.
+            Defaults to False.
+        max_iterations (int, optional):
+            Maximum number of solves after which only binding bounds are released.
+            If bounds are still binding after these, all tightened bounds (other than those fixed to zero by pruning)
+            are released for a final solve.
+            Defaults to 5.
+        **kwargs: Solve configuration overrides (e.g., `solver`), as in `model.solve(...)`.
+
+    Raises:
+        ValueError: Model has no investsteps or its timeseries have been clustered / resampled per investstep.
+        ValueError: `coarse_resolution` is not coarser than the model resolution.
+        ValueError: `headroom` is less than 1 or `max_iterations` is less than 1.
+        ValueError: The coarse or the full-resolution optimisation problem could not be solved to optimality.
+    """
+    register_extensions()
+    inputs = model._model_data.filter_by_attrs(is_result=0)
+    inputs.attrs = model._model_data.attrs
+    if "investsteps" not in inputs.dims:
+        raise ValueError(
+            "Coarse-to-fine optimisation requires a model with `investsteps`."
+        )
+    if "timestep_cluster" in inputs or "lookup_investsteps" in inputs:
+        raise ValueError(
+            "Cannot resample a model with clustered or per-investstep timeseries."
+        )
+    if headroom < 1:
+        raise ValueError(f"Headroom must be at least 1, got {headroom}.")
+    if max_iterations < 1:
+        raise ValueError(f"At least one iteration is required, got {max_iterations}.")
+
+    build_config = model.config["build"]
+    solve_config = update_then_validate_config("solve", model.config, **kwargs)
+    warmstart = solve_config["solver"] not in _NO_WARMSTART
+
+    start = time.time()
+    coarse_inputs = _coarse_inputs(inputs, coarse_resolution)
+    backend = model._BACKENDS[build_config["backend"]](coarse_inputs, **build_config)
+    backend._build()
+    results = backend._solve(warmstart=False, **solve_config)
+    termination = results.attrs["termination_condition"]
+    LOGGER.info(
+        f"Coarse-to-fine | coarse ({coarse_inputs.sizes['timesteps']} timesteps) | "
+        f"{termination} ({time.time() - start:.1f}s)."
+    )
+    if termination != "optimal":
+        raise ValueError(
+            f"Coarse-to-fine | coarse optimisation problem is {termination}."
+        )
+    coarse = {
+        name: backend.get_variable(name, as_backend_objs=False).astype(float)
+        for name in _VINTAGE_VARIABLES
+        if name in backend.variables
+    }
+
+    backend = model._BACKENDS[build_config["backend"]](inputs, **build_config)
+    backend._build()
+    _warmstart(backend, coarse)
+    bounds, pruned = _tighten_bounds(backend, coarse, headroom, prune)
+    iterations = 0
+    while True:
+        iterations += 1
+        results = backend._solve(warmstart=warmstart, **solve_config)
+        termination = results.attrs["termination_condition"]
+        LOGGER.info(
+            f"Coarse-to-fine | iteration {iterations} | {termination} "
+            f"({time.time() - start:.1f}s)."
+        )
+        reduced = any(original.notnull().any() for original in bounds.values())
+        if termination != "optimal" or _relies_on_unmet_demand(results):
+            if not reduced:
+                break
+            LOGGER.warning(
+                f"Coarse-to-fine | iteration {iterations} | reduced optimisation problem is {termination}"
+                f"{' with unmet demand' if termination == 'optimal' else ''}; releasing all bounds."
+            )
+            release = {name: original.notnull() for name, original in bounds.items()}
+        else:
+            release = _binding_bounds(backend, bounds, pruned)
+            if not any(mask.any() for mask in release.values()):
+                break
+            if iterations >= max_iterations:
+                release = {
+                    name: original.notnull() & ~pruned[name]
+                    for name, original in bounds.items()
+                }
+        released = _release_bounds(backend, bounds, release)
+        LOGGER.info(
+            f"Coarse-to-fine | iteration {iterations} | {released} bound(s) released."
+        )
+    if termination != "optimal":
+        raise ValueError(f"Coarse-to-fine | optimisation problem is {termination}.")
+
+    still_pruned = sum(
+        int((original.notnull() & pruned[name]).sum())
+        for name, original in bounds.items()
+    )
+    if still_pruned:
+        LOGGER.warning(
+            f"Coarse-to-fine | {still_pruned} new capacity decision(s) fixed to zero by pruning; "
+            "results are not guaranteed to be the full-resolution optimum."
+        )
+    results.attrs.update(
+        {
+            "coarse_to_fine_resolution": coarse_resolution,
+            "coarse_to_fine_iterations": iterations,
+            "coarse_to_fine_pruned": still_pruned,
+        }
+    )
+    store_results(model, results)
+
+
+def _coarse_inputs(inputs: xr.Dataset, resolution: str) -> xr.Dataset:
+    """Inputs with timeseries resampled to the coarse resolution."""
+    coarse_inputs = preprocess_time.resample(inputs, resolution)
+    if coarse_inputs.sizes["timesteps"] >= inputs.sizes["timesteps"]:
+        raise ValueError(
+            f"Coarse resolution `{resolution}` is not coarser than the model resolution."
+        )
+    for name, da in coarse_inputs.data_vars.items():
+        da.attrs = inputs[name].attrs
+    coarse_inputs.attrs = inputs.attrs
+    return coarse_inputs
+
+
+def _warmstart(backend: BackendModel, coarse: dict[str, xr.DataArray]) -> None:
+    """Start vintage decisions from their coarse values."""
+    for var, val in _paired(backend, coarse):
+        var.value = val
+
+
+def _tighten_bounds(
+    backend: BackendModel, coarse: dict[str, xr.DataArray], headroom: float, prune: bool
+) -> tuple[dict[str, xr.DataArray], dict[str, xr.DataArray]]:
+    """Bound new capacity by the coarse new capacity, in vintages the coarse solution builds.
+
+    If `prune` is True, new capacity is also fixed to zero in all vintages at nodes (and carriers) the coarse solution never builds it.
+
+    Returns:
+        tuple[dict[str, xr.DataArray], dict[str, xr.DataArray]]:
+            Original upper bounds (`inf` if unbounded) of tightened decisions, NaN elsewhere,
+            and whether decisions are fixed to zero by pruning.
+    """
+    bounds = {}
+    pruned = {}
+    for name, values in coarse.items():
+        if name not in backend.variables:
+            continue
+        variable = backend.get_variable(name)
+        original = backend.get_variable_bounds(name).ub.astype(float).fillna(np.inf)
+        values = values.reindex_like(variable).transpose(*variable.dims)
+        defined = variable.notnull() & values.notnull()
+        upper = np.minimum(original, values * headroom)
+        tightened = defined & (values > 0) & (upper < original)
+        pruned[name] = defined & ~(values > 0).any("vintagesteps") & prune
+        upper = upper.where(~pruned[name], 0)
+        tightened |= pruned[name]
+        for var, ub in zip(
+            variable.values[tightened.values], upper.values[tightened.values]
+        ):
+            var.ub = ub
+        bounds[name] = original.where(tightened)
+        LOGGER.debug(
+            f"Coarse-to-fine | {name} | {int(tightened.sum())} upper bound(s) tightened, "
+            f"{int(pruned[name].sum())} of which fixed to zero."
+        )
+    return bounds, pruned
+
+
+def _binding_bounds(
+    backend: BackendModel,
+    bounds: dict[str, xr.DataArray],
+    pruned: dict[str, xr.DataArray],
+) -> dict[str, xr.DataArray]:
+    """Tightened (and not yet released) bounds, other than those fixed to zero by pruning, that optimal new capacity is at."""
+    binding = {}
+    for name, original in bounds.items():
+        values = backend.get_variable(name, as_backend_objs=False).astype(float)
+        upper = backend.get_variable_bounds(name).ub.astype(float)
+        binding[name] = (
+            original.notnull()
+            & ~pruned[name]
+            & (values >= upper - _BINDING_RTOL * np.maximum(1, abs(upper)))
+        )
+    return binding
+
+
+def _release_bounds(
+    backend: BackendModel,
+    bounds: dict[str, xr.DataArray],
+    release: dict[str, xr.DataArray],
+) -> int:
+    """Reset tightened bounds to their original values, in place of `bounds`.
+
+    Returns:
+        int: Number of bounds released.
+    """
+    released = 0
+    for name, mask in release.items():
+        mask = mask.fillna(False).astype(bool)
+        variable = backend.get_variable(name)
+        original = bounds[name]
+        for var, ub in zip(variable.values[mask.values], original.values[mask.values]):
+            var.ub = None if np.isinf(ub) else ub
+        bounds[name] = original.where(~mask)
+        released += int(mask.sum())
+    return released
+
+
+def _relies_on_unmet_demand(results: xr.Dataset) -> bool:
+    """Whether optimal results include unmet demand or unused supply."""
+    return any(
+        name in results and bool((abs(results[name]) > 0).any())
+        for name in ["unmet_demand", "unused_supply"]
+    )
+
+
+def _paired(backend: BackendModel, values: dict[str, xr.DataArray]):
+    """Backend decision variable objects paired with values, where both are defined."""
+    for name, da in values.items():
+        if name not in backend.variables:
+            continue
+        variable = backend.get_variable(name)
+        da = da.reindex_like(variable).transpose(*variable.dims)
+        mask = (variable.notnull() & da.notnull()).values
+        yield from zip(variable.values[mask], da.values[mask])
@@ -0,0 +1,128 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Compact model input data over the `investsteps` dimension.
+
+Pathway models are often defined with inputs repeated over every investment step (e.g., the same demand profile for every investstep).
+Storing these inputs over `investsteps` makes input memory and file size grow linearly with the number of investsteps,
+although the optimisation problem only needs them to be broadcast over `investsteps` when its expressions are built.
+
+Compaction is lossless:
+
+1. Parameters that do not vary over `investsteps` are stored without the `investsteps` dimension.
+2. Sink / source use parameters that only vary over `investsteps` by a scalar growth factor are stored as their first investstep values,
+with the growth factor stored in `sink_use_growth` / `source_use_growth`.
+3. Zero vintage availabilities are dropped, so that only the (investstep, vintagestep) pairs in which a vintage is available
+are added to the optimisation problem (see `prune_vintages`).
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import xarray as xr
+
+LOGGER = logging.getLogger(__name__)
+
+# Growth factor parameters and the parameters they scale in the pathways math.
+GROWTH_PARAMS = {
+    "sink_use_growth": ["sink_use_equals", "sink_use_min", "sink_use_max"],
+    "source_use_growth": ["source_use_equals", "source_use_min", "source_use_max"],
+}
+
+
+def compact_investsteps(model_data: xr.Dataset, rtol: float = 1e-9) -> xr.Dataset:
+    """Drop the `investsteps` dimension from input parameters wherever it carries no information.
+
+    Args:
+        model_data (xr.Dataset): Calliope model input data.
+        rtol (float, optional):
+            Relative tolerance when checking that values scaled by a growth factor reproduce the original values.
+            Defaults to 1e-9.
+
+    Returns:
+        xr.Dataset: `model_data` with compacted parameters.
+    """
+    if "investsteps" not in model_data.dims:
+        return model_data
+
+    updates = {}
+    for growth_name, param_names in GROWTH_PARAMS.items():
+        if growth_name in model_data:
+            continue
+        arrays = [model_data[name] for name in param_names if name in model_data]
+        if not arrays or any("investsteps" not in array.dims for array in arrays):
+            continue
+        growth = _growth_factor(arrays, rtol)
+        if growth is None or (growth == 1).all():
+            continue
+        LOGGER.info(
+            f"Compact | {growth_name} | Factorised {[array.name for array in arrays]}."
+        )
+        for array in arrays:
+            updates[array.name] = array.isel(investsteps=0, drop=True)
+        updates[growth_name] = growth.assign_attrs(is_result=0, default=1)
+
+    for name, array in model_data.data_vars.items():
+        if name in updates or "investsteps" not in array.dims:
+            continue
+        if array.attrs.get("is_result", 0) == 0 and _is_invariant(array):
+            LOGGER.debug(f"Compact | {name} | Dropped `investsteps` dimension.")
+            updates[name] = array.isel(investsteps=0, drop=True)
+
+    return prune_vintages(
+        model_data.drop_vars(updates.keys(), errors="ignore").assign(updates)
+    )
+
+
+def prune_vintages(model_data: xr.Dataset) -> xr.Dataset:
+    """Drop zero `available_vintages` values, which are equivalent to undefined values in the pathways math.
+
+    Vintage capacity only contributes to an investstep where its availability is defined,
+    so pruning zeros keeps vintage variables and their terms in capacity and cost expressions to the
+    (investstep, vintagestep) pairs in which a vintage is available (typically vintage <= investstep, within the technology lifetime).
+
+    Args:
+        model_data (xr.Dataset): Calliope model input data.
+
+    Returns:
+        xr.Dataset: `model_data` with zero vintage availabilities set to NaN.
+    """
+    if "available_vintages" not in model_data:
+        return model_data
+    available = model_data["available_vintages"]
+    pruned = available.where(available != 0)
+    LOGGER.debug(
+        f"Compact | available_vintages | Kept {int(pruned.count())} of {available.size} (investstep, vintagestep) pairs."
+    )
+    return model_data.assign(available_vintages=pruned.assign_attrs(available.attrs))
+
+
+def _is_invariant(array: xr.DataArray) -> bool:
+    first = array.isel(investsteps=0, drop=True)
+    return bool(((array == first) | (array.isnull() & first.isnull())).all())
+
+
+def _growth_factor(arrays: list[xr.DataArray], rtol: float) -> Optional[xr.DataArray]:
+    """Get the per-investstep factor by which all `arrays` scale their first investstep values, if there is one."""
+    growth = None
+    for array in arrays:
+        first = array.isel(investsteps=0, drop=True)
+        reference = first.where(first != 0)
+        array_growth = (array / reference).median(
+            [dim for dim in array.dims if dim != "investsteps"]
+        )
+        if array_growth.isnull().any():
+            return None
+        if growth is None:
+            growth = array_growth
+        elif not np.allclose(growth, array_growth, rtol=rtol, atol=0):
+            return None
+        scaled = first * growth
+        matches = abs(scaled - array) <= rtol * abs(array)
+        if not bool((matches | (array.isnull() & scaled.isnull())).all()):
+            return None
+    return growth.drop_vars(
+        [coord for coord in growth.coords if coord != "investsteps"]
+    )
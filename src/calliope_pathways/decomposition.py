@@ -0,0 +1,968 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Benders decomposition of pathway models over investsteps.
+
+Apart from a handful of constraints on capacities (e.g., `flow_cap_bounding`, `limit_flow_cap_new_max_rate`),
+a pathway model is a set of independent operational problems, one per investstep.
+The decomposition splits the model into:
+
+1. A master problem, with all math components that are not indexed over `timesteps` (the capacity / vintage decisions and their investment costs),
+plus one variable per investstep approximating that investstep's operating cost.
+2. One subproblem per investstep, with the capacity decisions fixed to the master problem solution.
+
+The storage level carried from one investstep to the next (`link_storage_level`) is decided in the master problem,
+with the storage levels at the start and end of each investstep fixed in the subproblems as capacities are.
+Other math linking operation between investsteps cannot be decomposed.
+
+Subproblems are solved concurrently in worker processes, each of which keeps its subproblems built between iterations.
+Master problem decisions are fixed in the subproblems by constraints with penalised deviations.
+If a subproblem is feasible, the duals of those constraints give an optimality cut on its operating cost in the master problem;
+if it is not, the duals of its minimum-deviation solution give a feasibility cut.
+Iterations stop when the gap between the master problem (lower bound) and the best feasible total cost (upper bound) is within tolerance.
+
+Unmet demand / unused supply (see `config.build.ensure_feasibility`) are not allowed in the subproblems:
+an investstep that relies on them is infeasible, as optimality cuts on their `bigM` cost would make the master problem numerically intractable.
+Models that cannot be solved without unmet demand therefore cannot be decomposed.
+
+To speed up convergence, subproblems are solved at a point between the master problem solution and the best feasible solution
+("in-out" stabilisation) and, if they are infeasible there, again at the master problem solution closest to (and with at least) the capacities and storage levels they need.
+The objective is assumed to be `min_cost_optimisation`.
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+import time
+from typing import Optional
+
+import numpy as np
+import pyomo.environ as pe
+import pyomo.kernel as pmo
+import xarray as xr
+from calliope import AttrDict
+from calliope.backend.pyomo_backend_model import PyomoBackendModel
+from calliope.model import Model
+from calliope.util.schema import update_then_validate_config
+from pyomo.opt import SolverFactory
+
+from calliope_pathways.util import register_extensions, store_results
+
+LOGGER = logging.getLogger(__name__)
+
+_COMPONENT_GROUPS = ["variables", "global_expressions", "constraints", "objectives"]
+_FIXED_PREFIX = "benders_"
+# Deviation from each fixed master variable (absolute, plus relative to its value) within which a subproblem is considered feasible.
+_DEVIATION_ATOL = 1e-3
+_DEVIATION_RTOL = 1e-6
+_INVESTMENT_COST = "cost_investment"
+_COST = "cost"
+_CENTRE_WEIGHT = 0.5
+# Violation of a cut, relative to its constant, beyond which it separates the master problem solution.
+_CUT_RTOL = 1e-6
+# Variables that make operation feasible at `bigM` cost (see `config.build.ensure_feasibility`).
+_UNMET_DEMAND = ["unmet_demand", "unused_supply"]
+_STORAGE_LINK = "link_storage_level"
+# Master problem variables carrying `link_storage_level`, which are global expressions of the storage level in the subproblems.
+_STORAGE_LINK_START = "storage_investstep_start"
+_STORAGE_LINK_END = "storage_investstep_end"
+
+
+def solve_benders(
+    model: Model,
+    processes: Optional[int] = None,
+    max_iterations: int = 100,
+    tolerance: float = 1e-4,
+    **kwargs,
+) -> None:
+    """Solve a pathway model by Benders decomposition over investsteps, storing the results in the model as `model.solve()` would.
+
+    Only linear models can be decomposed.
+
+    Args:
+        model (Model): Initialised (not necessarily built) pathway model.
+        processes (Optional[int], optional):
+            Number of worker processes to solve subproblems in.
+            If 1, subproblems are solved in the current process.
+            Defaults to None (as many as there are investsteps, up to the number of CPUs).
+        max_iterations (int, optional): Maximum number of master problem iterations. Defaults to 100.
+        tolerance (float, optional): Relative gap between upper and lower bound at which to stop. Defaults to 1e-4.
+        **kwargs: Solve configuration overrides (e.g., `solver`), as in `model.solve(...)`.
+
+    Raises:
+        ValueError: Model has no investsteps, uses a non-pyomo backend, or includes integer decisions.
+        ValueError: Model math links operation between investsteps other than by `link_storage_level`.
+        ValueError: Operation in an investstep is infeasible without unmet demand / unused supply.
+    """
+    register_extensions()
+    inputs = model._model_data.filter_by_attrs(is_result=0)
+    inputs.attrs = model._model_data.attrs
+    if "investsteps" not in inputs.dims:
+        raise ValueError("Benders decomposition requires a model with `investsteps`.")
+    if model.config["build"]["backend"] != "pyomo":
+        raise ValueError("Benders decomposition is only available for `pyomo`.")
+    if "cap_method" in inputs and (inputs.cap_method == "integer").any():
+        raise ValueError("Benders decomposition is only available for linear models.")
+
+    solve_config = update_then_validate_config("solve", model.config, **kwargs)
+    master_math, subproblem_math = split_math(model.math)
+    master = _Master(_with_math(inputs, master_math), model.config["build"])
+    investsteps = inputs.investsteps.values
+    processes = processes or min(len(investsteps), os.cpu_count() or 1)
+    pool = _SubproblemPool(
+        _with_math(inputs, subproblem_math),
+        master.fixing_templates(
+            _linking_variables(subproblem_math, master.variable_names)
+        ),
+        model.config["build"],
+        solve_config,
+        processes,
+    )
+    start = time.time()
+    try:
+        relaxed = pool.solve(None)
+        if not _is_feasible(relaxed):
+            infeasible = [
+                str(investstep)
+                for investstep, result in relaxed.items()
+                if result["objective"] is None
+            ]
+            raise ValueError(
+                f"Benders | Operation in investsteps {infeasible} is infeasible without unmet demand / unused supply."
+            )
+        master.set_cost_lower_bounds(
+            {investstep: result["objective"] for investstep, result in relaxed.items()}
+        )
+        # In-out stabilisation: cuts are separated between the master problem solution and a stability centre,
+        # the best feasible solution found so far or, initially,
+        # the master problem solution closest to the capacities chosen by unconstrained subproblems.
+        centre = master.solve_at_least(_stack_values(relaxed), solve_config)
+
+        best = (np.inf, None)
+        gap = np.inf
+        for iteration in range(1, max_iterations + 1):
+            lower_bound = master.solve(solve_config)
+            values = {
+                name: _CENTRE_WEIGHT * centre[name] + (1 - _CENTRE_WEIGHT) * value
+                for name, value in master.values().items()
+            }
+            results = pool.solve(values)
+            if not _add_cuts(master, results, values):
+                # Cuts at the stabilised point do not separate the master problem solution:
+                # move the stability centre towards it.
+                centre = values
+            if not _is_feasible(results):
+                # Repair: the master problem solution closest to the capacities the subproblems would need.
+                values = master.solve_at_least(_stack_values(results), solve_config)
+                results = pool.solve(values)
+                _add_cuts(master, results, values)
+            if _is_feasible(results):
+                upper_bound = master.investment_cost_at(values) + sum(
+                    result["objective"] for result in results.values()
+                )
+                if upper_bound < best[0]:
+                    best = (upper_bound, values)
+                    centre = values
+            gap = (
+                (best[0] - lower_bound) / max(abs(best[0]), 1e-10)
+                if best[1] is not None
+                else np.inf
+            )
+            LOGGER.info(
+                f"Benders | iteration {iteration} | lower bound {lower_bound:.6g}, "
+                f"upper bound {best[0]:.6g}, gap {gap:.3g} ({time.time() - start:.1f}s)."
+            )
+            if gap <= tolerance:
+                break
+        else:
+            LOGGER.warning(
+                f"Benders | Did not converge within {max_iterations} iterations (gap {gap:.3g})."
+            )
+        if best[1] is None:
+            raise ValueError(
+                "Benders | No master problem solution was found that is feasible in all subproblems."
+            )
+
+        subproblem_results = [
+            result["results"]
+            for result in pool.solve(best[1], load_results=True).values()
+        ]
+    finally:
+        pool.close()
+
+    results = _combine_results(subproblem_results, master, best[1])
+    results.attrs = {
+        "termination_condition": "optimal" if gap <= tolerance else "feasible",
+        "benders_iterations": iteration,
+        "benders_gap": gap,
+    }
+    store_results(model, results)
+
+
+def _combine_results(
+    subproblem_results: list[xr.Dataset],
+    master: "_Master",
+    values: dict[str, xr.DataArray],
+) -> xr.Dataset:
+    """Results of the full model, from subproblem results and the master problem solution.
+
+    Master problem global expressions (e.g., investment costs) are inactive in the subproblems,
+    so total costs are completed with the investment costs in the master problem.
+    """
+    master_expressions = master.global_expressions_at(values)
+    results = xr.merge(
+        [
+            xr.Dataset(master_expressions),
+            xr.concat(
+                subproblem_results,
+                dim="investsteps",
+                data_vars="minimal",
+                coords="minimal",
+                compat="override",
+            ),
+            xr.Dataset(values),
+        ],
+        compat="override",
+    )
+    if _INVESTMENT_COST in master_expressions and _COST in results:
+        investment_cost = master_expressions[_INVESTMENT_COST]
+        results[_COST] = (results[_COST].fillna(0) + investment_cost.fillna(0)).where(
+            results[_COST].notnull() | investment_cost.notnull()
+        )
+    return results.drop_vars([_STORAGE_LINK_START, _STORAGE_LINK_END], errors="ignore")
+
+
+def split_math(math: AttrDict) -> tuple[AttrDict, AttrDict]:
+    """Split model math into master problem and subproblem math.
+
+    The master problem includes variables that are not indexed over `timesteps`,
+    and global expressions / constraints that only reference master problem variables (e.g., investment costs).
+    The subproblems include all variables and objectives, and all other global expressions / constraints.
+    In the subproblems, master problem global expressions are deactivated.
+    `link_storage_level` is moved to the master problem, between storage levels at the start and end of each investstep
+    that are global expressions of the storage level in the subproblems (see `_split_storage_link`).
+
+    Args:
+        math (AttrDict): Model math.
+
+    Raises:
+        ValueError: Subproblem math refers to specific investsteps (e.g., `roll(..., investsteps=1)`), other than `link_storage_level`.
+
+    Returns:
+        tuple[AttrDict, AttrDict]: Master problem math, subproblem math.
+    """
+    master_math = AttrDict({group: AttrDict() for group in _COMPONENT_GROUPS})
+    subproblem_math = AttrDict({group: AttrDict() for group in _COMPONENT_GROUPS})
+    component_names = set(math["variables"]).union(math["global_expressions"])
+    master_names = {
+        name
+        for name, variable in math["variables"].items()
+        if "timesteps" not in variable.get("foreach", [])
+    }
+
+    for group in _COMPONENT_GROUPS:
+        for name, component in math[group].items():
+            if group == "variables":
+                in_master = name in master_names
+            elif group == "objectives":
+                in_master = False
+            else:
+                references = _references(component, component_names)
+                in_master = (
+                    "timesteps" not in component.get("foreach", [])
+                    and references.issubset(master_names)
+                    and bool(references)
+                )
+            if in_master:
+                master_names.add(name)
+                master_math[group][name] = component
+            if group == "variables":
+                subproblem_math[group][name] = component
+            elif in_master and group == "global_expressions":
+                # Kept (inactive) so that subproblem math referring to it remains valid.
+                subproblem_math[group][name] = {**component, "active": False}
+            elif (
+                not in_master
+                and component.get("active", True)
+                and _refers_to_investsteps(component)
+            ):
+                if name != _STORAGE_LINK:
+                    raise ValueError(
+                        f"Benders | {group}:{name} | Links operation between investsteps and cannot be decomposed."
+                    )
+                for split, split_component in zip(
+                    [master_math, subproblem_math], _split_storage_link(math, component)
+                ):
+                    for split_group, components in split_component.items():
+                        split[split_group].update(components)
+                subproblem_math[group][name] = {**component, "active": False}
+            elif not in_master:
+                subproblem_math[group][name] = component
+
+    return master_math, subproblem_math
+
+
+def _split_storage_link(math: AttrDict, link: dict) -> tuple[dict, dict]:
+    """Master problem and subproblem math carrying `link_storage_level` across investsteps.
+
+    In the master problem, the storage level at the start of an investstep equals that at the end of the previous one.
+    In the subproblems, both are global expressions of the storage level, taken from either side of the `link_storage_level` equations,
+    so that they are fixed to the master problem solution as capacities are.
+
+    Returns:
+        tuple[dict, dict]: Master problem components, subproblem components (per component group).
+    """
+    start_equations, end_equations = [], []
+    for equation in link["equations"]:
+        start, end = equation["expression"].split("==")
+        match = re.fullmatch(
+            r"\s*roll\((.*),\s*investsteps\s*=\s*1\s*\)\s*", end, flags=re.DOTALL
+        )
+        if match is None:
+            raise ValueError(
+                f"Benders | constraints:{_STORAGE_LINK} | Cannot be decomposed, "
+                "expected an equation of the form `<start> == roll(<end>, investsteps=1)`."
+            )
+        where = {"where": equation["where"]} if "where" in equation else {}
+        start_equations.append({**where, "expression": start.strip()})
+        end_equations.append({**where, "expression": match.group(1).strip()})
+
+    foreach = ["nodes", "techs", "investsteps"]
+    storage_where = math["variables"]["storage"].get("where", "True")
+    master_components = {
+        "variables": {
+            _STORAGE_LINK_START: {
+                "description": "Storage level at the start of an investstep, carried over from the previous investstep.",
+                "foreach": foreach,
+                "where": f"({storage_where}) AND NOT investsteps=get_val_at_index(investsteps=0)",
+                "bounds": {"min": 0, "max": np.inf},
+            },
+            _STORAGE_LINK_END: {
+                "description": "Storage level at the end of an investstep, carried over to the next investstep.",
+                "foreach": foreach,
+                "where": f"({storage_where}) AND NOT investsteps=get_val_at_index(investsteps=-1)",
+                "bounds": {"min": 0, "max": np.inf},
+            },
+        },
+        "constraints": {
+            _STORAGE_LINK: {
+                "foreach": foreach,
+                "where": _STORAGE_LINK_START,
+                "equations": [
+                    {
+                        "expression": f"{_STORAGE_LINK_START} == roll({_STORAGE_LINK_END}, investsteps=1)"
+                    }
+                ],
+            },
+            **{
+                f"{name}_max": {
+                    "foreach": foreach,
+                    "where": name,
+                    "equations": [{"expression": f"{name} <= storage_cap"}],
+                }
+                for name in [_STORAGE_LINK_START, _STORAGE_LINK_END]
+            },
+        },
+    }
+    subproblem_components = {
+        "global_expressions": {
+            name: {
+                "foreach": foreach,
+                "where": "storage",
+                "equations": equations,
+                **{
+                    key: link[key]
+                    for key in ["sub_expressions", "slices"]
+                    if key in link
+                },
+            }
+            for name, equations in zip(
+                [_STORAGE_LINK_START, _STORAGE_LINK_END],
+                [start_equations, end_equations],
+            )
+        }
+    }
+    return master_components, subproblem_components
+
+
+def _component_strings(component: dict) -> list[str]:
+    strings = [component.get("where", "")]
+    for equation in component.get("equations", []):
+        strings.extend([equation.get("where", ""), equation["expression"]])
+    for key in ["sub_expressions", "slices"]:
+        for equations in component.get(key, {}).values():
+            for equation in equations:
+                strings.extend([equation.get("where", ""), equation["expression"]])
+    return strings
+
+
+def _references(component: dict, names: set[str]) -> set[str]:
+    tokens = re.findall(r"[A-Za-z_]\w*", " ".join(_component_strings(component)))
+    return names.intersection(tokens)
+
+
+def _refers_to_investsteps(component: dict) -> bool:
+    """Whether a component refers to investsteps by position (e.g., `roll(..., investsteps=1)`),
+    rather than by lookup within the same investstep (e.g., `investsteps=lookup_investsteps`).
+    """
+    return any(
+        re.search(r"investsteps\s*=\s*-?\d", string)
+        for string in _component_strings(component)
+    )
+
+
+def _linking_variables(subproblem_math: AttrDict, names: list[str]) -> list[str]:
+    """Master problem variables referenced by (or defined as global expressions in) active subproblem math,
+    i.e., those to fix in the subproblems.
+    """
+    referenced = set()
+    for group in _COMPONENT_GROUPS[1:]:
+        for name, component in subproblem_math[group].items():
+            if component.get("active", True):
+                referenced.update(_references(component, set(names)))
+                referenced.add(name)
+    return [name for name in names if name in referenced]
+
+
+def _stack_values(results: dict) -> dict[str, xr.DataArray]:
+    """Combine subproblem values of master problem variables over investsteps."""
+    names = set().union(*(result["values"] for result in results.values()))
+    return {
+        name: xr.concat(
+            [
+                result["values"][name]
+                for result in results.values()
+                if name in result["values"]
+            ],
+            dim="investsteps",
+        )
+        for name in names
+    }
+
+
+def _is_feasible(results: dict) -> bool:
+    return all(result["objective"] is not None for result in results.values())
+
+
+def _add_cuts(
+    master: "_Master", results: dict, values: dict[str, xr.DataArray]
+) -> bool:
+    """Add cuts from subproblem results at `values`.
+
+    Returns:
+        bool: Whether any of the cuts is violated by the current master problem solution.
+    """
+    violated = False
+    for investstep, result in results.items():
+        if result["objective"] is None:
+            cut = master.add_feasibility_cut(
+                result["deviation"], result["duals"], values
+            )
+        else:
+            cut = master.add_optimality_cut(
+                investstep, result["objective"], result["duals"], values
+            )
+        violated |= cut
+    return violated
+
+
+def _is_violated(cut: pmo.constraint, scale: float) -> bool:
+    """Whether the current variable values violate a cut, relative to `scale`."""
+    return cut.slack < -_CUT_RTOL * max(abs(scale), 1)
+
+
+def _defined(array: xr.DataArray) -> np.ndarray:
+    """Backend objects of an array, where defined."""
+    return array.values[array.notnull().values]
+
+
+def _with_math(inputs: xr.Dataset, math: AttrDict) -> xr.Dataset:
+    inputs = inputs.copy()
+    inputs.attrs = {**inputs.attrs, "math": math}
+    return inputs
+
+
+def _solve(
+    backend: PyomoBackendModel, solve_config: dict, objective
+) -> Optional[float]:
+    """Solve a backend model with its duals activated, returning its objective value (None if infeasible)."""
+    opt = SolverFactory(solve_config["solver"], solver_io=solve_config["solver_io"])
+    for key, val in (solve_config.get("solver_options") or {}).items():
+        opt.options[key] = val
+    backend.shadow_prices.activate()
+    results = opt.solve(backend._instance, load_solutions=False)
+    termination = results.solver[0].termination_condition
+    if termination in [
+        pe.TerminationCondition.infeasible,
+        pe.TerminationCondition.infeasibleOrUnbounded,
+    ]:
+        return None
+    if pe.TerminationCondition.to_solver_status(termination) != pe.SolverStatus.ok:
+        raise ValueError(f"Benders | Problem could not be solved ({termination}).")
+    backend._instance.load_solution(results.solution[0])
+    # Variables that do not appear in the solved problem (e.g., only in deactivated constraints) are given no value;
+    # any value within their bounds is optimal.
+    for variables in backend._instance.variables.values():
+        for variable in variables:
+            if variable.value is None:
+                variable.value = variable.lb if variable.has_lb() else 0
+    return pe.value(objective)
+
+
+class _Master:
+    def __init__(self, inputs: xr.Dataset, build_config: dict):
+        self.backend = PyomoBackendModel(inputs, **build_config)
+        self.backend._build()
+        self.variable_names = [
+            name
+            for name, variable in self.backend.variables.items()
+            if variable.notnull().any()
+        ]
+        self.investment_cost = self._investment_cost()
+        instance = self.backend._instance
+        instance.benders_cost = pmo.variable_dict()
+        instance.benders_cuts = pmo.constraint_list()
+        instance.benders_objective = pmo.objective(expr=self.investment_cost)
+
+    def _investment_cost(self):
+        """Investment costs, weighted as in the `min_cost_optimisation` objective."""
+        if _INVESTMENT_COST not in self.backend.global_expressions:
+            return 0
+        weights = [
+            self.backend.inputs.get(
+                name, self.backend.inputs.attrs["defaults"].get(name, 1)
+            )
+            for name in ["investstep_resolution", "objective_cost_weights"]
+        ]
+        weighted = self.backend.get_global_expression(_INVESTMENT_COST)
+        for weight in weights:
+            weighted = weighted * weight
+        return sum(_defined(weighted))
+
+    def set_cost_lower_bounds(self, lower_bounds: dict) -> None:
+        instance = self.backend._instance
+        for investstep, lower_bound in lower_bounds.items():
+            instance.benders_cost[investstep] = pmo.variable(lb=lower_bound)
+        instance.benders_objective.expr = self.investment_cost + sum(
+            instance.benders_cost.values()
+        )
+
+    def solve(self, solve_config: dict) -> float:
+        objective = _solve(
+            self.backend, solve_config, self.backend._instance.benders_objective
+        )
+        if objective is None:
+            raise ValueError(
+                "Benders | Master problem is infeasible "
+                "(e.g., no capacities allow operation without unmet demand / unused supply)."
+            )
+        return objective
+
+    def solve_at_least(
+        self, targets: dict[str, xr.DataArray], solve_config: dict
+    ) -> dict[str, xr.DataArray]:
+        """Solve with variables at least at `targets` (shortfalls penalised by `bigM`) and close to them (excesses penalised per unit)."""
+        instance = self.backend._instance
+        penalty = float(
+            self.backend.inputs.get(
+                "bigM", self.backend.inputs.attrs["defaults"]["bigM"]
+            )
+        )
+        instance.benders_shortfall = pmo.variable_list()
+        instance.benders_excess = pmo.variable_list()
+        instance.benders_targets = pmo.constraint_list()
+        for name, target in targets.items():
+            variable = self.backend.get_variable(name)
+            target = target.reindex_like(variable).transpose(*variable.dims)
+            mask = (variable.notnull() & target.notnull()).values
+            for var, val in zip(variable.values[mask], target.values[mask]):
+                shortfall, excess = pmo.variable(lb=0), pmo.variable(lb=0)
+                instance.benders_shortfall.append(shortfall)
+                instance.benders_excess.append(excess)
+                instance.benders_targets.append(
+                    pmo.constraint(var + shortfall - excess == val)
+                )
+        objective = instance.benders_objective.expr
+        instance.benders_objective.expr = (
+            objective
+            + penalty * sum(instance.benders_shortfall)
+            + sum(instance.benders_excess)
+        )
+        try:
+            self.solve(solve_config)
+        finally:
+            instance.benders_objective.expr = objective
+            del instance.benders_targets
+            del instance.benders_shortfall
+            del instance.benders_excess
+        return self.values()
+
+    def values(self) -> dict[str, xr.DataArray]:
+        return {
+            name: self.backend.get_variable(name, as_backend_objs=False)
+            for name in self.variable_names
+        }
+
+    def fixing_templates(self, names: list[str]) -> dict[str, xr.DataArray]:
+        """Templates of the values to fix variables to in the subproblems: zero where the variables are defined, NaN elsewhere."""
+        return {
+            name: xr.zeros_like(self.backend.get_variable(name), dtype=float).where(
+                self.backend.get_variable(name).notnull()
+            )
+            for name in names
+        }
+
+    def investment_cost_at(self, values: dict[str, xr.DataArray]) -> float:
+        self._set_values(values)
+        return pe.value(self.investment_cost)
+
+    def global_expressions_at(
+        self, values: dict[str, xr.DataArray]
+    ) -> dict[str, xr.DataArray]:
+        self._set_values(values)
+        return {
+            name: self.backend.get_global_expression(
+                name, as_backend_objs=False, eval_body=True
+            )
+            for name, expression in self.backend.global_expressions.items()
+            if expression.notnull().any()
+        }
+
+    def _set_values(self, values: dict[str, xr.DataArray]) -> None:
+        for name, array in values.items():
+            variable = self.backend.get_variable(name)
+            mask = variable.notnull().values
+            for var, val in zip(
+                variable.values[mask], array.transpose(*variable.dims).values[mask]
+            ):
+                var.value = val
+
+    def add_optimality_cut(
+        self,
+        investstep: np.datetime64,
+        objective: float,
+        duals: dict[str, xr.DataArray],
+        values: dict[str, xr.DataArray],
+    ) -> bool:
+        """Add cut `cost[investstep] >= objective + duals * (variables - values)`, returning whether the current solution violates it."""
+        cut = pmo.constraint(
+            self.backend._instance.benders_cost[investstep]
+            >= self._linearise(objective, duals, values)
+        )
+        self.backend._instance.benders_cuts.append(cut)
+        return _is_violated(cut, objective)
+
+    def add_feasibility_cut(
+        self,
+        deviation: float,
+        duals: dict[str, xr.DataArray],
+        values: dict[str, xr.DataArray],
+    ) -> bool:
+        """Add cut `0 >= deviation + duals * (variables - values)`, returning whether the current solution violates it."""
+        cut = pmo.constraint(self._linearise(deviation, duals, values) <= 0)
+        self.backend._instance.benders_cuts.append(cut)
+        return _is_violated(cut, deviation)
+
+    def _linearise(
+        self,
+        constant: float,
+        duals: dict[str, xr.DataArray],
+        values: dict[str, xr.DataArray],
+    ):
+        expr = constant
+        for name, dual in duals.items():
+            # Select rather than reindex, as reindexing copies backend objects.
+            index = {dim: dual[dim].values for dim in dual.dims}
+            variable = self.backend.get_variable(name).sel(index).transpose(*dual.dims)
+            value = values[name].sel(index).transpose(*dual.dims)
+            mask = (dual.notnull() & (dual != 0) & variable.notnull()).values.ravel()
+            for var, coef, val in zip(
+                variable.values.ravel()[mask],
+                dual.values.ravel()[mask],
+                value.values.ravel()[mask],
+            ):
+                expr += coef * (var - val)
+        return expr
+
+
+class _Subproblems:
+    """Investstep subproblems, kept built between iterations.
+
+    Master problem variables are fixed by elastic constraints, whose deviations are only allowed
+    when the subproblem is infeasible for the master problem solution (e.g., insufficient demand technology capacity).
+    In that case, the total deviation is minimised instead of the subproblem objective, to generate a feasibility cut.
+    """
+
+    def __init__(
+        self,
+        inputs: xr.Dataset,
+        templates: dict[str, xr.DataArray],
+        build_config: dict,
+        solve_config: dict,
+    ):
+        self.solve_config = solve_config
+        self.backends = {}
+        self.fixed = {}
+        self.deviations = {}
+        for investstep in inputs.investsteps.values:
+            backend = PyomoBackendModel(
+                inputs.sel(investsteps=[investstep]), **build_config
+            )
+            backend._build()
+            self.fixed[investstep] = []
+            self.deviations[investstep] = []
+            for name, template in templates.items():
+                template = template.sel(investsteps=[investstep])
+                if template.notnull().any():
+                    self.fixed[investstep].append(name)
+                    self.deviations[investstep].extend(
+                        _add_fixing_constraint(backend, name, template)
+                    )
+            for name in _UNMET_DEMAND:
+                if name in backend.variables:
+                    for variable in _defined(backend.get_variable(name)):
+                        variable.fix(0)
+            backend._instance.benders_feasibility = pmo.objective(
+                expr=sum(self.deviations[investstep])
+            )
+            self.backends[investstep] = backend
+
+    def solve(
+        self, values: Optional[dict[str, xr.DataArray]], load_results: bool = False
+    ) -> dict:
+        """Solve all subproblems with master variables fixed to `values` (or unfixed, if None).
+
+        Returns:
+            dict:
+                Per investstep, the subproblem `objective` (None if infeasible), total `deviation` from `values`,
+                `duals` of the constraints fixing master variables, subproblem `values` of fixed master variables
+                that are also subproblem variables, and `results` (if `load_results` is True).
+        """
+        results = {}
+        for investstep, backend in self.backends.items():
+            for name in self.fixed[investstep]:
+                constraints = backend._instance.constraints[_fixing_name(name)]
+                if values is None:
+                    constraints.deactivate()
+                    continue
+                constraints.activate()
+                template = backend.get_parameter(_fixed_name(name))
+                fixed = values[name].reindex_like(template).where(template.notnull())
+                backend.update_parameter(_fixed_name(name), fixed)
+            deviations = self.deviations[investstep]
+            objective = self._solve(backend, deviations, feasibility=False)
+            deviation = 0.0
+            if objective is None:
+                deviation = self._solve(backend, deviations, feasibility=True)
+                if _deviations_negligible(backend, self.fixed[investstep]):
+                    # Only infeasible within solver tolerances: keep the (negligible) deviations found.
+                    objective = self._solve(
+                        backend, deviations, feasibility=False, fix_at_values=True
+                    )
+            results[investstep] = {
+                "objective": objective,
+                "deviation": deviation,
+                "duals": {
+                    name: backend.shadow_prices.get(_fixing_name(name))
+                    for name in self.fixed[investstep]
+                    if values is not None
+                },
+                "values": {
+                    name: (
+                        backend.get_variable(name, as_backend_objs=False)
+                        if name in backend.variables
+                        else backend.get_global_expression(
+                            name, as_backend_objs=False, eval_body=True
+                        ).astype(float)
+                    )
+                    for name in self.fixed[investstep]
+                },
+                "results": backend.load_results() if load_results else None,
+            }
+        return results
+
+    def _solve(
+        self,
+        backend: PyomoBackendModel,
+        deviations: list,
+        feasibility: bool,
+        fix_at_values: bool = False,
+    ) -> Optional[float]:
+        """Solve for the model objective with deviations fixed (to zero, or their current values if `fix_at_values` is True)
+        or, if `feasibility` is True, for minimum total deviation.
+        """
+        objective_name = backend.inputs.attrs["config"]["build"]["objective"]
+        objective = backend.objectives[objective_name].item()
+        feasibility_objective = backend._instance.benders_feasibility
+        if feasibility:
+            for deviation in deviations:
+                deviation.free()
+            objective.deactivate()
+            feasibility_objective.activate()
+            return _solve(backend, self.solve_config, feasibility_objective)
+        for deviation in deviations:
+            deviation.fix(deviation.value if fix_at_values else 0)
+        feasibility_objective.deactivate()
+        objective.activate()
+        return _solve(backend, self.solve_config, objective)
+
+
+def _fixed_name(name: str) -> str:
+    return f"{_FIXED_PREFIX}{name}"
+
+
+def _fixing_name(name: str) -> str:
+    return f"{_FIXED_PREFIX}fix_{name}"
+
+
+def _deviations_negligible(backend: PyomoBackendModel, names: list[str]) -> bool:
+    """Whether all deviations from fixed master variables are within tolerance of their fixed values."""
+    for name in names:
+        fixed = backend.get_parameter(_fixed_name(name), as_backend_objs=False)
+        deviation = sum(
+            backend.get_variable(
+                f"{_FIXED_PREFIX}{direction}_{name}", as_backend_objs=False
+            )
+            .astype(float)
+            .fillna(0)
+            for direction in ["excess", "shortfall"]
+        )
+        tolerance = _DEVIATION_ATOL + _DEVIATION_RTOL * abs(fixed.astype(float))
+        if (deviation > tolerance.fillna(_DEVIATION_ATOL)).any():
+            return False
+    return True
+
+
+def _add_fixing_constraint(
+    backend: PyomoBackendModel, name: str, template: xr.DataArray
+) -> list:
+    """Add constraint `name == benders_name + benders_excess_name - benders_shortfall_name` where `template` is defined,
+    returning the deviation variables.
+
+    `name` is a variable or a global expression of the subproblem.
+    """
+    backend.inputs[_fixed_name(name)] = template
+    backend.add_parameter(_fixed_name(name), template)
+    deviations = []
+    for direction in ["excess", "shortfall"]:
+        deviation_name = f"{_FIXED_PREFIX}{direction}_{name}"
+        backend.add_variable(
+            deviation_name,
+            {
+                "foreach": list(template.dims),
+                "where": _fixed_name(name),
+                "bounds": {"min": 0, "max": np.inf},
+            },
+        )
+        deviations.extend(_defined(backend.get_variable(deviation_name)))
+    backend.add_constraint(
+        _fixing_name(name),
+        {
+            "foreach": list(template.dims),
+            "where": _fixed_name(name),
+            "equations": [
+                {
+                    "expression": f"{name} == {_fixed_name(name)} + "
+                    f"{_FIXED_PREFIX}excess_{name} - {_FIXED_PREFIX}shortfall_{name}"
+                }
+            ],
+        },
+    )
+    return deviations
+
+
+def _worker(connection, *args) -> None:
+    try:
+        register_extensions()
+        subproblems = _Subproblems(*args)
+    except Exception as err:
+        subproblems = err
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        if isinstance(subproblems, Exception):
+            connection.send(subproblems)
+            continue
+        try:
+            connection.send(subproblems.solve(*message))
+        except Exception as err:
+            connection.send(err)
+
+
+class _SubproblemPool:
+    """Distribute investstep subproblems over worker processes.
+
+    Each worker is only sent the inputs of the investsteps it solves.
+    """
+
+    def __init__(
+        self,
+        inputs: xr.Dataset,
+        templates: dict[str, xr.DataArray],
+        build_config: dict,
+        solve_config: dict,
+        processes: int,
+    ):
+        if processes <= 1:
+            self.local = _Subproblems(inputs, templates, build_config, solve_config)
+            return
+        self.local = None
+        self.connections = []
+        self.workers = []
+        for chunk in np.array_split(inputs.investsteps.values, processes):
+            if len(chunk) == 0:
+                continue
+            chunk = list(chunk)
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_worker,
+                args=(
+                    child,
+                    inputs.sel(investsteps=chunk),
+                    {
+                        name: template.sel(investsteps=chunk)
+                        for name, template in templates.items()
+                    },
+                    build_config,
+                    solve_config,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+    def solve(
+        self, values: Optional[dict[str, xr.DataArray]], load_results: bool = False
+    ) -> dict:
+        if self.local is not None:
+            return self.local.solve(values, load_results)
+        for connection in self.connections:
+            connection.send((values, load_results))
+        results = {}
+        for connection in self.connections:
+            result = connection.recv()
+            if isinstance(result, Exception):
+                raise result
+            results.update(result)
+        return dict(sorted(results.items()))
+
+    def close(self) -> None:
+        if self.local is not None:
+            return
+        for connection in self.connections:
+            connection.send(None)
+        for connection, worker in zip(self.connections, self.workers):
+            # Results not yet received (e.g., if another worker failed) are drained,
+            # as a worker blocked on sending them would never stop.
+            while worker.is_alive():
+                try:
+                    if connection.poll(0.1):
+                        connection.recv()
+                except EOFError:
+                    break
+            worker.join()
+            connection.close()
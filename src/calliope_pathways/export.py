@@ -0,0 +1,194 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Streaming export of optimisation results to a chunked, compressed NetCDF4 file.
+
+`model.solve()` evaluates every decision variable and global expression over all investsteps at once and holds them in memory as `model.results`.
+`solve_to_netcdf` instead solves the optimisation problem without loading its results,
+then evaluates each result one investstep at a time and appends it to file,
+so that peak memory during result extraction stays near a single investstep slice of the largest result.
+
+Results are stored as `float64` arrays chunked over `investsteps` (one per chunk) and `timesteps`,
+and compressed with zlib. They can be read lazily with `xarray.open_dataset(path)`.
+Results are written as evaluated by the backend, i.e., without the post-processing of `model.solve()`
+(e.g., levelised costs and the removal of values below `config.solve.zero_threshold`).
+"""
+
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import netCDF4
+import numpy as np
+import xarray as xr
+from calliope.backend.backend_model import BackendModel
+from calliope.model import Model
+from calliope.util.schema import update_then_validate_config
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNKS = {"investsteps": 1, "timesteps": 168}
+_SOLVED = ["optimal", "feasible"]
+
+
+def solve_to_netcdf(
+    model: Model,
+    path: str | Path,
+    variables: Optional[list[str]] = None,
+    complevel: int = 4,
+    chunks: Optional[dict[str, int]] = None,
+    **kwargs,
+) -> Path:
+    """Solve a built model and stream its results to file, without loading them into `model.results`.
+
+    Args:
+        model (Model): Built pathway model.
+        path (str | Path): NetCDF file to write results to.
+        variables (Optional[list[str]], optional): Names of the decision variables / global expressions to write. Defaults to None (all).
+        complevel (int, optional): zlib compression level (1-9). Defaults to 4.
+        chunks (Optional[dict[str, int]], optional): Chunk size overrides per dimension (see `write_results`). Defaults to None.
+        **kwargs: Solve configuration overrides (e.g., `solver`), as in `model.solve(...)`.
+
+    Raises:
+        ValueError: Model is not built.
+        ValueError: Build mode is `operate`.
+        ValueError: The optimisation problem could not be solved.
+
+    Returns:
+        Path: `path`.
+    """
+    if not model._is_built:
+        raise ValueError("Model must be built before it can be solved.")
+    if model.backend.inputs.attrs["config"]["build"]["mode"] == "operate":
+        raise ValueError("Streaming results is not available in `operate` mode.")
+    solve_config = update_then_validate_config("solve", model.config, **kwargs)
+    with _deferred_results(model.backend):
+        results = model.backend._solve(**solve_config)
+    model._model_data.attrs.update(results.attrs)
+    termination = results.attrs["termination_condition"]
+    if termination not in _SOLVED:
+        raise ValueError(f"Optimisation problem is {termination}.")
+    return write_results(model, path, variables, complevel, chunks)
+
+
+def write_results(
+    model: Model,
+    path: str | Path,
+    variables: Optional[list[str]] = None,
+    complevel: int = 4,
+    chunks: Optional[dict[str, int]] = None,
+) -> Path:
+    """Evaluate the results of a solved model one investstep at a time, appending them to a chunked, compressed NetCDF file.
+
+    Args:
+        model (Model): Pathway model solved with `model.solve()` or `solve_to_netcdf`.
+        path (str | Path): NetCDF file to write results to. Overwritten if it exists.
+        variables (Optional[list[str]], optional): Names of the decision variables / global expressions to write. Defaults to None (all).
+        complevel (int, optional): zlib compression level (1-9). Defaults to 4.
+        chunks (Optional[dict[str, int]], optional):
+            Chunk size overrides per dimension, updating `DEFAULT_CHUNKS`.
+            Dimensions that are not given are not chunked.
+            Defaults to None.
+
+    Raises:
+        ValueError: Model has not been successfully solved.
+        ValueError: Unknown variable or global expression names in `variables`.
+
+    Returns:
+        Path: `path`.
+    """
+    if model._model_data.attrs.get("termination_condition", None) not in _SOLVED:
+        raise ValueError("Model must be successfully solved before writing results.")
+    backend = model.backend
+    components = _components(backend, variables)
+    chunks = {**DEFAULT_CHUNKS, **(chunks or {})}
+    dims = list(dict.fromkeys(dim for da in components.values() for dim in da.dims))
+
+    path = Path(path)
+    xr.Dataset(
+        coords={dim: backend._dataset.coords[dim] for dim in dims},
+        attrs={
+            "termination_condition": model._model_data.attrs["termination_condition"]
+        },
+    ).to_netcdf(path, mode="w", format="NETCDF4")
+    with netCDF4.Dataset(path, mode="a") as store:
+        for name, da in components.items():
+            _write_component(store, backend, name, da, chunks, complevel)
+    LOGGER.info(f"Export | {len(components)} result(s) written to {path}.")
+    return path
+
+
+def _components(
+    backend: BackendModel, variables: Optional[list[str]]
+) -> dict[str, xr.DataArray]:
+    """Non-empty backend decision variables and global expressions, optionally limited to `variables`."""
+    components = {
+        name: da
+        for name, da in {**backend.variables, **backend.global_expressions}.items()
+        if da.notnull().any()
+    }
+    if variables is None:
+        return components
+    missing = set(variables).difference(components)
+    if missing:
+        raise ValueError(
+            f"Cannot write results that are not non-empty decision variables or global expressions: {sorted(missing)}."
+        )
+    return {name: components[name] for name in variables}
+
+
+def _write_component(
+    store: netCDF4.Dataset,
+    backend: BackendModel,
+    name: str,
+    da: xr.DataArray,
+    chunks: dict[str, int],
+    complevel: int,
+) -> None:
+    """Create a chunked, compressed NetCDF variable and fill it one investstep slice at a time."""
+    variable = store.createVariable(
+        name,
+        "f8",
+        da.dims,
+        compression="zlib",
+        complevel=complevel,
+        chunksizes=[min(chunks.get(dim, size), size) for dim, size in da.sizes.items()],
+        fill_value=np.nan,
+    )
+    variable.setncatts(
+        {
+            attr: val
+            for attr, val in da.attrs.items()
+            if attr in backend._COMPONENT_ATTR_METADATA
+            and isinstance(val, (str, int, float))
+        }
+        | {"is_result": 1}
+    )
+    if "investsteps" not in da.dims:
+        variable[:] = _evaluate(backend, name, da).values
+        return
+    axis = da.dims.index("investsteps")
+    for i in range(da.sizes["investsteps"]):
+        index = tuple(i if n == axis else slice(None) for n in range(da.ndim))
+        variable[index] = _evaluate(backend, name, da.isel(investsteps=i)).values
+
+
+def _evaluate(backend: BackendModel, name: str, da: xr.DataArray) -> xr.DataArray:
+    """Optimal values of (a slice of) a decision variable or global expression."""
+    if name in backend.variables:
+        values = backend._apply_func(backend._from_pyomo_param, da)
+    else:
+        values = backend._apply_func(backend._from_pyomo_expr, da, eval_body=True)
+    return values.astype(float)
+
+
+@contextmanager
+def _deferred_results(backend: BackendModel) -> Iterator[None]:
+    """Skip evaluating all results when the backend finishes solving."""
+    backend.load_results = xr.Dataset
+    try:
+        yield
+    finally:
+        del backend.load_results
@@ -0,0 +1,49 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Math expression helper functions used by the pathways math.
+
+Helper functions are registered with Calliope when they are defined, i.e., on importing this module,
+which `calliope_pathways.util.register_extensions` does lazily, when first needed (e.g., on initialising a model with `calliope_pathways.models`).
+"""
+
+from typing import Union
+
+import xarray as xr
+from calliope.backend import helper_functions
+
+
+class SumVintages(helper_functions.Sum):
+    """Sum over vintages, skipping (investstep, vintagestep) pairs in which a vintage is unavailable.
+
+    Unavailable pairs (i.e., undefined `available_vintages`) are dropped from the sum rather than added with a zero coefficient,
+    so the number of terms grows with the number of available pairs rather than with the product of investsteps and vintagesteps.
+    """
+
+    #:
+    NAME = "sum_vintages"
+    #:
+    ALLOWED_IN = ["expression"]
+
+    def as_math_string(self, array: str, *, over: Union[str, list[str]]) -> str:
+        return super().as_math_string(
+            rf"{array} \mid \exists (\textit{{available\_vintages}})", over=over
+        )
+
+    def as_array(
+        self, array: xr.DataArray, *, over: Union[str, list[str]]
+    ) -> xr.DataArray:
+        """Sum an expression array over the given dimension(s), which must include `vintagesteps`, where vintages are available.
+
+        Args:
+            array (xr.DataArray): expression array
+            over (Union[str, list[str]]): dimension(s) over which to apply `sum`.
+
+        Returns:
+            xr.DataArray:
+                Array with dimensions reduced by applying a summation over the dimensions given in `over`.
+                If no vintage is available, the summation will lead to zero.
+        """
+        available = self._input_data.get("available_vintages", xr.DataArray(False))
+        return array.where(available.notnull()).sum(over, min_count=0, skipna=True)
@@ -1 +1,10 @@
-from calliope_pathways.model_configs.italy.pre_processing import parse_lombardi
+import importlib
+
+# Pre-processing modules are only imported on first access, as they depend on heavy optional libraries.
+_SUBMODULES = {"parse_lombardi": f"{__name__}.italy.pre_processing.parse_lombardi"}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(_SUBMODULES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
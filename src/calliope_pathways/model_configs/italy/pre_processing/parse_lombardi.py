@@ -2,16 +2,29 @@
 
 import importlib
 import importlib.resources
-import random
+import logging
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack
 from math import gamma
 from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple, Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import requests
 from calliope import AttrDict
 
+from calliope_pathways import cache, resolver
+
+LOGGER = logging.getLogger(__name__)
+
 SRC_DIR = Path(importlib.resources.files("calliope_pathways"))
 # TODO: this could be a yaml file + schema... although it may be too specific
 # -> Model setup -> User configurable
@@ -37,6 +50,7 @@ TRANSMISSION_TECHS = [
 
 # -> Parsing setup -> DO NOT MODIFY!
 BASIC_V07_COLS = ["nodes", "techs", "parameters", "values"]
+CAP_INDEX = ["nodes", "techs", "parameters"]
 INPUT_FILES = {
     "Calliope-Italy": {
         "locations": "https://raw.githubusercontent.com/FLomb/Calliope-Italy/power_to_heat/italy_20_regions_v.0.1_heat/calliope_model/model_config/locations.yaml"
@@ -130,39 +144,60 @@ def _get_lifetimes(yml_path: str, calliope_version: str = "0.7") -> dict:
 
 
 def _weibull(
-    year: int,
-    lifetime: float,
-    shape: float,
+    year: int | np.ndarray,
+    lifetime: float | np.ndarray,
+    shape: float | np.ndarray,
     year_shift: int = 0,
     zero_min: float = 1e-3,
-) -> float:
+) -> float | np.ndarray:
     """A Weibull probability distribution, see 10.1186/s12544-020-00464-0.
 
+    All numeric arguments can be arrays, which will be broadcast against each other.
+
     Args:
-        year (int): year in technology's lifetime, starting at 0.
-        lifetime (float): average lifetime of a technology.
-        shape (float): shape factor (Beta). <1 infant mortality, 1 random, >1 intrinsic wear-out.
+        year (int | np.ndarray): year in technology's lifetime, starting at 0.
+        lifetime (float | np.ndarray): average lifetime of a technology.
+        shape (float | np.ndarray): shape factor (Beta). <1 infant mortality, 1 random, >1 intrinsic wear-out.
         year_shift (int, optional): x-axis shift. Defaults to 0.
         zero_min (float, optional): minimum value allowed before defaulting to zero. Defaults to 1-e3.
 
     Returns:
-        float: share of surviving capacity at given year.
+        float | np.ndarray: share of surviving capacity at given year(s).
     """
-    wb = np.exp(
-        -(((year + year_shift) / lifetime) ** shape) * gamma(1 + 1 / shape) ** shape
-    )
-    if wb < zero_min:
-        wb = 0
-    return wb
+    shape = np.asarray(shape, dtype=float)
+    gamma_term = np.vectorize(gamma, otypes=[float])(1 + 1 / shape)
+    wb = np.exp(-(((year + year_shift) / lifetime) ** shape) * gamma_term**shape)
+    wb = np.where(wb < zero_min, 0, wb)
+    return wb if wb.ndim else wb.item()
+
+
+def invert_grouping(grouping: dict) -> dict:
+    """Invert a grouping dictionary into a lookup table.
+
+    Groupings are defined as {new_name:[old_name, ..., other_oldname],...}.
+    The lookup table is {old_name: new_name, other_oldname: new_name, ...}.
+
+    Raises:
+        ValueError: an original value is assigned to more than one group.
+    """
+    lookup: dict = {}
+    for new, old_group in grouping.items():
+        for old in old_group:
+            if lookup.setdefault(old, new) != new:
+                raise ValueError(
+                    f"`{old}` is in more than one group: {[lookup[old], new]}."
+                )
+    return lookup
 
 
 def transform_series(series: pd.Series, grouping: dict, dtype="string") -> pd.Series:
     """Use a grouping dictionary to transform a pandas Series.
 
     Groupings are defined as {new_name:[old_name, ..., other_oldname],...}.
+    The grouping is inverted into a lookup table once and applied in a single pass.
 
     Args:
-        df (pd.Series): dataframe with the column to transform.
+        series (pd.Series): data series to transform.
         grouping (dict): grouping to use for the transformation.
         dtype (str, optional): dtype to set for the new data series. Defaults to "string".
 
@@ -172,18 +207,62 @@ def transform_series(series: pd.Series, grouping: dict, dtype="string") -> pd.Se
     Returns:
         pd.Series: transformed data series.
     """
-    transformed = pd.Series(np.nan, index=series.index, dtype=dtype)
+    transformed = series.map(invert_grouping(grouping)).astype(dtype)
+    _raise_on_unmapped(series, transformed.isna())
+    return transformed
 
-    for new, old_group in grouping.items():
-        transformed.loc[series.isin(old_group)] = new
-    if any(pd.isna(transformed)):
-        raise ValueError(f"Missing values while transforming {series}.")
+
+def transform_frame(
+    df: pd.DataFrame, grouping: dict, keys: list[str], dtype="string"
+) -> pd.Series:
+    """Use a multi-key grouping dictionary to transform rows of a pandas DataFrame.
+
+    Groupings are defined as {new_name: {key: old_name | [old_name, ...], other_key: ...}, ...}.
+    A row is assigned to `new_name` if its values in all `keys` columns are listed under `new_name`.
+    Any other entries in the group definitions are ignored.
+
+    Args:
+        df (pd.DataFrame): dataframe with the `keys` columns to transform.
+        grouping (dict): grouping to use for the transformation.
+        keys (list[str]): columns of `df` to group on.
+        dtype (str, optional): dtype to set for the new data series. Defaults to "string".
+
+    Raises:
+        ValueError: grouping was not exhaustive (not all original value combinations covered).
+
+    Returns:
+        pd.Series: transformed data series, with the same index as `df`.
+    """
+    combinations = {}
+    for new, group in grouping.items():
+        values = [np.atleast_1d(group[key]).tolist() for key in keys]
+        combinations[new] = pd.MultiIndex.from_product(values).tolist()
+    lookup = invert_grouping(combinations)
+
+    lookup_index = pd.MultiIndex.from_tuples(list(lookup.keys()), names=keys)
+    positions = lookup_index.get_indexer(pd.MultiIndex.from_frame(df[keys]))
+    new_values = np.append(np.array(list(lookup.values()), dtype=object), None)
+    transformed = pd.Series(new_values[positions], index=df.index, dtype=dtype)
+    _raise_on_unmapped(df[keys], transformed.isna())
     return transformed
 
 
+def _raise_on_unmapped(original: pd.Series | pd.DataFrame, unmapped: pd.Series):
+    if unmapped.any():
+        counts = original[unmapped].value_counts(dropna=False)
+        name = original.name if isinstance(original, pd.Series) else list(original)
+        raise ValueError(
+            f"Missing values while transforming `{name}`. "
+            f"Unmapped values (with counts): {counts.to_dict()}."
+        )
+
+
 def parse_initial_cap(loc_yml_path: str, calliope_version="0.6.8") -> pd.DataFrame:
-    """Extract initial installed capacity (2015 values)."""
-    yml_loc = AttrDict.from_yaml_string(requests.get(loc_yml_path).text)
+    """Extract initial installed capacity (2015 values).
+
+    `loc_yml_path` is resolved to a local file using `calliope_pathways.resolver`.
+    """
+    yml_loc = AttrDict.from_yaml(resolver.resolve(loc_yml_path))
     df_loc = _location_yaml_to_df(yml_loc, calliope_version)
 
     # Find exclusively numeric tech parameters in each location
@@ -214,94 +293,130 @@ def parse_initial_cap(loc_yml_path: str, calliope_version="0.6.8") -> pd.DataFra
     return df_ini_cap
 
 
-def parse_cap_max(ini_cap_csv_path: str, techs: list) -> pd.DataFrame:
-    """Create a file with maximum installed technology capacities using initial capacities."""
-    cap_df = pd.read_csv(ini_cap_csv_path)
+def parse_cap_max(ini_cap: str | Path | pd.DataFrame, techs: list) -> pd.DataFrame:
+    """Create maximum installed technology capacities using initial capacities (as output by `parse_initial_cap`, or a CSV file thereof)."""
+    cap_df = _read_if_path(ini_cap)
     cap_df = cap_df[
         (cap_df["techs"].isin(techs)) & (cap_df["parameters"].isin(PARAM_INI_TO_MAX))
     ]
-    cap_df["parameters"] = cap_df["parameters"].replace(PARAM_INI_TO_MAX)
-
-    return cap_df
+    # `assign` copies the selection, so the initial capacities are left unchanged.
+    return cap_df.assign(parameters=cap_df["parameters"].replace(PARAM_INI_TO_MAX))
 
 
 def parse_available_initial_cap(
-    tech_yml_path: str, ini_cap_csv_path: str, years: list
+    tech_yml_path: str,
+    ini_cap: str | Path | pd.DataFrame,
+    years: list,
+    samples: Optional[int] = None,
 ) -> pd.DataFrame:
     """Applies a Weibull function to the initial capacity to decrease it realistically.
 
+    Each (node, tech) combination gets a random shape factor and a random remaining lifetime (a fraction of the technology lifetime),
+    drawn from a `numpy.random.Generator` seeded with `SEED`.
+    Survival curves for all combinations (and samples) are evaluated at once.
+
     Args:
         tech_yml_path (str): yaml file with technology data
-        node_tech_path (str): specifying installed technology per region
+        ini_cap (str | Path | pd.DataFrame): initial capacities, specifying installed technology per region (as output by `parse_initial_cap`, or a CSV file thereof).
         years (list): range of years modelled
-        shape_factor (int, optional): Weibull . Defaults to 0.5.
+        samples (Optional[int], optional):
+            If given, this number of random decommissioning samples will be generated, numbered in an additional `samples` column.
+            Defaults to None (one sample, without a `samples` column).
+
+    Returns:
+        pd.DataFrame: available fraction of initial capacity, with `nodes`, `techs`, (`samples`), and one column per year.
     """
     # get technology lifetimes
     lifetimes = _get_lifetimes(tech_yml_path)
 
     # fetch available technologies per region
-    ini_cap_df = pd.read_csv(ini_cap_csv_path)
-    remaining_df = ini_cap_df[["nodes", "techs"]].copy()
-    remaining_df = remaining_df.drop_duplicates(ignore_index=True)
-    # Construct random phase-out sequence
-    random.seed(SEED, version=2)
-    shape_factors = [random.uniform(BETA_MIN, BETA_MAX) for _ in remaining_df.index]
-    life_factors = [
-        random.uniform(AGE_FACTOR_MIN, AGE_FACTOR_MAX) for _ in remaining_df.index
-    ]
-    # Get phase-out sequence using a Weibull function
-    remaining_df[years] = 0.0
-
-    for i in remaining_df.index:
-        tech = remaining_df.loc[i, "techs"]
-        avg_remaining_life = lifetimes[tech] * life_factors[i]
-        remaining_df.loc[i, years[0] :] = [
-            _weibull(y - years[0], avg_remaining_life, shape_factors[i]) for y in years
-        ]
+    ini_cap_df = _read_if_path(ini_cap)
+    remaining_df = ini_cap_df[["nodes", "techs"]].drop_duplicates(ignore_index=True)
+    tech_lifetimes = remaining_df["techs"].map(lifetimes)
+    if tech_lifetimes.isna().any():
+        missing = remaining_df["techs"][tech_lifetimes.isna()].unique().tolist()
+        raise ValueError(f"Missing lifetime for technologies: {missing}.")
+
+    # Construct random phase-out sequences, with shape (samples, nodes/techs)
+    rng = np.random.default_rng(SEED)
+    size = (1 if samples is None else samples, len(remaining_df))
+    shape_factors = rng.uniform(BETA_MIN, BETA_MAX, size=size)
+    life_factors = rng.uniform(AGE_FACTOR_MIN, AGE_FACTOR_MAX, size=size)
+    avg_remaining_life = tech_lifetimes.to_numpy() * life_factors
+
+    # Get phase-out sequence using a Weibull function, with shape (samples, nodes/techs, years)
+    survival = _weibull(
+        np.asarray(years) - years[0],
+        avg_remaining_life[..., np.newaxis],
+        shape_factors[..., np.newaxis],
+    )
 
-    return remaining_df
+    if samples is None:
+        remaining_df[years] = survival[0]
+        return remaining_df
+
+    sample_df = pd.concat(
+        [remaining_df.assign(samples=i) for i in range(samples)], ignore_index=True
+    )
+    sample_df[years] = survival.reshape(-1, len(years))
+    return sample_df
+
+
+def _read_if_path(data: str | Path | pd.DataFrame) -> pd.DataFrame:
+    return data if isinstance(data, pd.DataFrame) else pd.read_csv(data)
 
 
 def parse_available_vintages(
-    tech_yml_path: str, years: list, year_step: int, option: str = "cut"
+    tech_yml_path: str,
+    years: list,
+    option: str = "cut",
+    shape_factor: float = (BETA_MIN + BETA_MAX) / 2,
 ) -> pd.DataFrame:
+    """Get the fraction of each technology vintage that is available in each investstep.
+
+    Evaluated for all technologies and (investstep, vintagestep) pairs at once.
+    Investsteps do not need to be evenly spaced.
+
+    Args:
+        tech_yml_path (str): yaml file with technology data (including lifetimes).
+        years (list): investsteps, in ascending order.
+        option (str, optional):
+            "cut": vintage is fully available until it reaches its lifetime, then unavailable.
+            "share": as "cut", but the investstep in which a vintage reaches its lifetime gets the fraction of the years since the previous investstep in which the vintage was still available.
+            "weibull": fraction of the vintage surviving at each investstep, following a Weibull distribution with the technology lifetime as its mean.
+            Defaults to "cut".
+        shape_factor (float, optional): Weibull shape factor, only used by the "weibull" option. Defaults to the mid-point of BETA_MIN and BETA_MAX.
+
+    Returns:
+        pd.DataFrame: availability, with technologies as rows and (investsteps, vintagesteps) as columns.
+    """
     # Get tech lifetimes
     tech_lifetimes = _get_lifetimes(tech_yml_path)
+    lifetimes = np.array(list(tech_lifetimes.values()), dtype=float)[:, np.newaxis]
 
     year_pairs = [(v, y) for y in years for v in years if v >= y]
     columns = pd.MultiIndex.from_tuples(
         year_pairs, names=["investsteps", "vintagesteps"]
     )
-
-    vintages_df = pd.DataFrame(index=tech_lifetimes.keys(), columns=columns)
+    investsteps = columns.get_level_values("investsteps")
+    age = (investsteps - columns.get_level_values("vintagesteps")).to_numpy()
+    # Years between each investstep and the one preceding it.
+    step = parse_investstep_resolution(years).loc[investsteps].to_numpy().flatten()
 
     match option:
         case "cut":  # binary elimination of capacity
-            for t in vintages_df.index:
-                for v, y in vintages_df.columns:
-                    if tech_lifetimes[t] > (v - y):
-                        vintages_df.loc[t, (v, y)] = 1
-                    else:
-                        vintages_df.loc[t, (v, y)] = 0
+            data = np.where(lifetimes > age, 1.0, 0.0)
         case "share":  # accounts for capacity ending between investsteps
-            # TODO: only works for constant spacing between investsteps, for now.
-            for t in vintages_df.index:
-                for v, y in vintages_df.columns:
-                    lifetime = tech_lifetimes[t]
-                    if lifetime > (v - y):
-                        vintages_df.loc[t, (v, y)] = 1
-                    elif lifetime > (v - y) - year_step:
-                        vintages_df.loc[t, (v, y)] = (lifetime % year_step) / year_step
-                    else:
-                        vintages_df.loc[t, (v, y)] = 0
+            share = ((lifetimes - (age - step)) % step) / step
+            data = np.where(
+                lifetimes > age, 1.0, np.where(lifetimes > age - step, share, 0.0)
+            )
         case "weibull":
-            raise ValueError("This option has not been implemented yet.")
+            data = _weibull(age, lifetimes, shape_factor)
         case _:
             raise ValueError("Invalid option specified.")
 
-    # TODO: bug workarounds
-    vintages_df.index.name = None
-    return vintages_df
+    return pd.DataFrame(data, index=list(tech_lifetimes.keys()), columns=columns)
 
 
 def parse_transmission(years: list) -> pd.DataFrame:
@@ -327,6 +442,187 @@ def _get_years(first_year: int, final_year: int, investstep_resolution: int) ->
     )
 
 
+def cache_key(first_year: int, final_year: int, investstep_resolution: int) -> str:
+    """Fingerprint of all inputs that affect the outputs of `main`.
+
+    Covers the requested years, the contents of the technology definitions, the parsing constants, and this parsing script itself.
+    """
+    return cache.fingerprint(
+        first_year,
+        final_year,
+        investstep_resolution,
+        cache.file_hash(INPUT_FILES["stationary"]["techs"]),
+        cache.file_hash(__file__),
+        INPUT_FILES["Calliope-Italy"],
+        [SEED, BETA_MIN, BETA_MAX, AGE_FACTOR_MIN, AGE_FACTOR_MAX],
+        FROZEN_TECHS,
+        TRANSMISSION_TECHS,
+    )
+
+
+class Stage(NamedTuple):
+    """A pre-processing stage, producing one data table (see `data_tables`)."""
+
+    func: Callable[..., pd.DataFrame]
+    """Called with the list of years and, as keyword arguments, the outputs of the stages it depends on."""
+    depends_on: tuple[str, ...] = ()
+    cpu_bound: bool = False
+    """If True, run in a worker process rather than a thread (if processes are switched on)."""
+
+
+def _initial_tech_capacities(years: list) -> pd.DataFrame:
+    return parse_initial_cap(INPUT_FILES["Calliope-Italy"]["locations"]).set_index(
+        CAP_INDEX
+    )
+
+
+def _maximum_tech_capacities(
+    years: list, initial_tech_capacities: pd.DataFrame
+) -> pd.DataFrame:
+    cap_max = parse_cap_max(initial_tech_capacities.reset_index(), FROZEN_TECHS)
+    return cap_max.set_index(CAP_INDEX)
+
+
+def _available_initial_cap_techs(
+    years: list, initial_tech_capacities: pd.DataFrame
+) -> pd.DataFrame:
+    available = parse_available_initial_cap(
+        INPUT_FILES["stationary"]["techs"], initial_tech_capacities.reset_index(), years
+    )
+    return available.set_index(["nodes", "techs"])
+
+
+def _vintage_availability_techs(years: list) -> pd.DataFrame:
+    return parse_available_vintages(
+        INPUT_FILES["stationary"]["techs"], years, option="share"
+    )
+
+
+# Keys match the data sources in the Italy `model.yaml` (and `OUTPUT_FILES`).
+STAGES = {
+    "initial_tech_capacities": Stage(_initial_tech_capacities),
+    "maximum_tech_capacities": Stage(
+        _maximum_tech_capacities, depends_on=("initial_tech_capacities",)
+    ),
+    "available_initial_cap_techs": Stage(
+        _available_initial_cap_techs,
+        depends_on=("initial_tech_capacities",),
+        cpu_bound=True,
+    ),
+    "vintage_availability_techs": Stage(_vintage_availability_techs, cpu_bound=True),
+    "vintage_availability_transmission": Stage(parse_transmission),
+    "investstep_resolution": Stage(parse_investstep_resolution),
+}
+
+
+def run_stages(
+    years: list,
+    stages: Optional[Iterable[str]] = None,
+    processes: bool = False,
+    max_workers: Optional[int] = None,
+) -> tuple[dict[str, pd.DataFrame], dict[str, float]]:
+    """Run pre-processing stages (see `STAGES`), each as soon as the stages it depends on are done.
+
+    Independent stages run concurrently in threads.
+    CPU-bound stages can optionally run in worker processes instead, which are started with the "spawn" method
+    (forking a process while stage threads are running risks deadlocks).
+
+    Args:
+        years (list): investsteps, in ascending order.
+        stages (Optional[Iterable[str]], optional):
+            Names of the stages to run, along with any stages they depend on.
+            Defaults to None (all stages).
+        processes (bool, optional):
+            If True, CPU-bound stages run in worker processes.
+            This only pays off if they take much longer than starting a process and passing their inputs and outputs to / from it.
+            Defaults to False.
+        max_workers (Optional[int], optional): Maximum number of threads and of processes. Defaults to None (one per stage).
+
+    Raises:
+        ValueError: Unknown stage names in `stages`.
+
+    Returns:
+        tuple[dict[str, pd.DataFrame], dict[str, float]]: Output and wall time (in seconds) of each stage that was run.
+    """
+    to_run = _with_dependencies(list(STAGES if stages is None else stages))
+    max_workers = max_workers or len(to_run)
+    outputs: dict[str, pd.DataFrame] = {}
+    timings: dict[str, float] = {}
+    with ExitStack() as stack:
+        threads = stack.enter_context(ThreadPoolExecutor(max_workers))
+        pool = (
+            stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            )
+            if processes and any(STAGES[name].cpu_bound for name in to_run)
+            else threads
+        )
+        running: dict[Future, str] = {}
+        while to_run or running:
+            ready = [
+                name
+                for name in to_run
+                if all(dep in outputs for dep in STAGES[name].depends_on)
+            ]
+            for name in ready:
+                stage = STAGES[name]
+                executor = pool if stage.cpu_bound else threads
+                inputs = {dep: outputs[dep] for dep in stage.depends_on}
+                running[executor.submit(_timed, stage.func, years, **inputs)] = name
+                to_run.remove(name)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                outputs[name], timings[name] = future.result()
+                LOGGER.info(f"Pre-processing | {name} | {timings[name]:.2f}s")
+    return outputs, timings
+
+
+def _with_dependencies(stages: list[str]) -> list[str]:
+    """`stages` and all the stages they (indirectly) depend on."""
+    unknown = set(stages).difference(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown pre-processing stages: {sorted(unknown)}.")
+    required: list[str] = []
+    for name in stages:
+        for dep in _with_dependencies(list(STAGES[name].depends_on)) + [name]:
+            if dep not in required:
+                required.append(dep)
+    return required
+
+
+def _timed(func: Callable, *args, **kwargs) -> tuple[Any, float]:
+    start = time.perf_counter()
+    output = func(*args, **kwargs)
+    return output, time.perf_counter() - start
+
+
+def data_tables(
+    first_year: int = 2025,
+    final_year: int = 2050,
+    investstep_resolution: int = 5,
+    processes: bool = False,
+) -> dict[str, pd.DataFrame]:
+    """Pre-process all Italy model input data in memory.
+
+    Args:
+        first_year (int, optional): First year of investment horizon (inclusive). Defaults to 2025.
+        final_year (int, optional): Final year of investment horizon (inclusive). Defaults to 2050.
+        investstep_resolution (int, optional): Year increment between investment periods. Defaults to 5.
+        processes (bool, optional): If True, run CPU-bound stages in worker processes (see `run_stages`). Defaults to False.
+
+    Returns:
+        dict[str, pd.DataFrame]:
+            Per data source in the Italy `model.yaml` (keys of `OUTPUT_FILES`), its data table,
+            indexed by the `rows` and `columns` of that data source such that it can be passed directly to `calliope.Model(data_source_dfs=...)`.
+    """
+    years = _get_years(first_year, final_year, investstep_resolution)
+    outputs, _ = run_stages(years, processes=processes)
+    return {name: outputs[name] for name in STAGES}
+
+
 def main(
     first_year: int = 2025,
     final_year: int = 2050,
@@ -334,45 +630,22 @@ def main(
     data_dir: str | Path = SRC_DIR / "model_configs" / "italy" / "data_sources",
     test_figs=False,
 ) -> dict:
-
+    """Pre-process all Italy model input data (see `data_tables`) and write it to CSV files in `data_dir` (at the paths in `OUTPUT_FILES`)."""
     data_dir = Path(data_dir)
-    investstep_dir = data_dir / "investstep_series"
-    investstep_dir.mkdir(exist_ok=True)
     output_files = {k: data_dir / v for k, v in OUTPUT_FILES.items()}
     for v in output_files.values():
         v.parent.mkdir(exist_ok=True, parents=True)
-    years = _get_years(first_year, final_year, investstep_resolution)
-
-    ini_cap = parse_initial_cap(INPUT_FILES["Calliope-Italy"]["locations"])
-    ini_cap.to_csv(output_files["initial_tech_capacities"], index=False)
 
-    cap_max_df = parse_cap_max(output_files["initial_tech_capacities"], FROZEN_TECHS)
-    cap_max_df.to_csv(output_files["maximum_tech_capacities"], index=False)
+    tables = data_tables(first_year, final_year, investstep_resolution)
+    for name, table in tables.items():
+        table.to_csv(output_files[name])
 
-    avail_ini_cap_df = parse_available_initial_cap(
-        INPUT_FILES["stationary"]["techs"],
-        output_files["initial_tech_capacities"],
-        years,
-    )
-    avail_ini_cap_df.to_csv(output_files["available_initial_cap_techs"], index=False)
-
-    avail_vint_df = parse_available_vintages(
-        INPUT_FILES["stationary"]["techs"],
-        years,
-        year_step=investstep_resolution,
-        option="share",
-    )
-    avail_vint_df.to_csv(output_files["vintage_availability_techs"])
-
-    avail_transmission = parse_transmission(years)
-    avail_transmission.to_csv(output_files["vintage_availability_transmission"])
-
-    investstep_resolution = parse_investstep_resolution(years)
-    investstep_resolution.to_csv(output_files["investstep_resolution"])
     if test_figs:
+        import matplotlib.pyplot as plt
+
         out_dir = Path("outputs")
         out_dir.mkdir(exist_ok=True)
-        avail_ini_cap_df.loc[:, years[0] :].T.plot(legend=False)
+        tables["available_initial_cap_techs"].T.plot(legend=False)
         plt.savefig(out_dir / "test.png")
     return output_files
 
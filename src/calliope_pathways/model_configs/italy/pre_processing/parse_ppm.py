@@ -8,16 +8,23 @@ Related functions have been removed, as linear or logarithmic regressions do not
 adequate when filling these values.
 """
 
+import functools
+import os
+from pathlib import Path
 from typing import Optional
 
 import geopandas as gpd
-import numpy as np
 import pandas as pd
 import parse_lombardi as lomb
 import pint_pandas  # noqa: F401, unused but necessary for unit handling.
 import powerplantmatching as ppm
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pycountry
 from pint import Quantity
+from powerplantmatching.utils import projectID_to_dict, set_column_name
+
+from calliope_pathways import cache, resolver
 
 u = pint_pandas.PintType.ureg
 
@@ -52,36 +59,90 @@ TECH_GROUPING = {
     "geothermal": {"Fueltype": "Geothermal", "Technology": ["Steam Turbine", ""]},
     "coal": {"Fueltype": "Hard Coal", "Technology": ["CCGT", "Steam Turbine"]},
 }
+PPM_UNITS = {
+    "Capacity": "MW",
+    "Efficiency": "percent",
+    "DateIn": "year",
+    "DateRetrofit": "year",
+    "DateOut": "year",
+    "lat": "deg",
+    "lon": "deg",
+    "Duration": "hours",
+    "Volume": "m^3",
+    "DamHeight": "m",
+    "StorageCapacity": "MWh",
+}
+# Columns needed to extract initial capacities
+PPM_COLUMNS = [
+    "Country",
+    "Fueltype",
+    "Technology",
+    "Capacity",
+    "DateIn",
+    "DateOut",
+    "lat",
+    "lon",
+]
+NUTS_COLUMNS = ["NUTS_ID", "CNTR_CODE", "LEVL_CODE", "NAME_LATN", "geometry"]
+NUTS_ASSIGNMENTS_NAMESPACE = "nuts_assignments"
+
+
+def ingest_ppm() -> Path:
+    """Store the powerplantmatching dataset as a typed Parquet file, with pint units in the column metadata.
+
+    The pre-matched powerplantmatching dataset is resolved to a local file using `calliope_pathways.resolver`
+    (equivalent to calling `ppm.powerplants(from_url=True)`) and ingested once per dataset version.
 
+    Returns:
+        Path: Parquet file.
+    """
+    url = ppm.get_config()["matched_data_url"].format(tag="v" + ppm.__version__)
+    csv_path = resolver.resolve(url)
 
-def extract_ppm() -> pd.DataFrame:
+    def _build(data_dir: Path):
+        plants = pd.read_csv(csv_path, index_col=0)
+        plants = plants.rename(
+            columns={col: col.split("_")[0] for col in plants.columns}
+        )
+        table = pa.Table.from_pandas(plants)
+        fields = [
+            (
+                field.with_metadata({"unit": PPM_UNITS[field.name]})
+                if field.name in PPM_UNITS
+                else field
+            )
+            for field in table.schema
+        ]
+        schema = pa.schema(fields, metadata=table.schema.metadata)
+        table = pa.Table.from_arrays(table.columns, schema=schema)
+        pq.write_table(table, data_dir / "powerplants.parquet")
+
+    entry_dir = cache.cached_directory("ppm_store", cache.file_hash(csv_path), _build)
+    return entry_dir / "powerplants.parquet"
+
+
+def extract_ppm(columns: Optional[list[str]] = None) -> pd.DataFrame:
     """Standardizes powerplantmatching data naming and enables pint usage.
 
+    Data is read from the Parquet store (see `ingest_ppm`), memory-mapping only the requested columns.
+    Project IDs (if requested) are parsed from their stored string form into dictionaries.
+
     Args:
-        year: system year to extract (future/decommissioned facilities will be removed).
+        columns (Optional[list[str]], optional): columns to load. Defaults to None (all columns).
 
     Returns:
         pd.DataFrame: cleaned dataframe.
     """
-    ppm_units = {
-        "Capacity": "MW",
-        "Efficiency": "percent",
-        "DateIn": "year",
-        "DateRetrofit": "year",
-        "DateOut": "year",
-        "lat": "deg",
-        "lon": "deg",
-        "Duration": "hours",
-        "Volume": "m^3",
-        "DamHeight": "m",
-        "StorageCapacity": "MWh",
-    }
-    plants = ppm.powerplants(from_url=True)
-    plants = plants.rename(columns={col: col.split("_")[0] for col in plants.columns})
-    for col, unit in ppm_units.items():
-        plants[col] = plants[col].astype(f"pint[{unit}]")
+    store_path = ingest_ppm()
+    plants = pd.read_parquet(store_path, columns=columns, memory_map=True)
+    for field in pq.read_schema(store_path):
+        if field.name in plants and b"unit" in (field.metadata or {}):
+            unit = field.metadata[b"unit"].decode()
+            plants[field.name] = plants[field.name].astype(f"pint[{unit}]")
+    if "projectID" in plants:
+        plants = projectID_to_dict(plants)
 
-    return plants
+    return set_column_name(plants, "Matched Data")
 
 
 @u.check(None, "[time]")
@@ -102,43 +163,145 @@ def transform_ppm_filter_initial_year(
     return plants
 
 
+@functools.cache
+def _country_alpha2(country: str) -> str:
+    """Get the ISO 3166 alpha-2 code of a country name, which may be inexact."""
+    country_data = pycountry.countries.get(name=country)
+    if country_data is None:
+        return pycountry.countries.search_fuzzy(country)[0].alpha_2
+    return country_data.alpha_2
+
+
+def ingest_nuts(nuts_file: str) -> Path:
+    """Store a NUTS geolocation file as GeoParquet.
+
+    Args:
+        nuts_file (str): a geolocation file (geojson) with NUTS ids. Resolved to a local file using `calliope_pathways.resolver`.
+
+    Returns:
+        Path: GeoParquet file.
+    """
+    nuts_path = resolver.resolve(nuts_file)
+
+    def _build(data_dir: Path):
+        gpd.read_file(nuts_path).to_parquet(data_dir / "nuts.parquet")
+
+    entry_dir = cache.cached_directory("nuts_store", cache.file_hash(nuts_path), _build)
+    return entry_dir / "nuts.parquet"
+
+
+def _load_nuts_regions(nuts_file: str, nuts_level: int) -> gpd.GeoDataFrame:
+    """Load NUTS regions of one level from the GeoParquet store, projected to EPSG:3857."""
+    regions = gpd.read_parquet(
+        ingest_nuts(nuts_file),
+        columns=NUTS_COLUMNS,
+        filters=[("LEVL_CODE", "==", nuts_level)],
+    )
+    return regions.to_crs(crs=3857)
+
+
+def _magnitude(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pint_pandas.PintType):
+        return series.pint.magnitude
+    return series.astype(float)
+
+
 def transform_ppm_add_nuts(
     plants: pd.DataFrame, nuts_file: str, nuts_level: Optional[int] = 2
 ) -> pd.DataFrame:
     """Assign NUTS regions to powerplants using point data (lat, lon).
 
+    NUTS regions are read from the GeoParquet store (see `ingest_nuts`).
+    Plant to NUTS region assignments are cached on disk (keyed on plant ID and coordinates),
+    in a cache entry per version of the NUTS data (by content hash), NUTS level and set of countries.
+    Only plants that have not previously been assigned a region are spatially joined to the regions.
+    Plants that cannot be assigned a region (e.g., without coordinates) have no `NUTS_ID`.
+
     Args:
         plants (pd.DataFrame): powerplantmatching data.
-        nuts_file (str): a geolocation file (geojson) with NUTS ids.
+        nuts_file (str): a geolocation file (geojson) with NUTS ids. Resolved to a local file using `calliope_pathways.resolver`.
         nuts_level (Optional[int], optional): NUTS resolution to use. Defaults to 2.
 
     Returns:
         pd.DataFrame: powerplantmatching data with additional geodata.
     """
     # Get necessary regional data.
-    spatial_df = gpd.read_file(nuts_file)
-    countries_alpha2 = []
-    for country in plants["Country"].unique():
-        country_data = pycountry.countries.get(name=country)
-        if country_data is None:
-            alpha_2 = pycountry.countries.search_fuzzy(country)[0].alpha_2
-        else:
-            alpha_2 = country_data.alpha_2
-        countries_alpha2.append(alpha_2)
-
+    spatial_df = _load_nuts_regions(nuts_file, nuts_level)
+    countries_alpha2 = sorted({_country_alpha2(i) for i in plants["Country"].unique()})
     spatial_df = spatial_df.loc[spatial_df["CNTR_CODE"].isin(countries_alpha2)]
-    spatial_df = spatial_df.loc[spatial_df["LEVL_CODE"] == nuts_level]
 
     # Set the NUTS region of each power plant.
     geo_plants = gpd.GeoDataFrame(
-        plants, geometry=gpd.points_from_xy(plants.lon, plants.lat)
+        plants,
+        geometry=gpd.points_from_xy(_magnitude(plants.lon), _magnitude(plants.lat)),
     )
     geo_plants = geo_plants.set_crs("epsg:4326").to_crs(crs=3857)
-    geo_plants = gpd.sjoin_nearest(geo_plants, spatial_df.to_crs(geo_plants.crs))
+
+    nuts_hash = cache.file_hash(resolver.resolve(nuts_file))
+    entry_dir = cache.cached_directory(
+        NUTS_ASSIGNMENTS_NAMESPACE,
+        cache.fingerprint(nuts_hash, nuts_level, countries_alpha2),
+        lambda data_dir: None,
+    )
+    nuts_ids = _assign_nuts_ids(geo_plants, spatial_df, entry_dir / "assignments.csv")
+    # Assignments are added to existing entries, so their size is only known now.
+    cache.evict(NUTS_ASSIGNMENTS_NAMESPACE, keep=entry_dir.name)
+    region_data = spatial_df.drop(columns="geometry").set_index("NUTS_ID")
+    geo_plants = geo_plants.assign(NUTS_ID=nuts_ids).join(region_data, on="NUTS_ID")
 
     return geo_plants
 
 
+def _assign_nuts_ids(
+    geo_plants: gpd.GeoDataFrame, spatial_df: gpd.GeoDataFrame, assignment_file: Path
+) -> pd.Series:
+    """Get the NUTS ID of the region nearest to each plant, re-using previous assignments stored in `assignment_file`."""
+    keys = pd.DataFrame(
+        {
+            "id": geo_plants.index,
+            "lat": _magnitude(geo_plants["lat"]).to_numpy(),
+            "lon": _magnitude(geo_plants["lon"]).to_numpy(),
+        }
+    )
+    if assignment_file.exists():
+        known = pd.read_csv(
+            assignment_file,
+            dtype={"id": keys["id"].dtype},
+            float_precision="round_trip",
+        )
+        known = known.dropna(subset=["NUTS_ID"]).drop_duplicates(
+            ["id", "lat", "lon"], keep="last"
+        )
+    else:
+        known = pd.DataFrame(columns=["id", "lat", "lon", "NUTS_ID"])
+    nuts_ids = keys.merge(known, on=["id", "lat", "lon"], how="left")["NUTS_ID"]
+
+    missing = nuts_ids.isna().to_numpy()
+    if missing.any():
+        joined = gpd.sjoin_nearest(
+            geo_plants.loc[missing, ["geometry"]], spatial_df[["NUTS_ID", "geometry"]]
+        )
+        # Plants equidistant to several regions are assigned to the first one.
+        joined = joined.loc[~joined.index.duplicated()]
+        nuts_ids[missing] = joined["NUTS_ID"].reindex(geo_plants.index[missing]).values
+
+        # Plants without a match are not stored, so that they are joined again next time rather than duplicated.
+        new = (
+            keys.loc[missing]
+            .assign(NUTS_ID=nuts_ids[missing].values)
+            .dropna(subset=["NUTS_ID"])
+        )
+        if not new.empty:
+            updated = new if known.empty else pd.concat([known, new], ignore_index=True)
+            updated = updated.drop_duplicates(["id", "lat", "lon"], keep="last")
+            assignment_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = assignment_file.with_suffix(f".{os.getpid()}.tmp")
+            updated.to_csv(tmp_file, index=False)
+            os.replace(tmp_file, assignment_file)
+
+    return pd.Series(nuts_ids.to_numpy(), index=geo_plants.index)
+
+
 def transform_ppm_group_tech_nodes(
     plants: pd.DataFrame, tech_grouping: dict, node_grouping: Optional[dict] = None
 ) -> pd.DataFrame:
@@ -157,15 +320,10 @@ def transform_ppm_group_tech_nodes(
         ValueError: If the given node_grouping is not exhaustive
     """
     # Assign a calliope technology to each power plant.
-    plants["techs"] = pd.Series(np.nan, dtype="string")
-    list_ppm_techs_txt = plants.Technology.fillna("")  # Make comparisons easier.
-    tech_cnf = pd.DataFrame.from_dict(tech_grouping)
-    for tech in tech_cnf.columns:
-        fuel = tech_cnf.loc["Fueltype", tech]
-        for tech_ppm in tech_cnf.loc["Technology", tech]:
-            plants.loc[
-                (plants.Fueltype == fuel) & (list_ppm_techs_txt == tech_ppm), "techs"
-            ] = tech
+    ppm_techs = plants[["Fueltype", "Technology"]].fillna("")  # Make matches easier.
+    plants = plants.assign(
+        techs=lomb.transform_frame(ppm_techs, tech_grouping, ["Fueltype", "Technology"])
+    )
 
     # Assign a calliope node to each power plant.
     if node_grouping is not None:
@@ -175,11 +333,6 @@ def transform_ppm_group_tech_nodes(
     else:
         plants = plants.assign(nodes=plants["NUTS_ID"])
 
-    if any(plants["techs"].isna()):
-        raise ValueError("Not all technologies could be translated to Calliope.")
-    if any(plants["nodes"].isna()):
-        raise ValueError("Not all NUTS regions could be translated to Calliope.")
-
     return plants
 
 
@@ -215,7 +368,7 @@ def main():
     nuts_file = "https://gisco-services.ec.europa.eu/distribution/v2/nuts/geojson/NUTS_RG_20M_2021_4326.geojson"
     save_path = "src/calliope_pathways/models/italy/data_sources/initial_capacity_techs_ppm_kw.csv"
 
-    plants = extract_ppm()
+    plants = extract_ppm(PPM_COLUMNS)
 
     plants = transform_ppm_filter_initial_year(plants, year)
     plants = transform_ppm_add_nuts(plants, nuts_file, nuts_level=2)
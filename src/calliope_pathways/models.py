@@ -8,35 +8,47 @@
 Models that can be loaded directly into a session.
 """
 
-import tempfile
 from pathlib import Path
+from typing import Optional
 
+import pandas as pd
 from calliope import AttrDict
 from calliope.model import Model
-from calliope.util import schema
 
-from calliope_pathways.model_configs import parse_lombardi
-from calliope_pathways.util import src_dir_ref
+from calliope_pathways import cache, compact, snapshots, validation
+from calliope_pathways import synthetic as synthetic_models
+from calliope_pathways.util import register_extensions, src_dir_ref
 
-new_schema = AttrDict.from_yaml(src_dir_ref("config") / "new_param_schema.yaml")
 
-for key, new_params in new_schema.items():
-    schema.update_model_schema(key, new_params, allow_override=False)
+def national_scale(snapshot: bool = False, **kwargs) -> Model:
+    """Returns the built-in national-scale example model.
 
+    Args:
+        snapshot (bool, optional):
+            If True, the initialised model will be loaded from / stored as a snapshot (see `calliope_pathways.snapshots`).
+            Defaults to False.
+        **kwargs: Passed on to `calliope.Model(...)`.
 
-def national_scale(**kwargs) -> Model:
-    """Returns the built-in national-scale example model."""
+    Returns:
+        Model: Initialised national-scale Calliope Model.
+    """
+    model_dir = src_dir_ref("model_configs") / "national_scale"
+    if snapshot:
+        return snapshots.load_or_init(
+            snapshots.snapshot_key(model_dir, **kwargs),
+            lambda: national_scale(**kwargs),
+        )
 
-    return Model(
-        model_definition=src_dir_ref("model_configs") / "national_scale" / "model.yaml",
-        **kwargs,
-    )
+    model = _init_model(model_dir / "model.yaml", **kwargs)
+    return _compact_inputs(model)
 
 
 def italy(
     first_year: int = 2025,
     final_year: int = 2050,
     investstep_resolution: int = 5,
+    use_cache: bool = True,
+    snapshot: bool = False,
     **kwargs,
 ) -> Model:
     """Returns stationary test-case for Italy.
@@ -45,24 +57,111 @@ def italy(
         first_year (int, optional): First year of investment horizon (inclusive). Defaults to 2025.
         final_year (int, optional): Final year of investment horizon (inclusive). Defaults to 2050.
         investstep_resolution (int, optional): Year increment between investment periods. Defaults to 5.
+        use_cache (bool, optional):
+            If True, pre-processed input data will be loaded from / stored in the on-disk cache (see `calliope_pathways.cache`).
+            If False, input data will be pre-processed from scratch.
+            Either way, pre-processed data is passed to the model in memory, as data tables.
+            Defaults to True.
+        snapshot (bool, optional):
+            If True, the initialised model will be loaded from / stored as a snapshot (see `calliope_pathways.snapshots`),
+            skipping pre-processing altogether when loaded.
+            Defaults to False.
         **kwargs: Passed on to `calliope.Model(...)`.
 
     Returns:
         Model: Initialised Italy Calliope Model.
     """
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        source_dirs = parse_lombardi.main(
-            first_year, final_year, investstep_resolution, data_dir=tmp_dir
+    # Only imported when needed, as pre-processing has heavy dependencies.
+    from calliope_pathways.model_configs import parse_lombardi
+
+    if snapshot:
+        return snapshots.load_or_init(
+            snapshots.snapshot_key(
+                src_dir_ref("model_configs") / "italy",
+                parse_lombardi.cache_key(first_year, final_year, investstep_resolution),
+                **kwargs,
+            ),
+            lambda: italy(
+                first_year, final_year, investstep_resolution, use_cache, **kwargs
+            ),
         )
-        data_source_overrides = {
-            f"data_sources.{k}.source": v.as_posix() for k, v in source_dirs.items()
-        }
-        override_dict = {**data_source_overrides, **kwargs.pop("override_dict", {})}
-        return Model(
-            model_definition=src_dir_ref("model_configs") / "italy" / "model.yaml",
-            override_dict=override_dict,
-            **kwargs,
+
+    if not use_cache:
+        data_tables = parse_lombardi.data_tables(
+            first_year, final_year, investstep_resolution
         )
+        return _italy_from_data_tables(data_tables, **kwargs)
+
+    entry_dir = cache.cached_directory(
+        "italy",
+        parse_lombardi.cache_key(first_year, final_year, investstep_resolution),
+        lambda data_dir: _dump_data_tables(
+            parse_lombardi.data_tables(first_year, final_year, investstep_resolution),
+            data_dir,
+        ),
+    )
+    return _italy_from_data_tables(_load_data_tables(entry_dir), **kwargs)
+
+
+def synthetic(scale: Optional[dict] = None, **kwargs) -> Model:
+    """Returns a synthetic pathway model of controllable size (see `calliope_pathways.synthetic`).
+
+    Args:
+        scale (Optional[dict], optional):
+            Passed on to `calliope_pathways.synthetic.model_definition` (e.g., `{"nodes": 100, "timesteps": 8760}`).
+            Defaults to None (a small model with 4 nodes and one week of hourly timesteps).
+        **kwargs: Passed on to `calliope.Model(...)`.
+
+    Returns:
+        Model: Initialised synthetic Calliope Model.
+    """
+    model_definition, data_source_dfs = synthetic_models.model_definition(
+        **(scale or {})
+    )
+    model = _init_model(model_definition, data_source_dfs=data_source_dfs, **kwargs)
+    return _compact_inputs(model)
+
+
+def _italy_from_data_tables(data_tables: dict[str, pd.DataFrame], **kwargs) -> Model:
+    """Initialise the Italy model with its pre-processed data sources given as in-memory data tables."""
+    data_source_overrides = {f"data_sources.{k}.source": k for k in data_tables}
+    override_dict = {**data_source_overrides, **kwargs.pop("override_dict", {})}
+    data_source_dfs = {**data_tables, **kwargs.pop("data_source_dfs", {})}
+    model = _init_model(
+        src_dir_ref("model_configs") / "italy" / "model.yaml",
+        override_dict=override_dict,
+        data_source_dfs=data_source_dfs,
+        **kwargs,
+    )
+    return _compact_inputs(model)
+
+
+def _dump_data_tables(data_tables: dict[str, pd.DataFrame], path: Path) -> None:
+    """Store data tables in binary form, so that they are loaded with their index and dtypes intact (no CSV parsing)."""
+    for name, table in data_tables.items():
+        table.to_pickle(path / f"{name}.pkl")
+
+
+def _load_data_tables(path: Path) -> dict[str, pd.DataFrame]:
+    return {file.stem: pd.read_pickle(file) for file in sorted(path.glob("*.pkl"))}
+
+
+def _init_model(model_definition: str | Path | dict, **kwargs) -> Model:
+    """Initialise a model and validate its inputs (see `calliope_pathways.validation`).
+
+    The keyword arguments the model was initialised with are kept, so it can be re-initialised (see `calliope_pathways.scenarios`).
+    """
+    register_extensions()
+    model = Model(model_definition=model_definition, **kwargs)
+    validation.check_inputs(model._model_data)
+    model._init_kwargs = kwargs
+    return model
+
+
+def _compact_inputs(model: Model) -> Model:
+    """Store investstep-invariant model inputs without the `investsteps` dimension (see `calliope_pathways.compact`)."""
+    model._model_data = compact.compact_investsteps(model._model_data)
+    return model
 
 
 def load(
@@ -80,8 +179,8 @@ def load(
     Keyword Args: Passed on to `calliope.Model`.
     """
 
-    model = Model(model_definition=model_definition, **kwargs)
+    model = _init_model(model_definition, **kwargs)
     if add_pathways_math:
         math = AttrDict.from_yaml(src_dir_ref("math") / "pathways.yaml")
         model.math.union(math, allow_override=True)
-    return model
+    return _compact_inputs(model)
@@ -0,0 +1,172 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Myopic (rolling-horizon) solve of pathway models.
+
+Instead of optimising all investsteps at once (perfect foresight), investsteps are optimised one after the other.
+Each optimisation problem covers a window of `foresight` investsteps, starting at the investstep being decided.
+The capacity added in that investstep (i.e., the `*_new` vintage decisions) is then fixed in all later windows,
+in which it contributes to available capacity according to `available_vintages`, as initial capacity does according to `available_initial_cap`.
+
+Since each optimisation problem only includes the timeseries of the investsteps in its window,
+it needs a fraction of the memory of the perfect foresight problem.
+Constraints that link operational decisions between investsteps (i.e., `link_storage_level`) are not applied between windows.
+Since capacity cannot be decommissioned early, a window can become infeasible if a previous window added capacity
+that exceeds limits in investsteps it could not see (e.g., a `flow_cap_max_systemwide` that decreases to zero).
+"""
+
+import copy
+import logging
+import time
+
+import xarray as xr
+from calliope import AttrDict
+from calliope.model import Model
+from calliope.util.schema import update_then_validate_config
+
+from calliope_pathways.util import register_extensions, store_results
+
+LOGGER = logging.getLogger(__name__)
+
+_VINTAGE_VARIABLES = [
+    "flow_cap_new",
+    "storage_cap_new",
+    "source_cap_new",
+    "area_use_new",
+]
+_PREVIOUS_FLOW_CAP = "myopic_flow_cap_previous"
+
+
+def solve_myopic(model: Model, foresight: int = 1, **kwargs) -> None:
+    """Solve a pathway model one investstep at a time, storing the results in the model as `model.solve()` would.
+
+    Args:
+        model (Model): Initialised (not necessarily built) pathway model.
+        foresight (int, optional):
+            Number of investsteps in each optimisation problem, including the investstep being decided.
+            Defaults to 1 (no look-ahead).
+        **kwargs: Solve configuration overrides (e.g., `solver`), as in `model.solve(...)`.
+
+    Raises:
+        ValueError: Model has no investsteps or `foresight` is less than 1.
+        ValueError: The optimisation problem of an investstep could not be solved to optimality.
+    """
+    register_extensions()
+    inputs = model._model_data.filter_by_attrs(is_result=0)
+    inputs.attrs = model._model_data.attrs
+    if "investsteps" not in inputs.dims:
+        raise ValueError("Myopic optimisation requires a model with `investsteps`.")
+    if foresight < 1:
+        raise ValueError(f"Foresight must be at least one investstep, got {foresight}.")
+
+    build_config = model.config["build"]
+    solve_config = update_then_validate_config("solve", model.config, **kwargs)
+    investsteps = inputs.investsteps.values
+    fixed: dict[str, xr.DataArray] = {}
+    step_results = []
+    start = time.time()
+    for idx, investstep in enumerate(investsteps):
+        window = investsteps[idx : idx + foresight]
+        window_inputs = _window_inputs(inputs, window, step_results)
+        backend = model._BACKENDS[build_config["backend"]](
+            window_inputs, **build_config
+        )
+        backend._build()
+        _fix_vintages(backend, fixed)
+        results = backend._solve(warmstart=False, **solve_config)
+        termination = results.attrs["termination_condition"]
+        if termination != "optimal":
+            raise ValueError(
+                f"Myopic | investstep {investstep}: optimisation problem is {termination}."
+            )
+        step_results.append(results.sel(investsteps=[investstep]))
+        for name in _VINTAGE_VARIABLES:
+            if name not in backend.variables:
+                continue
+            # Taken from the backend rather than the results to keep full precision,
+            # as fixed vintages are linked by equality constraints (e.g., `area_use_per_flow_cap`).
+            values = (
+                backend.get_variable(name, as_backend_objs=False)
+                .sel(vintagesteps=slice(None, investstep))
+                .astype(float)
+            )
+            # Vintages that are unavailable in later windows are not part of their optimisation problems.
+            fixed[name] = values.combine_first(fixed[name]) if name in fixed else values
+        LOGGER.info(
+            f"Myopic | investstep {investstep} | "
+            f"window of {len(window)} investstep(s) solved ({time.time() - start:.1f}s)."
+        )
+
+    results = xr.merge(
+        [
+            xr.concat(
+                [
+                    result[
+                        [
+                            k
+                            for k, v in result.data_vars.items()
+                            if "investsteps" in v.dims
+                        ]
+                    ]
+                    for result in step_results
+                ],
+                dim="investsteps",
+            ),
+            # Decisions that are not indexed over investsteps (e.g., vintages) are taken from the window that fixed them.
+            results[
+                [k for k, v in results.data_vars.items() if "investsteps" not in v.dims]
+            ].assign(
+                {
+                    name: values.combine_first(results[name]).assign_attrs(
+                        results[name].attrs
+                    )
+                    for name, values in fixed.items()
+                }
+            ),
+        ],
+        compat="override",
+    )
+    results.attrs = {"termination_condition": "optimal", "myopic_foresight": foresight}
+    store_results(model, results)
+
+
+def _window_inputs(
+    inputs: xr.Dataset, window, step_results: list[xr.Dataset]
+) -> xr.Dataset:
+    """Inputs restricted to the investsteps of a window and the vintages that can be commissioned up to its final investstep."""
+    window_inputs = inputs.sel(investsteps=window, vintagesteps=slice(None, window[-1]))
+    math = copy.deepcopy(inputs.attrs["math"])
+    if step_results and "flow_cap" in step_results[-1]:
+        # Rate of new capacity in the first investstep of the window is relative to the capacity decided in the previous window.
+        window_inputs[_PREVIOUS_FLOW_CAP] = (
+            step_results[-1]["flow_cap"]
+            .squeeze("investsteps", drop=True)
+            .assign_attrs(is_result=0)
+        )
+        _limit_rate_by_previous_flow_cap(math)
+    window_inputs.attrs = {**inputs.attrs, "math": math}
+    return window_inputs
+
+
+def _limit_rate_by_previous_flow_cap(math: AttrDict) -> None:
+    constraint = math.get_key("constraints.limit_flow_cap_new_max_rate", None)
+    if constraint is None:
+        return
+    for sub_expression in constraint.get("sub_expressions", {}).get(
+        "prev_flow_cap", []
+    ):
+        for key in ["where", "expression"]:
+            sub_expression[key] = sub_expression[key].replace(
+                "flow_cap_initial", _PREVIOUS_FLOW_CAP
+            )
+
+
+def _fix_vintages(backend, fixed: dict[str, xr.DataArray]) -> None:
+    """Fix vintage decisions of previous windows to their optimal values."""
+    for name, values in fixed.items():
+        variable = backend.get_variable(name)
+        values = values.reindex_like(variable).transpose(*variable.dims)
+        mask = (variable.notnull() & values.notnull()).values
+        for var, val in zip(variable.values[mask], values.values[mask]):
+            var.fix(val)
@@ -0,0 +1,139 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Per-component profiling of building the optimisation problem of a model.
+
+`profile_build` builds a model as `model.build()` would, measuring each math component
+(variable, global expression, constraint and objective) as it is added to the backend:
+
+- `time`: wall time to add the component, in seconds.
+- `memory` / `peak_memory`: net / peak memory allocated while adding the component, in bytes (traced with `tracemalloc`).
+- `where_elements`: number of array elements `where` masks are evaluated over, i.e., the size of the product of the component's `foreach` dimensions.
+- `objects`: number of backend objects (e.g., constraints) the component results in.
+
+Converting input data to backend parameters is profiled as the first row (`inputs`).
+"""
+
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from calliope.model import Model
+
+LOGGER = logging.getLogger(__name__)
+
+_COMPONENT_GROUPS = ["variables", "global_expressions", "constraints", "objectives"]
+
+
+def profile_build(
+    model: Model,
+    path: Optional[str | Path] = None,
+    force: bool = False,
+    memory: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """Build a model, profiling every math component as it is added to the backend.
+
+    Args:
+        model (Model): Initialised pathway model.
+        path (Optional[str | Path], optional): If given, JSON file to dump the profile to (one record per component). Defaults to None.
+        force (bool, optional): If True, any existing optimisation problem will be overwritten, as in `model.build(...)`. Defaults to False.
+        memory (bool, optional):
+            If True, trace memory allocations (which slows down the build).
+            If False, `memory` and `peak_memory` are not profiled.
+            Defaults to True.
+        **kwargs: Build configuration overrides, as in `model.build(...)`.
+
+    Raises:
+        ValueError: Model is already built and `force` is False.
+        ValueError: Build mode is `operate`.
+
+    Returns:
+        pd.DataFrame: Profile of each component (index), in the order in which they were built.
+    """
+    if model._is_built and not force:
+        raise ValueError(
+            "This model already has a built optimisation problem; use `force=True` to overwrite it."
+        )
+    build_config = {**model.config["build"], **kwargs}
+    if build_config["mode"] == "operate":
+        raise ValueError("Build profiling is not available in `operate` mode.")
+
+    records = []
+    with _tracing(memory):
+        with _measure(records, "inputs", "parameters", memory) as record:
+            backend = model._BACKENDS[build_config["backend"]](
+                model._model_data, **build_config
+            )
+        record["objects"] = sum(
+            int(backend._dataset[name].notnull().sum()) for name in backend.parameters
+        )
+        backend._add_run_mode_math()
+        for group in _COMPONENT_GROUPS:
+            add_component = getattr(backend, f"add_{group.removesuffix('s')}")
+            for name, component in backend.inputs.math[group].items():
+                with _measure(records, name, group, memory) as record:
+                    add_component(name)
+                record["where_elements"] = int(
+                    np.prod(
+                        [
+                            backend.inputs.sizes[dim]
+                            for dim in component.get("foreach", [])
+                        ]
+                    )
+                )
+                record["objects"] = (
+                    int(backend._dataset[name].notnull().sum())
+                    if name in backend._dataset
+                    else 0
+                )
+    model.backend = backend
+    model._is_built = True
+
+    profile = pd.DataFrame.from_records(records, index="component")
+    slowest = profile.time.nlargest(5)
+    LOGGER.info(
+        "Profile | slowest components: "
+        + ", ".join(f"{name} ({seconds:.2f}s)" for name, seconds in slowest.items())
+    )
+    if path is not None:
+        profile.reset_index().to_json(path, orient="records", indent=2)
+    return profile
+
+
+@contextmanager
+def _tracing(memory: bool) -> Iterator[None]:
+    """Trace memory allocations if requested and not already being traced."""
+    start = memory and not tracemalloc.is_tracing()
+    if start:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if start:
+            tracemalloc.stop()
+
+
+@contextmanager
+def _measure(
+    records: list[dict], name: str, group: str, memory: bool
+) -> Iterator[dict]:
+    """Append a record of the wall time and memory allocated while running the context to `records`."""
+    record = {"component": name, "group": group}
+    if memory:
+        tracemalloc.reset_peak()
+        initial_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    yield record
+    record["time"] = time.perf_counter() - start
+    if memory:
+        current_memory, peak_memory = tracemalloc.get_traced_memory()
+        record["memory"] = current_memory - initial_memory
+        record["peak_memory"] = peak_memory - initial_memory
+    records.append(record)
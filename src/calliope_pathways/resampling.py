@@ -0,0 +1,154 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Per-investstep temporal resolution of pathway model timeseries.
+
+Distant investsteps can be resampled to a coarser resolution than near-term ones, shrinking the optimisation problem.
+(To cluster timeseries into a different number of representative days per investstep, see `calliope_pathways.clustering`.)
+
+All investsteps share one `timesteps` dimension, the union of the timesteps of each investstep.
+Timeseries inputs, including `timestep_resolution` and `timestep_weights`, are indexed over `investsteps`
+and only defined in the timesteps of each investstep, to which timestep-dependent math components are limited.
+References to the previous and final timestep (storage and ramping) are made within each investstep by
+the math in `math/investstep_timesteps.yaml`, using the lookups:
+
+- `lookup_investstep_previous_timestep`: the previous timestep in the same investstep (the final one, for the first timestep).
+- `lookup_investstep_final_timestep`: the final timestep of the investstep, defined in its first timestep.
+- `lookup_investsteps`: the investstep itself, defined in its timesteps.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from calliope import AttrDict
+from calliope.model import Model
+from calliope.preprocess import time
+
+from calliope_pathways.util import src_dir_ref
+
+LOGGER = logging.getLogger(__name__)
+
+_MATH_COMPONENTS = ["variables", "global_expressions", "constraints"]
+_ACTIVE_TIMESTEPS = "timestep_resolution"
+
+
+def resample_investsteps(model: Model, resolutions: dict) -> Model:
+    """Resample the model timeseries of each investstep to its own resolution, in place.
+
+    Args:
+        model (Model): Initialised (not built) pathway model.
+        resolutions (dict):
+            Resolution (pandas frequency string) of investsteps (keys), e.g., `{2040: "6h", 2050: "24h"}`.
+            Investsteps that are not given keep the resolution the model was initialised with.
+
+    Raises:
+        ValueError: Model is already built.
+        ValueError: Model timeseries have been clustered.
+
+    Returns:
+        Model: `model`, with per-investstep timeseries.
+    """
+    if model._is_built:
+        raise ValueError("Resampling must be applied before building a model.")
+    if "timestep_cluster" in model._model_data:
+        raise ValueError(
+            "Cannot resample investsteps of a model with clustered timeseries."
+        )
+    model._model_data = apply_investstep_resolutions(model._model_data, resolutions)
+    model.math.union(
+        AttrDict.from_yaml(src_dir_ref("math") / "investstep_timesteps.yaml"),
+        allow_override=True,
+    )
+    for component_group in _MATH_COMPONENTS:
+        for component in model.math[component_group].values():
+            if "timesteps" in component.get("foreach", []):
+                where = component.get("where", None)
+                component["where"] = (
+                    _ACTIVE_TIMESTEPS
+                    if where is None
+                    else f"({where}) AND {_ACTIVE_TIMESTEPS}"
+                )
+    return model
+
+
+def apply_investstep_resolutions(
+    model_data: xr.Dataset, resolutions: dict
+) -> xr.Dataset:
+    """Resample timeseries per investstep, onto the union of the timesteps of all investsteps.
+
+    Args:
+        model_data (xr.Dataset): Model data.
+        resolutions (dict): Resolution of investsteps (see `resample_investsteps`).
+
+    Raises:
+        ValueError: A resolution is finer than the model resolution.
+        ValueError: Not all investsteps start in the first model timestep.
+
+    Returns:
+        xr.Dataset: Model data with per-investstep timeseries and lookups between timesteps of the same investstep.
+    """
+    resolutions = {pd.Timestamp(str(k)): v for k, v in resolutions.items()}
+    timeseries = model_data[
+        [name for name, da in model_data.data_vars.items() if "timesteps" in da.dims]
+    ]
+    by_investstep = []
+    for investstep in model_data.investsteps.to_index():
+        data = (
+            timeseries.sel(investsteps=investstep, drop=True)
+            if "investsteps" in timeseries.dims
+            else timeseries
+        )
+        if investstep in resolutions:
+            resampled = time.resample(data, resolutions[investstep])
+            if resampled.sizes["timesteps"] > data.sizes["timesteps"]:
+                raise ValueError(
+                    f"Cannot resample investstep {investstep.year} to `{resolutions[investstep]}`, "
+                    "which is finer than the model resolution."
+                )
+            data = resampled
+        by_investstep.append(data)
+    timeseries = xr.concat(
+        by_investstep, dim=model_data.investsteps, data_vars="all", join="outer"
+    )
+    for name, da in timeseries.data_vars.items():
+        da.attrs = model_data[name].attrs
+
+    active = timeseries[_ACTIVE_TIMESTEPS].notnull().transpose("timesteps", ...)
+    if not active.isel(timesteps=0).all():
+        raise ValueError(
+            "Per-investstep resolutions must all start in the first model timestep."
+        )
+    model_data = xr.merge([model_data.drop_dims("timesteps"), timeseries])
+    model_data = model_data.assign(_lookups(active))
+    model_data.attrs["allow_operate_mode"] = 0
+    LOGGER.info(
+        "Resampling | timesteps per investstep: "
+        + ", ".join(
+            f"{investstep.year}: {n}"
+            for investstep, n in active.sum("timesteps").to_series().items()
+        )
+    )
+    return model_data
+
+
+def _lookups(active: xr.DataArray) -> dict[str, xr.DataArray]:
+    """Lookups of the previous and final timestep, and of the investstep, of each active (timesteps, investsteps) pair."""
+    timesteps = active.timesteps.values
+    previous = np.full(active.shape, np.datetime64("NaT"), dtype=timesteps.dtype)
+    final = previous.copy()
+    for i in range(active.sizes["investsteps"]):
+        (positions,) = np.nonzero(active.values[:, i])
+        previous[positions, i] = timesteps[np.roll(positions, 1)]
+        final[positions[0], i] = timesteps[positions[-1]]
+    investsteps = xr.where(active, active.investsteps, np.datetime64("NaT"))
+    return {
+        name: xr.DataArray(values, coords=active.coords).assign_attrs(is_result=0)
+        for name, values in {
+            "lookup_investstep_previous_timestep": previous,
+            "lookup_investstep_final_timestep": final,
+            "lookup_investsteps": investsteps.values,
+        }.items()
+    }
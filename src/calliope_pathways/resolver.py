@@ -0,0 +1,207 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Resolve remote pre-processing input files to a local store.
+
+Files are looked up, in order, in:
+
+1. The local store (`<cache root>/inputs`), which holds every file previously resolved.
+2. Mirrors: local directories (or `file://` URLs) holding copies of the remote files,
+either in a flat layout (`<mirror>/<file name>`) or mirroring the URL (`<mirror>/<host>/<path>`).
+3. The network, unless working offline.
+
+Once a file is in the store it is never fetched again (unless explicitly refreshed), so builds are deterministic.
+Expected SHA-256 hashes can be registered per URL; they are checked whenever a file enters the store or is resolved from it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from calliope_pathways import cache
+
+LOGGER = logging.getLogger(__name__)
+
+OFFLINE_ENV_VAR = "CALLIOPE_PATHWAYS_OFFLINE"
+MIRRORS_ENV_VAR = "CALLIOPE_PATHWAYS_MIRRORS"
+_METADATA_FILE = "metadata.json"
+
+
+class InputResolver:
+    def __init__(
+        self,
+        store_dir: Optional[str | Path] = None,
+        mirrors: Iterable[str | Path] = (),
+        offline: bool = False,
+        checksums: Optional[dict[str, str]] = None,
+    ):
+        """Map remote input file URLs to local files.
+
+        Args:
+            store_dir (Optional[str | Path], optional):
+                Directory in which resolved files are stored.
+                Can be pre-seeded by copying the store of another machine.
+                Defaults to `<cache root>/inputs`.
+            mirrors (Iterable[str | Path], optional):
+                Local directories or `file://` URLs to search before going to the network.
+                Defaults to ().
+            offline (bool, optional):
+                If True, never go to the network; files missing from the store and mirrors raise an error.
+                Defaults to False.
+            checksums (Optional[dict[str, str]], optional):
+                Expected SHA-256 hex digests of files, keyed by URL.
+                Defaults to None.
+        """
+        self.store_dir = Path(
+            store_dir if store_dir is not None else cache.cache_root() / "inputs"
+        )
+        self.mirrors = [_to_path(mirror) for mirror in mirrors]
+        self.offline = offline
+        self.checksums = dict(checksums or {})
+
+    @classmethod
+    def from_env(cls) -> "InputResolver":
+        """Resolver configured by environment variables.
+
+        * `CALLIOPE_PATHWAYS_MIRRORS`: mirrors, separated by the OS path separator (`:` on UNIX, `;` on Windows).
+        * `CALLIOPE_PATHWAYS_OFFLINE`: work offline if set to `1`/`true`/`yes`.
+        * `CALLIOPE_PATHWAYS_CACHE_DIR`: cache root, in which the `inputs` store is placed.
+        """
+        mirrors = [
+            i for i in os.environ.get(MIRRORS_ENV_VAR, "").split(os.pathsep) if i
+        ]
+        offline = os.environ.get(OFFLINE_ENV_VAR, "").lower() in ["1", "true", "yes"]
+        return cls(mirrors=mirrors, offline=offline)
+
+    def register(self, url: str, sha256: str) -> None:
+        """Pin the expected SHA-256 hex digest of the file at `url`."""
+        self.checksums[url] = sha256
+
+    def resolve(self, url: str | Path, refresh: bool = False) -> Path:
+        """Get a local path to the file at `url`.
+
+        Args:
+            url (str | Path): Remote URL, `file://` URL, or local path.
+            refresh (bool, optional):
+                If True, revalidate a stored file against the remote using its ETag (before consulting any mirror)
+                and update it if it has changed.
+                Ignored when working offline.
+                Defaults to False.
+
+        Raises:
+            FileNotFoundError: File not available locally when working offline (or not available at all).
+            ValueError: File contents do not match the registered SHA-256 hash.
+
+        Returns:
+            Path: Local file path.
+        """
+        url = str(url)
+        scheme = urlparse(url).scheme
+        # Single-letter schemes are Windows drive letters.
+        if scheme in ["", "file"] or len(scheme) == 1:
+            path = _to_path(url)
+            if not path.exists():
+                raise FileNotFoundError(f"Input file `{url}` does not exist.")
+            return path
+
+        entry_dir = self.store_dir / hashlib.sha256(url.encode()).hexdigest()[:16]
+        metadata = _read_metadata(entry_dir)
+        if metadata:
+            if refresh and not self.offline:
+                # Revalidated against the remote itself, as mirrors may be out of date.
+                return self._download(url, entry_dir, metadata)
+            stored_file = entry_dir / metadata["filename"]
+            self._validate(url, stored_file, metadata["sha256"])
+            LOGGER.debug(f"Resolver | {url} | Loaded from store.")
+            return stored_file
+
+        for mirror in self.mirrors:
+            for candidate in _mirror_candidates(mirror, url):
+                if candidate.is_file():
+                    LOGGER.info(f"Resolver | {url} | Loaded from mirror {mirror}.")
+                    return self._store(url, entry_dir, candidate, etag=None)
+
+        if self.offline:
+            raise FileNotFoundError(
+                f"Input file `{url}` is not in the input store ({self.store_dir}) "
+                f"or any mirror ({self.mirrors}) and the resolver is working offline."
+            )
+        return self._download(url, entry_dir, metadata)
+
+    def _download(self, url: str, entry_dir: Path, metadata: dict) -> Path:
+        import requests
+
+        headers = {}
+        if metadata.get("etag") is not None:
+            headers["If-None-Match"] = metadata["etag"]
+        response = requests.get(url, headers=headers, timeout=60)
+        if response.status_code == 304:
+            LOGGER.info(f"Resolver | {url} | Unchanged on remote.")
+            stored_file = entry_dir / metadata["filename"]
+            self._validate(url, stored_file, metadata["sha256"])
+            return stored_file
+        response.raise_for_status()
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(response.content)
+        try:
+            LOGGER.info(f"Resolver | {url} | Downloaded.")
+            return self._store(
+                url, entry_dir, Path(f.name), etag=response.headers.get("ETag")
+            )
+        finally:
+            os.remove(f.name)
+
+    def _store(
+        self, url: str, entry_dir: Path, source: Path, etag: Optional[str]
+    ) -> Path:
+        sha256 = cache.file_hash(source)
+        self._validate(url, source, sha256)
+        filename = Path(unquote(urlparse(url).path)).name or "file"
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, entry_dir / filename)
+        metadata = {"url": url, "filename": filename, "sha256": sha256, "etag": etag}
+        (entry_dir / _METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+        return entry_dir / filename
+
+    def _validate(self, url: str, path: Path, stored_sha256: str) -> None:
+        actual = cache.file_hash(path)
+        for expected in [stored_sha256, self.checksums.get(url, actual)]:
+            if actual != expected:
+                raise ValueError(
+                    f"Input file `{url}` resolved to `{path}` has SHA-256 hash {actual}, "
+                    f"expected {expected}."
+                )
+
+
+def resolve(url: str | Path, refresh: bool = False) -> Path:
+    """Resolve `url` to a local file using a resolver configured by environment variables (see `InputResolver.from_env`)."""
+    return InputResolver.from_env().resolve(url, refresh=refresh)
+
+
+def _to_path(url: str | Path) -> Path:
+    parsed = urlparse(str(url))
+    if parsed.scheme == "file":
+        return Path(url2pathname(parsed.netloc + parsed.path))
+    return Path(url)
+
+
+def _mirror_candidates(mirror: Path, url: str) -> list[Path]:
+    parsed = urlparse(url)
+    url_path = unquote(parsed.path).lstrip("/")
+    return [mirror / parsed.netloc / url_path, mirror / Path(url_path).name]
+
+
+def _read_metadata(entry_dir: Path) -> dict:
+    try:
+        return json.loads((entry_dir / _METADATA_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,179 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+In-place re-parameterisation of built pathway models.
+
+Building the optimisation problem of a large pathway model can take longer than solving it.
+To run a scenario that only changes parameter values (e.g., a different cost trajectory or expansion rate limit),
+the model definition is re-initialised with the scenario applied (on top of any overrides the model was loaded with)
+and the differences in input data are applied to the built backend:
+
+1. Parameters whose values change where they were already defined are updated in place.
+2. Parameters that become (un)defined anywhere or change dimensions are re-added,
+and only the optimisation problem components that (recursively) depend on them are rebuilt.
+
+Scenarios that change the model math or dimensions (e.g., its nodes, techs or time resolution) require a new model.
+The re-parameterised model can then be re-solved with `model.solve(force=True, warmstart=True)`,
+warm-starting from the previous solution if the solver supports it.
+"""
+
+import logging
+import re
+from typing import Optional
+
+import numpy as np
+import xarray as xr
+from calliope import AttrDict
+from calliope.model import Model
+
+from calliope_pathways import compact
+from calliope_pathways.util import register_extensions
+
+LOGGER = logging.getLogger(__name__)
+
+_COMPONENT_GROUPS = ["variables", "global_expressions", "constraints", "objectives"]
+
+
+def apply_scenario(
+    model: Model, scenario: Optional[str] = None, override_dict: Optional[dict] = None
+) -> list[str]:
+    """Apply a scenario and/or overrides to the parameters of a built model, without rebuilding it from scratch.
+
+    Args:
+        model (Model): Built pathway model.
+        scenario (Optional[str], optional):
+            Comma-delimited string of pre-defined `scenarios` to apply, as in `calliope.Model(...)`. Defaults to None.
+        override_dict (Optional[dict], optional):
+            Additional overrides to apply after `scenario` overrides, as in `calliope.Model(...)`. Defaults to None.
+
+    Raises:
+        ValueError: Model has not been built or was not loaded from file.
+        ValueError: Scenario changes the model build configuration or dimensions.
+
+    Returns:
+        list[str]: Names of the parameters that have changed.
+    """
+    if not model._is_built:
+        raise ValueError("A scenario can only be applied in place to a built model.")
+    backend = model.backend
+    old_inputs = backend.inputs
+    new_inputs = scenario_inputs(model, scenario, override_dict)
+    changed = changed_parameters(old_inputs, new_inputs)
+    restructured = set()
+    for name in changed:
+        old = old_inputs.get(name, xr.DataArray(np.nan))
+        new = new_inputs.get(name, xr.DataArray(np.nan))
+        if old.dims == new.dims and (old.notnull() == new.notnull()).all():
+            backend.update_parameter(name, new)
+        else:
+            _replace_parameter(backend, name, new)
+            restructured.add(name)
+
+    components = _dependent_components(old_inputs.attrs["math"], restructured)
+    for group in _COMPONENT_GROUPS:
+        for name in old_inputs.attrs["math"][group]:
+            if name not in components:
+                continue
+            backend.delete_component(name, group)
+            getattr(backend, "add_" + group.removesuffix("s"))(name)
+    LOGGER.info(
+        f"Scenario | updated parameters {changed}; rebuilt components {sorted(components)}."
+    )
+
+    model._model_data = new_inputs
+    model._add_model_data_methods()
+    model._is_solved = False
+    return changed
+
+
+def scenario_inputs(
+    model: Model, scenario: Optional[str] = None, override_dict: Optional[dict] = None
+) -> xr.Dataset:
+    """Input data of a model re-initialised with a scenario and/or overrides applied.
+
+    Args:
+        model (Model): Pathway model loaded from file.
+        scenario (Optional[str], optional):
+            Comma-delimited string of pre-defined `scenarios` to apply instead of the scenario `model` was loaded with. Defaults to None.
+        override_dict (Optional[dict], optional):
+            Additional overrides to apply on top of those `model` was loaded with. Defaults to None.
+
+    Raises:
+        ValueError: Model was not loaded from file.
+        ValueError: Scenario changes the model build configuration or dimensions.
+
+    Returns:
+        xr.Dataset: Input data, with the math of `model`.
+    """
+    new_model = _reinitialise(model, scenario, override_dict)
+    if new_model.config["build"] != model.config["build"]:
+        raise ValueError(
+            "Scenarios that change the build configuration require a new model build."
+        )
+    inputs = model._model_data.filter_by_attrs(is_result=0)
+    new_inputs = compact.compact_investsteps(new_model._model_data)
+    if dict(new_inputs.sizes) != dict(inputs.sizes) or any(
+        not new_inputs[dim].equals(inputs[dim]) for dim in new_inputs.dims
+    ):
+        raise ValueError(
+            "Scenarios that change the model dimensions require a new model build."
+        )
+    new_inputs.attrs["math"] = model.math
+    return new_inputs
+
+
+def changed_parameters(inputs: xr.Dataset, new_inputs: xr.Dataset) -> list[str]:
+    """Names of parameters that differ between two sets of model input data, including those only defined in one of them."""
+    return [
+        name
+        for name in sorted(set(new_inputs.data_vars).union(inputs.data_vars))
+        if name not in inputs
+        or name not in new_inputs
+        or inputs[name].dims != new_inputs[name].dims
+        or not inputs[name].broadcast_equals(new_inputs[name])
+    ]
+
+
+def _reinitialise(
+    model: Model, scenario: Optional[str], override_dict: Optional[dict]
+) -> Model:
+    """Re-initialise the model definition of `model` with `scenario` replacing its scenario and `override_dict` applied on top of its overrides."""
+    if model._model_def_path is None:
+        raise ValueError(
+            "A scenario can only be applied in place to a model loaded from file."
+        )
+    register_extensions()
+    init_kwargs = dict(getattr(model, "_init_kwargs", {}))
+    overrides = AttrDict(init_kwargs.pop("override_dict", None) or {})
+    overrides.union(AttrDict(override_dict or {}), allow_override=True)
+    if scenario is not None:
+        init_kwargs["scenario"] = scenario
+    return Model(model._model_def_path, override_dict=overrides, **init_kwargs)
+
+
+def _replace_parameter(backend, name: str, values: xr.DataArray) -> None:
+    default = backend.inputs.attrs["defaults"].get(name, np.nan)
+    backend.delete_component(name, "parameters")
+    if values.isnull().all():
+        backend.inputs = backend.inputs.drop_vars(name, errors="ignore")
+        backend.add_parameter(name, xr.DataArray(default), default)
+    else:
+        backend.inputs[name] = values
+        backend.add_parameter(name, values, default)
+
+
+def _dependent_components(math: AttrDict, names: set[str]) -> set[str]:
+    """Names of math components that reference any of `names`, directly or through other components."""
+    dependents: set[str] = set()
+    references = set(names)
+    while references:
+        pattern = re.compile(r"\b(" + "|".join(map(re.escape, references)) + r")\b")
+        references = {
+            name
+            for group in _COMPONENT_GROUPS
+            for name, component in math[group].items()
+            if name not in dependents and pattern.search(AttrDict(component).to_yaml())
+        }
+        dependents.update(references)
+    return dependents
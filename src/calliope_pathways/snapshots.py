@@ -0,0 +1,115 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Snapshots of fully initialised models, for near-instant re-initialisation.
+
+A snapshot stores the model data of an initialised model in the on-disk cache (`<cache root>/snapshots`, see `calliope_pathways.cache`),
+with numeric arrays stored such that they are memory-mapped on load (see `calliope_pathways.batch.write_shared_inputs`).
+Loading a snapshot skips parsing YAML and CSV files, pre-processing, and resampling timeseries.
+
+Snapshots are keyed by a fingerprint of the contents of every file in the model definition directory
+(YAML files and data sources), the package math and parameter schema, the keyword arguments the model is initialised with,
+and the versions of Calliope and this package.
+Changing any of them results in a new snapshot, with stale snapshots evicted least-recently-used first.
+"""
+
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Any, Callable
+
+from calliope import __version__ as calliope_version
+from calliope.model import Model
+
+from calliope_pathways import batch, cache
+from calliope_pathways._version import __version__
+from calliope_pathways.util import register_extensions, src_dir_ref
+
+LOGGER = logging.getLogger(__name__)
+
+NAMESPACE = "snapshots"
+_MODEL_DATA_DIR = "model_data"
+_METADATA_FILE = "metadata.pkl"
+
+
+def snapshot_key(model_dir: str | Path, *parts: Any, **kwargs) -> str:
+    """Fingerprint of everything that affects the initialised model.
+
+    Args:
+        model_dir (str | Path): Model definition directory. The contents of all files in it are fingerprinted.
+        *parts (Any): Any other JSON-serialisable (or `str`-able) inputs that affect the model (e.g., pre-processing cache keys).
+        **kwargs: Keyword arguments the model is initialised with.
+
+    Raises:
+        ValueError: `kwargs` are not JSON-serialisable.
+
+    Returns:
+        str: Snapshot key.
+    """
+    try:
+        json.dumps(kwargs, sort_keys=True)
+    except TypeError as err:
+        raise ValueError(
+            f"Models can only be snapshot if initialised with JSON-serialisable keyword arguments: {err}"
+        ) from err
+    return cache.fingerprint(
+        _dir_hashes(model_dir),
+        _dir_hashes(src_dir_ref("math")),
+        _dir_hashes(src_dir_ref("config")),
+        parts,
+        kwargs,
+        calliope_version,
+        __version__,
+    )
+
+
+def load_or_init(key: str, init: Callable[[], Model]) -> Model:
+    """Load a model from its snapshot, initialising it and storing its snapshot first if there is none.
+
+    Args:
+        key (str): Snapshot key (see `snapshot_key`).
+        init (Callable[[], Model]): Function initialising the model. Only called if there is no snapshot.
+
+    Returns:
+        Model: Initialised model, with numeric input arrays memory-mapped read-only.
+    """
+    entry_dir = cache.cached_directory(
+        NAMESPACE, key, lambda path: _write(init(), path)
+    )
+    return _read(entry_dir)
+
+
+def _write(model: Model, path: Path) -> None:
+    batch.write_shared_inputs(model._model_data, path / _MODEL_DATA_DIR)
+    metadata = {
+        "model_def_path": model._model_def_path,
+        "model_def_dict": getattr(model, "_model_def_dict", None),
+        "init_kwargs": getattr(model, "_init_kwargs", {}),
+    }
+    with open(path / _METADATA_FILE, "wb") as f:
+        pickle.dump(metadata, f)
+
+
+def _read(path: Path) -> Model:
+    register_extensions()
+    with open(path / _METADATA_FILE, "rb") as f:
+        metadata = pickle.load(f)
+    model = Model(batch.read_shared_inputs(path / _MODEL_DATA_DIR))
+    model._model_def_path = metadata["model_def_path"]
+    if metadata["model_def_dict"] is not None:
+        model._model_def_dict = metadata["model_def_dict"]
+    model._init_kwargs = metadata["init_kwargs"]
+    LOGGER.info(f"Snapshot | Loaded model `{model.name}` from {path}.")
+    return model
+
+
+def _dir_hashes(path: str | Path) -> dict[str, str]:
+    """Content hash of every file in a directory, keyed by path relative to it."""
+    path = Path(path)
+    return {
+        file.relative_to(path).as_posix(): cache.file_hash(file)
+        for file in sorted(path.rglob("*"))
+        if file.is_file() and "__pycache__" not in file.parts
+    }
@@ -0,0 +1,416 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Synthetic pathway models of controllable size, for scaling experiments.
+
+A synthetic model has `nodes` nodes, each with demand and all supply, storage and conversion technologies,
+connected by `transmission_links` links per carrier.
+Nodes are laid out on a ring and links connect the nearest nodes first (by default, only neighbouring nodes).
+
+Timeseries are hourly and generated deterministically from `seed`:
+
+- demand (`sink_use_equals`) with daily and seasonal cycles, scaled per node and grown per investstep (`sink_use_growth`).
+- solar and wind capacity factors (`source_use_max` with `source_unit: per_cap`) per node.
+
+Supply technologies cycle through dispatchable (with initial capacity and fuel costs), solar and wind.
+Conversion technologies convert each carrier to the next one.
+
+Vintage availability (`available_vintages`) follows one of the `VINTAGE_PATTERNS`, given each technology's lifetime:
+
+- `lifetime`: vintages are fully available until they reach their lifetime.
+- `linear`: vintages are decommissioned linearly over their lifetime.
+- `permanent`: vintages are never decommissioned.
+
+Models can be generated in memory (`calliope_pathways.models.synthetic`) or written to file (`write`).
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from calliope import AttrDict
+
+from calliope_pathways.util import src_dir_ref
+
+LOGGER = logging.getLogger(__name__)
+
+VINTAGE_PATTERNS = ["lifetime", "linear", "permanent"]
+_SUPPLY_KINDS = ["dispatchable", "solar", "wind"]
+_FIRST_TIMESTEP = "2005-01-01"
+
+
+def model_definition(
+    nodes: int = 4,
+    supply_techs: int = 3,
+    storage_techs: int = 1,
+    conversion_techs: int = 0,
+    transmission_links: Optional[int] = None,
+    carriers: int = 1,
+    timesteps: int = 168,
+    investsteps: int = 4,
+    first_year: int = 2020,
+    investstep_resolution: int = 10,
+    vintage_pattern: str = "lifetime",
+    seed: int = 0,
+) -> tuple[AttrDict, dict[str, pd.DataFrame]]:
+    """Generate a synthetic pathway model definition.
+
+    Args:
+        nodes (int, optional): Number of nodes. Defaults to 4.
+        supply_techs (int, optional): Number of supply technologies at each node. Defaults to 3.
+        storage_techs (int, optional): Number of storage technologies at each node. Defaults to 1.
+        conversion_techs (int, optional): Number of conversion technologies at each node. Defaults to 0.
+        transmission_links (Optional[int], optional):
+            Number of transmission links per carrier.
+            Defaults to None (a ring connecting all nodes).
+        carriers (int, optional): Number of carriers, each with its own demand. Defaults to 1.
+        timesteps (int, optional): Number of hourly timesteps. Defaults to 168.
+        investsteps (int, optional): Number of investsteps. Defaults to 4.
+        first_year (int, optional): Year of the first investstep. Defaults to 2020.
+        investstep_resolution (int, optional): Years between investsteps. Defaults to 10.
+        vintage_pattern (str, optional): Vintage availability pattern, one of `VINTAGE_PATTERNS`. Defaults to "lifetime".
+        seed (int, optional): Seed of the random generation of timeseries and technology characteristics. Defaults to 0.
+
+    Raises:
+        ValueError: Number of nodes or carriers is less than one.
+        ValueError: Conversion technologies are requested with a single carrier.
+        ValueError: More transmission links are requested than there are pairs of nodes.
+        ValueError: Unknown vintage pattern.
+
+    Returns:
+        tuple[AttrDict, dict[str, pd.DataFrame]]:
+            Model definition and the in-memory data sources it references
+            (to be passed as `data_source_dfs` to `calliope.Model`).
+    """
+    if nodes < 1 or carriers < 1:
+        raise ValueError("Synthetic models need at least one node and carrier.")
+    if conversion_techs and carriers < 2:
+        raise ValueError("Conversion technologies need at least two carriers.")
+    node_pairs = _node_pairs(nodes)
+    if transmission_links is None:
+        transmission_links = min(nodes, len(node_pairs))
+    if transmission_links > len(node_pairs):
+        raise ValueError(
+            f"Cannot connect {nodes} nodes with {transmission_links} transmission links."
+        )
+    if vintage_pattern not in VINTAGE_PATTERNS:
+        raise ValueError(
+            f"Unknown vintage pattern `{vintage_pattern}`; expected one of {VINTAGE_PATTERNS}."
+        )
+
+    rng = np.random.default_rng(seed)
+    node_names = [f"node{i}" for i in range(nodes)]
+    carrier_names = [f"carrier{i}" for i in range(carriers)]
+    years = [first_year + i * investstep_resolution for i in range(investsteps)]
+    timestep_index = pd.date_range(_FIRST_TIMESTEP, periods=timesteps, freq="h")
+    peak_demand = {
+        carrier: pd.Series(rng.lognormal(np.log(1000), 0.5, nodes), index=node_names)
+        for carrier in carrier_names
+    }
+
+    techs = AttrDict()
+    for i, carrier in enumerate(carrier_names):
+        techs[f"demand{i}"] = {
+            "base_tech": "demand",
+            "carrier_in": carrier,
+            "sink_use_growth": {
+                "data": [round(1.1**i, 3) for i in range(investsteps)],
+                "index": years,
+                "dims": "investsteps",
+            },
+        }
+    for i in range(supply_techs):
+        techs[f"{_SUPPLY_KINDS[i % 3]}{i}"] = _supply_tech(
+            _SUPPLY_KINDS[i % 3],
+            carrier_names[i % carriers],
+            sum(peak_demand[carrier_names[i % carriers]]),
+            years,
+            rng,
+        )
+    for i in range(storage_techs):
+        techs[f"storage{i}"] = _storage_tech(carrier_names[i % carriers], years, rng)
+    for i in range(conversion_techs):
+        techs[f"conversion{i}"] = _conversion_tech(
+            carrier_names[i % carriers], carrier_names[(i + 1) % carriers], years, rng
+        )
+    for carrier in carrier_names:
+        for a, b in node_pairs[:transmission_links]:
+            techs[f"transmission_{node_names[a]}_{node_names[b]}_{carrier}"] = (
+                _transmission_tech(carrier, node_names[a], node_names[b], years, rng)
+            )
+    # Demand capacity is bounded by vintages too, so it is never decommissioned.
+    lifetimes = {name: tech.get("lifetime", np.inf) for name, tech in techs.items()}
+    node_techs = {
+        name: None
+        for name, tech in techs.items()
+        if tech["base_tech"] != "transmission"
+    }
+
+    angles = 2 * np.pi * np.arange(nodes) / nodes
+    definition = AttrDict(
+        {
+            "config": {
+                "init": {
+                    "name": "Synthetic pathway model",
+                    "calliope_version": "0.7.0",
+                    "add_math": [(src_dir_ref("math") / "pathways.yaml").as_posix()],
+                },
+                "build": {"ensure_feasibility": True, "mode": "plan"},
+                "solve": {"solver": "cbc", "zero_threshold": 1e-10},
+            },
+            "parameters": {
+                "objective_cost_weights": {
+                    "data": 1,
+                    "index": ["monetary"],
+                    "dims": "costs",
+                },
+                "bigM": 1e6,
+                "investstep_resolution": {
+                    "data": investstep_resolution,
+                    "index": years,
+                    "dims": "investsteps",
+                },
+            },
+            "techs": techs,
+            "nodes": {
+                name: {
+                    "latitude": float(40 + np.sin(angle)),
+                    "longitude": float(np.cos(angle)),
+                    "techs": node_techs,
+                }
+                for name, angle in zip(node_names, angles)
+            },
+            "data_sources": {
+                "timeseries": {
+                    "source": "timeseries",
+                    "rows": "timesteps",
+                    "columns": ["nodes", "techs", "parameters"],
+                },
+                "vintage_availability": {
+                    "source": "vintage_availability",
+                    "rows": "techs",
+                    "columns": ["vintagesteps", "investsteps"],
+                    "add_dimensions": {"parameters": "available_vintages"},
+                },
+            },
+        }
+    )
+    data_sources = {
+        "timeseries": _timeseries(techs, peak_demand, timestep_index, rng),
+        "vintage_availability": _vintage_availability(
+            lifetimes, years, vintage_pattern
+        ),
+    }
+    LOGGER.info(
+        f"Synthetic model | {nodes} nodes, {len(techs)} techs, {timesteps} timesteps, {investsteps} investsteps."
+    )
+    return definition, data_sources
+
+
+def write(path: str | Path, **kwargs) -> Path:
+    """Write a synthetic pathway model definition to file.
+
+    Data sources are written to CSV files in a `data_sources` subdirectory.
+
+    Args:
+        path (str | Path): Directory to write the model to.
+        **kwargs: Passed on to `model_definition`.
+
+    Returns:
+        Path: Path to the model definition file (`model.yaml`), to load with `calliope_pathways.models.load(..., add_pathways_math=False)`.
+    """
+    path = Path(path)
+    (path / "data_sources").mkdir(parents=True, exist_ok=True)
+    definition, data_sources = model_definition(**kwargs)
+    for name, df in data_sources.items():
+        source = f"data_sources/{name}.csv"
+        df.to_csv(path / source)
+        definition.data_sources[name].source = source
+    definition.to_yaml(path / "model.yaml")
+    return path / "model.yaml"
+
+
+def _node_pairs(nodes: int) -> list[tuple[int, int]]:
+    """All pairs of nodes on a ring, nearest pairs first."""
+    return [
+        (i, (i + distance) % nodes)
+        for distance in range(1, nodes // 2 + 1)
+        for i in range(nodes if 2 * distance < nodes else nodes // 2)
+    ]
+
+
+def _vintage_costs(cost: float, decline: float, years: list[int]) -> dict:
+    """Monetary cost per vintagestep, declining by `decline` per investstep."""
+    return {
+        "data": [cost * (1 - decline) ** i for i in range(len(years))],
+        "index": [["monetary", year] for year in years],
+        "dims": ["costs", "vintagesteps"],
+    }
+
+
+def _costs(**costs) -> dict:
+    """Monetary costs, with a 10% interest rate."""
+    return {
+        name: {"data": data, "index": "monetary", "dims": "costs"}
+        for name, data in {"cost_interest_rate": 0.1, **costs}.items()
+    }
+
+
+def _supply_tech(
+    kind: str,
+    carrier: str,
+    peak_demand: float,
+    years: list[int],
+    rng: np.random.Generator,
+) -> dict:
+    tech = {
+        "base_tech": "supply",
+        "carrier_out": carrier,
+        "lifetime": int(rng.integers(15, 41)),
+    }
+    if kind == "dispatchable":
+        decommissioned = np.linspace(1, 0, len(years) + 1)[:-1]
+        return {
+            **tech,
+            **_costs(),
+            "flow_out_eff": round(float(rng.uniform(0.35, 0.6)), 2),
+            "flow_ramping": 0.8,
+            "flow_cap_initial": round(peak_demand / 2, 1),
+            "available_initial_cap": {
+                "data": decommissioned.round(3).tolist(),
+                "index": years,
+                "dims": "investsteps",
+            },
+            "cost_flow_cap": _vintage_costs(float(rng.uniform(600, 900)), 0.02, years),
+            "cost_flow_in": {
+                "data": [0.02 * 1.1**i for i in range(len(years))],
+                "index": [["monetary", year] for year in years],
+                "dims": ["costs", "investsteps"],
+            },
+        }
+    return {
+        **tech,
+        **_costs(),
+        "source_unit": "per_cap",
+        "cost_flow_cap": _vintage_costs(float(rng.uniform(800, 1200)), 0.15, years),
+    }
+
+
+def _storage_tech(carrier: str, years: list[int], rng: np.random.Generator) -> dict:
+    return {
+        "base_tech": "storage",
+        "carrier_in": carrier,
+        "carrier_out": carrier,
+        "lifetime": int(rng.integers(10, 21)),
+        "flow_in_eff": 0.95,
+        "flow_out_eff": 0.95,
+        "flow_cap_per_storage_cap_max": 0.25,
+        "storage_loss": 0.0001,
+        **_costs(),
+        "cost_storage_cap": _vintage_costs(float(rng.uniform(150, 250)), 0.2, years),
+    }
+
+
+def _conversion_tech(
+    carrier_in: str, carrier_out: str, years: list[int], rng: np.random.Generator
+) -> dict:
+    return {
+        "base_tech": "conversion",
+        "carrier_in": carrier_in,
+        "carrier_out": carrier_out,
+        "lifetime": int(rng.integers(20, 31)),
+        "flow_out_eff": round(float(rng.uniform(0.7, 0.95)), 2),
+        **_costs(),
+        "cost_flow_cap": _vintage_costs(float(rng.uniform(300, 600)), 0.05, years),
+    }
+
+
+def _transmission_tech(
+    carrier: str,
+    node_from: str,
+    node_to: str,
+    years: list[int],
+    rng: np.random.Generator,
+) -> dict:
+    return {
+        "base_tech": "transmission",
+        "from": node_from,
+        "to": node_to,
+        "carrier_in": carrier,
+        "carrier_out": carrier,
+        "lifetime": int(rng.integers(30, 51)),
+        "flow_out_eff": 0.95,
+        **_costs(),
+        "cost_flow_cap": _vintage_costs(float(rng.uniform(100, 300)), 0.01, years),
+    }
+
+
+def _timeseries(
+    techs: AttrDict,
+    peak_demand: dict[str, pd.Series],
+    timestep_index: pd.DatetimeIndex,
+    rng: np.random.Generator,
+) -> pd.DataFrame:
+    """Demand and renewable capacity factor timeseries at each node, as a (timesteps x [nodes, techs, parameters]) table."""
+    node_names = next(iter(peak_demand.values())).index
+    shape = (len(timestep_index), len(node_names))
+    hours = timestep_index.hour.values[:, None]
+    days = (timestep_index.normalize() - timestep_index[0].normalize()).days.values
+    columns = {}
+    for name, tech in techs.items():
+        if tech["base_tech"] == "demand":
+            profile = (
+                0.75
+                + 0.15 * np.sin(2 * np.pi * (hours - 9) / 24)
+                + 0.1
+                * np.cos(2 * np.pi * timestep_index.dayofyear.values[:, None] / 365)
+                + rng.normal(0, 0.02, shape)
+            )
+            parameter = "sink_use_equals"
+            values = peak_demand[tech["carrier_in"]].values[None, :] * profile
+        elif name.startswith("solar"):
+            clear_sky = rng.uniform(0.3, 1, (days[-1] + 1, len(node_names)))
+            parameter = "source_use_max"
+            values = (
+                np.maximum(np.sin(2 * np.pi * (hours - 6) / 24), 0) * clear_sky[days]
+            )
+        elif name.startswith("wind"):
+            parameter = "source_use_max"
+            values = np.clip(
+                0.35 + 0.01 * np.cumsum(rng.normal(0, 1, shape), axis=0), 0, 1
+            )
+        else:
+            continue
+        for node, node_values in zip(node_names, values.T):
+            columns[(node, name, parameter)] = node_values.round(4)
+    return pd.DataFrame(
+        columns, index=timestep_index.strftime("%Y-%m-%d %H:%M")
+    ).rename_axis(index="timesteps", columns=["nodes", "techs", "parameters"])
+
+
+def _vintage_availability(
+    lifetimes: dict[str, int], years: list[int], vintage_pattern: str
+) -> pd.DataFrame:
+    """Available fraction of each vintage in each investstep, as a (techs x [vintagesteps, investsteps]) table."""
+    columns = pd.MultiIndex.from_tuples(
+        [(vintage, year) for vintage in years for year in years if year >= vintage],
+        names=["vintagesteps", "investsteps"],
+    )
+    age = columns.get_level_values("investsteps") - columns.get_level_values(
+        "vintagesteps"
+    )
+    lifetime = np.array(list(lifetimes.values()))[:, None]
+    if vintage_pattern == "lifetime":
+        available = (age.values[None, :] < lifetime).astype(float)
+    elif vintage_pattern == "linear":
+        available = np.clip(1 - age.values[None, :] / lifetime, 0, 1)
+    else:
+        available = np.ones((len(lifetimes), len(columns)))
+    return pd.DataFrame(
+        available.round(3),
+        index=pd.Index(list(lifetimes), name="techs"),
+        columns=columns,
+    )
@@ -1,9 +1,15 @@
 import importlib.resources
+import threading
 from pathlib import Path
 
+import xarray as xr
 from calliope import AttrDict, util
+from calliope.model import Model
+from calliope.postprocess import postprocess as postprocess_results
 
 _SRC_DIR = importlib.resources.files("calliope_pathways")
+_REGISTRATION_LOCK = threading.Lock()
+_registered = False
 
 
 def src_dir_ref(dir: str | Path) -> Path:
@@ -11,10 +17,48 @@ def src_dir_ref(dir: str | Path) -> Path:
         return f / dir
 
 
+def register_extensions() -> None:
+    """Register pathways parameters with the Calliope model definition schema and pathways math helper functions.
+
+    This is deferred until it is needed (i.e., on initialising a model with `calliope_pathways.models`),
+    and is safe to call repeatedly and from multiple threads.
+    """
+    global _registered
+    if _registered:
+        return
+    with _REGISTRATION_LOCK:
+        if _registered:
+            return
+        # Helper functions are registered with Calliope on definition.
+        from calliope_pathways import helper_functions  # noqa: F401
+
+        _update_schema()
+        _registered = True
+
+
 def reset_schema():
     util.schema.reset()
+    _update_schema()
 
+
+def _update_schema() -> None:
     new_schema = AttrDict.from_yaml(src_dir_ref("config") / "new_param_schema.yaml")
 
     for key, new_params in new_schema.items():
         util.schema.update_model_schema(key, new_params, allow_override=False)
+
+
+def store_results(model: Model, results: xr.Dataset) -> None:
+    """Post-process optimisation results and store them in the model, replacing any existing results, as `model.solve()` would."""
+    results = postprocess_results.postprocess_model_results(
+        results, model._model_data, model._timings
+    )
+    model._model_data = model._model_data.drop_vars(
+        list(model._model_data.filter_by_attrs(is_result=1).data_vars)
+    )
+    model._model_data.attrs.update(results.attrs)
+    model._model_data = xr.merge(
+        [results, model._model_data], compat="override", combine_attrs="no_conflicts"
+    )
+    model._add_model_data_methods()
+    model._is_solved = True
@@ -0,0 +1,172 @@
+# Copyright (C) since 2024 Calliope pathways contributors listed in AUTHORS.
+# Licensed under the MIT License (see LICENSE file).
+
+"""
+Fast-fail validation of pathway model inputs.
+
+Inconsistent pathway inputs often only surface once the optimisation problem is built or solved (e.g., as an infeasible problem).
+`validate_inputs` checks model input data right after initialisation instead, with every check vectorised over whole input arrays.
+All violations are collected, with the coordinates at which they occur, so that they can be fixed at once.
+
+Checks:
+
+- `investstep_resolution` is defined and positive in every investstep.
+- No parameters are defined in investsteps / vintagesteps without an `investstep_resolution`,
+e.g., data indexed over years outside the investment horizon (which Calliope silently adds to the `investsteps` dimension).
+- Fractions (`available_initial_cap`, `available_vintages`) are within [0, 1].
+- Vintages are not available before they are built (`available_vintages` is zero where `vintagesteps` > `investsteps`).
+- Capacity limits and initial capacities are non-negative.
+"""
+
+import logging
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+LOGGER = logging.getLogger(__name__)
+
+FRACTIONS = ["available_initial_cap", "available_vintages"]
+NON_NEGATIVE = [
+    "flow_cap_initial",
+    "storage_cap_initial",
+    "source_cap_initial",
+    "area_use_initial",
+    "flow_cap_new_max",
+    "storage_cap_new_max",
+    "source_cap_new_max",
+    "area_use_new_max",
+    "flow_cap_new_max_rate",
+]
+# Number of coordinates listed per violation.
+MAX_COORDS = 10
+
+
+def validate_inputs(inputs: xr.Dataset) -> list[str]:
+    """Check pathway model inputs for inconsistencies.
+
+    Args:
+        inputs (xr.Dataset): Model input data.
+
+    Returns:
+        list[str]: Description of every violation, with the coordinates at which it occurs. Empty if inputs are valid.
+    """
+    if "investsteps" not in inputs.dims:
+        return []
+    return [violation for check in _CHECKS for violation in check(inputs)]
+
+
+def check_inputs(inputs: xr.Dataset) -> None:
+    """Check pathway model inputs for inconsistencies (see `validate_inputs`), raising an error listing all violations.
+
+    Args:
+        inputs (xr.Dataset): Model input data.
+
+    Raises:
+        ValueError: Inputs are invalid.
+    """
+    violations = validate_inputs(inputs)
+    if violations:
+        raise ValueError(
+            f"Invalid pathway model inputs ({len(violations)} violation(s)):\n"
+            + "\n".join(f"- {violation}" for violation in violations)
+        )
+    LOGGER.debug("Validation | Pathway model inputs are valid.")
+
+
+def _check_investstep_resolution(inputs: xr.Dataset) -> Iterator[str]:
+    if "investstep_resolution" not in inputs:
+        yield "investstep_resolution: not defined, so every investstep would represent a single year."
+        return
+    resolution = inputs.investstep_resolution.broadcast_like(inputs.investsteps)
+    yield from _violations("investstep_resolution", resolution.isnull(), "missing")
+    yield from _violations("investstep_resolution", resolution <= 0, "not positive")
+
+
+def _check_outside_horizon(inputs: xr.Dataset) -> Iterator[str]:
+    if "investstep_resolution" not in inputs:
+        return
+    horizon = inputs.investstep_resolution.broadcast_like(inputs.investsteps).notnull()
+    in_horizon = {
+        "investsteps": horizon,
+        "vintagesteps": xr.DataArray(
+            inputs.vintagesteps.isin(inputs.investsteps[horizon]).values,
+            coords={"vintagesteps": inputs.vintagesteps},
+        ),
+    }
+    for name, da in inputs.data_vars.items():
+        if name == "investstep_resolution":
+            continue
+        for dim, defined in in_horizon.items():
+            if dim not in da.dims:
+                continue
+            mask = da.notnull().any([d for d in da.dims if d != dim]) & ~defined
+            yield from _violations(
+                name,
+                mask,
+                "defined outside the investment horizon (without an `investstep_resolution`)",
+            )
+
+
+def _check_fractions(inputs: xr.Dataset) -> Iterator[str]:
+    for name in FRACTIONS:
+        if name in inputs:
+            da = inputs[name]
+            yield from _violations(name, (da < 0) | (da > 1), "outside [0, 1]")
+
+
+def _check_vintages(inputs: xr.Dataset) -> Iterator[str]:
+    if "available_vintages" not in inputs:
+        return
+    da = inputs.available_vintages
+    yield from _violations(
+        "available_vintages",
+        (da > 0) & (inputs.vintagesteps > inputs.investsteps),
+        "vintage available before it is built",
+    )
+
+
+def _check_non_negative(inputs: xr.Dataset) -> Iterator[str]:
+    for name in NON_NEGATIVE:
+        if name in inputs:
+            yield from _violations(name, inputs[name] < 0, "negative")
+
+
+_CHECKS: list[Callable[[xr.Dataset], Iterator[str]]] = [
+    _check_investstep_resolution,
+    _check_outside_horizon,
+    _check_fractions,
+    _check_vintages,
+    _check_non_negative,
+]
+
+
+def _violations(name: str, mask: xr.DataArray, problem: str) -> Iterator[str]:
+    """Describe a violation at the coordinates where `mask` is True, if any."""
+    if not mask.any():
+        return
+    if not mask.dims:
+        yield f"{name}: {problem}."
+        return
+    positions = np.argwhere(mask.values)
+    coords = [
+        ", ".join(
+            f"{dim}={_format(mask[dim].values[i])}"
+            for dim, i in zip(mask.dims, position)
+        )
+        for position in positions[:MAX_COORDS]
+    ]
+    if len(positions) > MAX_COORDS:
+        coords.append(f"... ({len(positions)} in total)")
+    yield f"{name}: {problem} at " + "; ".join(f"[{coord}]" for coord in coords) + "."
+
+
+def _format(value) -> str:
+    """Coordinate value as a string, with datetimes at the start of a year (i.e., investsteps / vintagesteps) given as the year."""
+    if isinstance(value, np.datetime64):
+        timestamp = pd.Timestamp(value)
+        if timestamp == pd.Timestamp(year=timestamp.year, month=1, day=1):
+            return str(timestamp.year)
+        return str(timestamp)
+    return str(value)
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dir(tmp_path_factory):
+    """Keep pre-processed data caches out of the user's cache directory."""
+    with pytest.MonkeyPatch.context() as mp:
+        cache_dir = tmp_path_factory.mktemp("cache")
+        mp.setenv("CALLIOPE_PATHWAYS_CACHE_DIR", str(cache_dir))
+        yield cache_dir
@@ -0,0 +1,87 @@
+import calliope
+import numpy as np
+import pytest
+import xarray as xr
+
+from calliope_pathways import batch, models
+
+
+@pytest.fixture(scope="module")
+def model():
+    return models.national_scale()
+
+
+@pytest.fixture(scope="module")
+def out_dir(model, tmp_path_factory):
+    out_dir = tmp_path_factory.mktemp("batch")
+    batch.run_batch(
+        model,
+        {"efficient": {"override_dict": {"techs.ccgt.flow_out_eff": 0.6}}},
+        out_dir,
+        processes=1,
+    )
+    return out_dir
+
+
+class TestSharedInputs:
+    @pytest.fixture(scope="class")
+    def inputs(self, model, tmp_path_factory):
+        path = tmp_path_factory.mktemp("inputs")
+        batch.write_shared_inputs(model.inputs, path)
+        return batch.read_shared_inputs(path)
+
+    def test_roundtrip(self, model, inputs):
+        xr.testing.assert_equal(inputs, model.inputs)
+        assert inputs.flow_cap_max.attrs == model.inputs.flow_cap_max.attrs
+
+    def test_attrs(self, model, inputs):
+        assert inputs.attrs["config"] == model.config
+        assert set(inputs.attrs["math"]["constraints"]) == set(model.math.constraints)
+
+    def test_memmapped(self, inputs):
+        assert isinstance(inputs.flow_cap_max.values.base, np.memmap)
+        assert not inputs.flow_cap_max.values.flags.writeable
+
+
+class TestRunBatch:
+    def test_results(self, out_dir):
+        model = calliope.read_netcdf(out_dir / "results" / "efficient.nc")
+        assert model.results.attrs["termination_condition"] == "optimal"
+        assert model.inputs.flow_out_eff.sel(techs="ccgt") == 0.6
+
+    def test_resume(self, model, out_dir):
+        path = out_dir / "results" / "efficient.nc"
+        modified = path.stat().st_mtime
+        paths = batch.run_batch(
+            model,
+            {"efficient": {"override_dict": {"techs.ccgt.flow_out_eff": 0.6}}},
+            out_dir,
+        )
+        assert paths == {"efficient": path}
+        assert path.stat().st_mtime == modified
+
+    def test_failed_run(self, model, out_dir):
+        paths = batch.run_batch(
+            model,
+            {"new_build_config": {"override_dict": {"config.build.mode": "operate"}}},
+            out_dir,
+            processes=1,
+        )
+        assert paths == {}
+
+    def test_only_changes_passed_to_workers(self, model):
+        inputs = model._model_data.filter_by_attrs(is_result=0)
+        changes, attrs = batch._scenario_changes(
+            model, inputs, {"override_dict": {"techs.ccgt.flow_out_eff": 0.6}}
+        )
+        assert list(changes) == ["flow_out_eff"]
+        assert changes["flow_out_eff"].sel(techs="ccgt") == 0.6
+        assert attrs["config"] == model.config
+
+    def test_inputs_of_new_base_model(self, model, tmp_path):
+        other = models.national_scale(override_dict={"techs.ccgt.flow_out_eff": 0.6})
+        batch.run_batch(model, {}, tmp_path)
+        batch.run_batch(other, {}, tmp_path)
+        (inputs_dir,) = (tmp_path / "inputs").iterdir()
+        inputs = batch.read_shared_inputs(inputs_dir)
+        assert inputs.flow_out_eff.sel(techs="ccgt") == 0.6
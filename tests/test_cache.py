@@ -0,0 +1,60 @@
+import time
+
+import pytest
+from calliope_pathways import cache
+
+
+@pytest.fixture
+def builder():
+    calls = []
+
+    def _builder(size=10):
+        def _build(data_dir):
+            calls.append(data_dir)
+            (data_dir / "data.csv").write_bytes(b"x" * size)
+
+        return _build
+
+    _builder.calls = calls
+    return _builder
+
+
+class TestCachedDirectory:
+    def test_builds_once(self, tmp_path, builder):
+        """A repeat request for the same key is a directory lookup only."""
+        first = cache.cached_directory("foo", "key", builder(), root=tmp_path)
+        second = cache.cached_directory("foo", "key", builder(), root=tmp_path)
+        assert first == second == tmp_path / "foo" / "key"
+        assert (first / "data.csv").exists()
+        assert len(builder.calls) == 1
+
+    def test_new_key_rebuilds(self, tmp_path, builder):
+        cache.cached_directory("foo", "key1", builder(), root=tmp_path)
+        cache.cached_directory("foo", "key2", builder(), root=tmp_path)
+        assert len(builder.calls) == 2
+
+    def test_failed_build_not_cached(self, tmp_path):
+        def _build(data_dir):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            cache.cached_directory("foo", "key", _build, root=tmp_path)
+        assert list((tmp_path / "foo").iterdir()) == []
+
+    def test_evict_least_recently_used(self, tmp_path, builder):
+        for key in ["a", "b"]:
+            cache.cached_directory("foo", key, builder(100), root=tmp_path)
+            time.sleep(0.01)
+        # Using "a" again makes "b" the least recently used entry.
+        cache.cached_directory("foo", "a", builder(100), root=tmp_path)
+        cache.cached_directory("foo", "c", builder(100), root=tmp_path, max_bytes=250)
+        assert sorted(i.name for i in (tmp_path / "foo").iterdir()) == ["a", "c"]
+
+    def test_never_evict_new_entry(self, tmp_path, builder):
+        cache.cached_directory("foo", "a", builder(100), root=tmp_path, max_bytes=10)
+        assert (tmp_path / "foo" / "a").exists()
+
+
+def test_fingerprint_stable():
+    assert cache.fingerprint(1, "a", [2.0]) == cache.fingerprint(1, "a", [2.0])
+    assert cache.fingerprint(1, "a", [2.0]) != cache.fingerprint(1, "a", [2.1])
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calliope_pathways import clustering, models
+
+N_CLUSTERS = {2020: 4, 2030: 4, 2040: 8, 2050: 8}
+
+
+@pytest.fixture(scope="module")
+def model_data():
+    return models.national_scale()._model_data
+
+
+@pytest.fixture(scope="module")
+def clusters(model_data):
+    return clustering.day_clusters(model_data, N_CLUSTERS)
+
+
+@pytest.fixture(scope="module")
+def clustered():
+    return clustering.cluster_days(models.national_scale(), N_CLUSTERS)
+
+
+class TestDayClusters:
+    def test_all_days_mapped(self, model_data, clusters):
+        assert len(clusters) == model_data.sizes["timesteps"]
+        assert len(clusters.columns) == model_data.sizes["investsteps"]
+
+    @pytest.mark.parametrize("investstep", N_CLUSTERS)
+    def test_n_clusters_per_investstep(self, clusters, investstep):
+        n_representative = clusters[pd.Timestamp(str(investstep))].nunique()
+        assert n_representative == N_CLUSTERS[investstep]
+
+    def test_representative_days_represent_themselves(self, clusters):
+        for _, days in clusters.items():
+            representative = days.unique()
+            assert (days.loc[representative].values == representative).all()
+
+    def test_deterministic(self, model_data, clusters):
+        pd.testing.assert_frame_equal(
+            clusters, clustering.day_clusters(model_data, N_CLUSTERS)
+        )
+
+    def test_too_many_clusters(self, model_data):
+        with pytest.raises(ValueError, match="Cannot cluster 365 days into 366"):
+            clustering.day_clusters(model_data, 366)
+
+
+class TestClusterDays:
+    def test_timesteps_reduced(self, clustered):
+        assert clustered.inputs.sizes["timesteps"] <= sum(N_CLUSTERS.values())
+
+    def test_weights_sum_to_all_days(self, clustered):
+        np.testing.assert_allclose(
+            clustered.inputs.timestep_weights.sum("timesteps"), 365
+        )
+
+    def test_weights_per_investstep(self, clustered):
+        n_weighted = (clustered.inputs.timestep_weights > 0).sum("timesteps")
+        assert n_weighted.values.tolist() == list(N_CLUSTERS.values())
+
+    def test_last_timestep_lookup(self, clustered):
+        inputs = clustered.inputs
+        assert (
+            inputs.lookup_cluster_last_timestep.dt.floor("D")
+            == inputs.timesteps.dt.floor("D")
+        ).all()
+
+    def test_link_storage_level_inactive(self, clustered):
+        assert clustered.math["constraints"]["link_storage_level"]["active"] is False
+
+    def test_solve(self, clustered):
+        clustered.build()
+        clustered.solve()
+        assert clustered.results.attrs["termination_condition"] == "optimal"
+
+    def test_built_model(self, clustered):
+        with pytest.raises(ValueError, match="before building a model"):
+            clustering.cluster_days(clustered, 4)
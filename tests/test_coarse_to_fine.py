@@ -0,0 +1,68 @@
+import pytest
+
+from calliope_pathways import coarse_to_fine, models
+
+OVERRIDES = {"config.init.time_resample": "2D"}
+
+
+def _objective(model):
+    return float(
+        (
+            model.results.cost.sum(["nodes", "techs"])
+            * model.inputs.investstep_resolution
+        ).sum()
+    )
+
+
+@pytest.fixture(scope="module")
+def reference():
+    model = models.national_scale(override_dict=OVERRIDES)
+    model.build()
+    model.solve()
+    return _objective(model)
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["no_prune", "prune"])
+def model(request):
+    model = models.national_scale(override_dict=OVERRIDES)
+    coarse_to_fine.solve_coarse_to_fine(
+        model, coarse_resolution="1W", prune=request.param
+    )
+    return model
+
+
+class TestSolveCoarseToFine:
+    def test_solved(self, model):
+        assert model._is_solved
+        assert model.results.attrs["termination_condition"] == "optimal"
+        assert model.results.attrs["coarse_to_fine_resolution"] == "1W"
+        assert model.results.attrs["coarse_to_fine_iterations"] >= 1
+        # Pruned bounds are released once the reduced problem relies on unmet demand.
+        assert model.results.attrs["coarse_to_fine_pruned"] == 0
+
+    def test_full_resolution(self, model):
+        assert model.results.sizes["timesteps"] == model.inputs.sizes["timesteps"]
+
+    def test_objective(self, model, reference):
+        assert _objective(model) == pytest.approx(reference, rel=1e-6)
+
+
+class TestSolveCoarseToFineErrors:
+    @pytest.fixture(scope="class")
+    def model(self):
+        return models.national_scale(override_dict=OVERRIDES)
+
+    def test_not_coarser(self, model):
+        with pytest.raises(ValueError, match="not coarser than the model resolution"):
+            coarse_to_fine.solve_coarse_to_fine(model, coarse_resolution="1D")
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"headroom": 0.5}, "Headroom must be at least 1"),
+            ({"max_iterations": 0}, "At least one iteration is required"),
+        ],
+    )
+    def test_invalid_settings(self, model, kwargs, match):
+        with pytest.raises(ValueError, match=match):
+            coarse_to_fine.solve_coarse_to_fine(model, **kwargs)
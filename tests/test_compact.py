@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import xarray as xr
+from calliope_pathways import compact
+
+
+@pytest.fixture
+def model_data():
+    investsteps = [2020, 2030, 2040]
+    base = xr.DataArray(
+        [[1.0, 2.0, np.nan], [0.0, 4.0, 5.0]],
+        coords={"nodes": ["a", "b"], "timesteps": [0, 1, 2]},
+    )
+    growth = xr.DataArray([1.0, 1.5, 2.0], coords={"investsteps": investsteps})
+    return xr.Dataset(
+        {
+            "invariant": base.expand_dims(investsteps=investsteps).assign_attrs(
+                is_result=0
+            ),
+            "varying": xr.DataArray(
+                [1.0, 2.0, 4.0], coords={"investsteps": investsteps}
+            ).assign_attrs(is_result=0),
+            "sink_use_equals": (base * growth).assign_attrs(is_result=0),
+            "no_investsteps": base.assign_attrs(is_result=0),
+        }
+    )
+
+
+class TestCompactInveststeps:
+    def test_drop_invariant(self, model_data):
+        compacted = compact.compact_investsteps(model_data)
+        assert compacted.invariant.dims == ("nodes", "timesteps")
+        assert compacted.invariant.attrs["is_result"] == 0
+
+    def test_keep_varying(self, model_data):
+        compacted = compact.compact_investsteps(model_data)
+        assert compacted.varying.dims == ("investsteps",)
+
+    def test_factorise_growth(self, model_data):
+        compacted = compact.compact_investsteps(model_data)
+        assert compacted.sink_use_equals.dims == ("nodes", "timesteps")
+        assert compacted.sink_use_growth.dims == ("investsteps",)
+        xr.testing.assert_allclose(
+            (compacted.sink_use_equals * compacted.sink_use_growth).transpose(
+                *model_data.sink_use_equals.dims
+            ),
+            model_data.sink_use_equals,
+        )
+
+    def test_no_growth_if_not_proportional(self, model_data):
+        model_data["sink_use_equals"][dict(investsteps=2, nodes=0, timesteps=0)] = 10
+        compacted = compact.compact_investsteps(model_data)
+        assert "sink_use_growth" not in compacted
+        assert "investsteps" in compacted.sink_use_equals.dims
+
+    def test_no_growth_if_user_defined(self, model_data):
+        model_data["sink_use_growth"] = xr.DataArray(
+            [1.0, 1.0, 1.0], coords={"investsteps": model_data.investsteps}
+        )
+        compacted = compact.compact_investsteps(model_data)
+        assert "investsteps" in compacted.sink_use_equals.dims
+
+    def test_no_investsteps(self, model_data):
+        model_data = model_data.drop_dims("investsteps")
+        assert compact.compact_investsteps(model_data) is model_data
+
+
+class TestPruneVintages:
+    @pytest.fixture
+    def model_data(self):
+        return xr.Dataset(
+            {
+                "available_vintages": xr.DataArray(
+                    [[1.0, np.nan], [0.0, 1.0]],
+                    coords={"investsteps": [2020, 2030], "vintagesteps": [2020, 2030]},
+                ).assign_attrs(is_result=0)
+            }
+        )
+
+    def test_zero_pruned(self, model_data):
+        pruned = compact.prune_vintages(model_data)
+        assert pruned.available_vintages.count() == 2
+        assert pruned.available_vintages.sel(
+            investsteps=2030, vintagesteps=2020
+        ).isnull()
+        assert pruned.available_vintages.attrs["is_result"] == 0
+
+    def test_in_compaction(self, model_data):
+        compacted = compact.compact_investsteps(model_data)
+        assert compacted.available_vintages.count() == 2
+
+    def test_no_vintages(self):
+        model_data = xr.Dataset()
+        assert compact.prune_vintages(model_data) is model_data
@@ -0,0 +1,138 @@
+import calliope
+import pytest
+
+from calliope_pathways import decomposition, models
+
+OVERRIDES = {"config.init.time_resample": "1W"}
+
+
+def _objective(model):
+    return float(
+        (
+            model.results.cost.sum(["nodes", "techs"])
+            * model.inputs.investstep_resolution
+        ).sum()
+    )
+
+
+@pytest.fixture(scope="module")
+def model():
+    return models.national_scale()
+
+
+@pytest.fixture(scope="module")
+def split_math(model):
+    return decomposition.split_math(model.math)
+
+
+class TestSplitMath:
+    @pytest.mark.parametrize(
+        ("group", "name"),
+        [
+            ("variables", "flow_cap"),
+            ("variables", "flow_cap_new"),
+            ("global_expressions", "cost_investment"),
+            ("constraints", "flow_cap_bounding"),
+            ("constraints", "limit_flow_cap_new_max_rate"),
+        ],
+    )
+    def test_in_master(self, split_math, group, name):
+        assert name in split_math[0][group]
+
+    @pytest.mark.parametrize(
+        ("group", "name"),
+        [
+            ("variables", "flow_out"),
+            ("global_expressions", "cost_var"),
+            ("constraints", "flow_out_max"),
+            ("objectives", "min_cost_optimisation"),
+        ],
+    )
+    def test_only_in_subproblem(self, split_math, group, name):
+        assert name not in split_math[0][group]
+        assert split_math[1][group][name].get("active", True)
+
+    def test_master_variables_in_subproblem(self, split_math):
+        assert "flow_cap" in split_math[1]["variables"]
+
+    def test_master_expressions_inactive_in_subproblem(self, split_math):
+        assert split_math[1]["global_expressions"]["cost_investment"]["active"] is False
+
+    def test_master_constraints_not_in_subproblem(self, split_math):
+        assert "flow_cap_bounding" not in split_math[1]["constraints"]
+
+    def test_storage_link_in_master(self, split_math):
+        assert "link_storage_level" in split_math[0]["constraints"]
+        assert {"storage_investstep_start", "storage_investstep_end"}.issubset(
+            split_math[0]["variables"]
+        )
+        assert split_math[1]["constraints"]["link_storage_level"]["active"] is False
+
+    def test_storage_link_levels_in_subproblem(self, split_math):
+        expressions = split_math[1]["global_expressions"]
+        assert {"storage_investstep_start", "storage_investstep_end"}.issubset(
+            expressions
+        )
+
+    def test_other_investstep_links(self, model):
+        math = model.math.copy()
+        math.set_key(
+            "constraints.link_flow_out",
+            {
+                "foreach": ["nodes", "techs", "carriers", "timesteps", "investsteps"],
+                "equations": [
+                    {"expression": "flow_out <= roll(flow_out, investsteps=1)"}
+                ],
+            },
+        )
+        with pytest.raises(ValueError, match="constraints:link_flow_out"):
+            decomposition.split_math(math)
+
+
+def test_linking_variables(model, split_math):
+    linking = decomposition._linking_variables(
+        split_math[1], list(split_math[0]["variables"])
+    )
+    assert {
+        "flow_cap",
+        "storage_cap",
+        "storage_investstep_start",
+        "storage_investstep_end",
+    }.issubset(linking)
+    assert "flow_cap_new" not in linking
+
+
+def test_no_investsteps():
+    model = models.load(
+        calliope.examples._EXAMPLE_MODEL_DIR / "national_scale" / "model.yaml",
+        add_pathways_math=False,
+    )
+    with pytest.raises(ValueError, match="requires a model with `investsteps`"):
+        decomposition.solve_benders(model)
+
+
+class TestSolveBenders:
+    @pytest.fixture(scope="class")
+    def reference(self):
+        model = models.national_scale(override_dict=OVERRIDES)
+        model.build()
+        model.solve()
+        return _objective(model)
+
+    @pytest.fixture(scope="class")
+    def solved(self):
+        model = models.national_scale(override_dict=OVERRIDES)
+        decomposition.solve_benders(model, max_iterations=60)
+        return model
+
+    def test_converged(self, solved):
+        assert solved.results.attrs["termination_condition"] == "optimal"
+        assert solved.results.attrs["benders_gap"] <= 1e-4
+
+    def test_objective(self, solved, reference):
+        assert _objective(solved) == pytest.approx(reference, rel=1e-4)
+
+    def test_no_unmet_demand(self, solved):
+        assert "unmet_demand" not in solved.results or bool(
+            (solved.results.unmet_demand.fillna(0) == 0).all()
+        )
@@ -0,0 +1,95 @@
+import netCDF4
+import numpy as np
+import pytest
+import xarray as xr
+
+from calliope_pathways import export, models
+
+
+@pytest.fixture(scope="module")
+def solved():
+    model = models.national_scale()
+    model.build()
+    model.solve()
+    return model
+
+
+@pytest.fixture(scope="module")
+def streamed(tmp_path_factory):
+    model = models.national_scale()
+    model.build()
+    path = export.solve_to_netcdf(
+        model, tmp_path_factory.mktemp("export") / "results.nc"
+    )
+    return model, path
+
+
+class TestSolveToNetcdf:
+    def test_results_not_loaded(self, streamed):
+        model, _ = streamed
+        assert model._model_data.attrs["termination_condition"] == "optimal"
+        assert not model.results.data_vars
+
+    def test_all_results_written(self, solved, streamed):
+        _, path = streamed
+        with xr.open_dataset(path) as results:
+            assert set(results.data_vars) == {
+                name
+                for group in ["variables", "global_expressions"]
+                for name, da in solved.backend._dataset.filter_by_attrs(
+                    obj_type=group
+                ).items()
+                if da.notnull().any()
+            }
+
+    @pytest.mark.parametrize("name", ["flow_out", "storage", "flow_cap", "cost"])
+    def test_results_match_solve(self, solved, streamed, name):
+        _, path = streamed
+        with xr.open_dataset(path) as results:
+            np.testing.assert_allclose(
+                results[name].transpose(*solved.results[name].dims).fillna(0),
+                solved.results[name].fillna(0),
+                atol=1e-8,
+            )
+
+    def test_chunked_and_compressed(self, streamed):
+        _, path = streamed
+        with netCDF4.Dataset(path) as store:
+            variable = store["flow_out"]
+            chunks = dict(zip(variable.dimensions, variable.chunking()))
+            assert chunks["investsteps"] == 1
+            assert chunks["timesteps"] == 168
+            assert variable.filters()["zlib"]
+
+    def test_not_built(self, tmp_path):
+        with pytest.raises(ValueError, match="must be built"):
+            export.solve_to_netcdf(models.national_scale(), tmp_path / "results.nc")
+
+
+class TestWriteResults:
+    def test_selected_variables(self, solved, tmp_path):
+        path = export.write_results(
+            solved,
+            tmp_path / "results.nc",
+            variables=["flow_cap", "storage"],
+            chunks={"timesteps": 24},
+            complevel=9,
+        )
+        with netCDF4.Dataset(path) as store:
+            assert set(store.variables).difference(store.dimensions) == {
+                "flow_cap",
+                "storage",
+            }
+            chunks = dict(zip(store["storage"].dimensions, store["storage"].chunking()))
+            assert chunks["timesteps"] == 24
+            assert store["storage"].filters()["complevel"] == 9
+
+    def test_unknown_variable(self, solved, tmp_path):
+        with pytest.raises(ValueError, match="foo"):
+            export.write_results(solved, tmp_path / "results.nc", variables=["foo"])
+
+    def test_not_solved(self, tmp_path):
+        model = models.national_scale()
+        model.build()
+        with pytest.raises(ValueError, match="must be successfully solved"):
+            export.write_results(model, tmp_path / "results.nc")
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import threading
+
+import calliope
+import pytest
+
+from calliope_pathways import util
+
+
+def _imported_modules(code: str) -> set[str]:
+    """Heavy (optional) dependencies imported by running `code` in a fresh interpreter."""
+    check = "import sys; print(*(m for m in ['calliope', 'matplotlib', 'requests'] if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\n{check}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_import_is_lazy():
+    assert not _imported_modules("import calliope_pathways")
+
+
+def test_models_without_optional_dependencies():
+    imported = _imported_modules("import calliope_pathways\ncalliope_pathways.models")
+    assert imported == {"calliope"}
+
+
+def test_unknown_attribute():
+    import calliope_pathways
+
+    with pytest.raises(AttributeError, match="has no attribute 'foo'"):
+        calliope_pathways.foo
+
+
+def test_register_extensions_concurrently():
+    threads = [threading.Thread(target=util.register_extensions) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    util.register_extensions()
+    defaults = calliope.util.schema.extract_from_schema(
+        calliope.util.schema.MODEL_SCHEMA, "default"
+    )
+    assert defaults["flow_cap_initial"] == 0
+    assert "sum_vintages" in calliope.backend.helper_functions._registry["expression"]
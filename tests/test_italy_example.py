@@ -21,6 +21,16 @@ class TestStationary:
         assert "flow_cap_new" in m.backend.variables
         assert "storage_cap_new" in m.backend.variables
 
+    def test_in_memory_data_sources(self):
+        """Pre-processed data is passed to the model as data tables, not files."""
+        m = calliope_pathways.models.italy()
+        data_source_dfs = m._init_kwargs["data_source_dfs"]
+        for name in calliope_pathways.model_configs.parse_lombardi.OUTPUT_FILES:
+            assert (
+                m._init_kwargs["override_dict"][f"data_sources.{name}.source"] == name
+            )
+            assert name in data_source_dfs
+
     def test_first_year(self):
         """Test setting non-default first investment year."""
         m = calliope_pathways.models.italy(first_year=2030)
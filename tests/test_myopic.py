@@ -0,0 +1,58 @@
+import calliope
+import pytest
+import xarray as xr
+
+from calliope_pathways import models, myopic
+
+
+@pytest.fixture(scope="module")
+def model():
+    model = models.national_scale()
+    # Capacity added without foresight of the final investstep's phase-out could not be decommissioned early.
+    model._model_data = model._model_data.drop_vars("flow_cap_max_systemwide")
+    myopic.solve_myopic(model, foresight=2)
+    return model
+
+
+class TestSolveMyopic:
+    def test_solved(self, model):
+        assert model._is_solved
+        assert model.results.attrs["termination_condition"] == "optimal"
+        assert model.results.attrs["myopic_foresight"] == 2
+
+    def test_all_investsteps(self, model):
+        xr.testing.assert_equal(model.results.investsteps, model.inputs.investsteps)
+        assert (
+            model.results.flow_out.notnull().any("timesteps").all("investsteps").any()
+        )
+
+    def test_flow_cap_from_vintages(self, model):
+        inputs = model.inputs
+        expected = (model.results.flow_cap_new * inputs.available_vintages).sum(
+            "vintagesteps"
+        ) + inputs.flow_cap_initial.fillna(0) * inputs.available_initial_cap.fillna(0)
+        flow_cap = model.results.flow_cap
+        xr.testing.assert_allclose(
+            flow_cap.fillna(0),
+            expected.where(flow_cap.notnull()).fillna(0).transpose(*flow_cap.dims),
+            rtol=1e-6,
+        )
+
+    def test_no_investsteps(self):
+        model = models.load(
+            calliope.examples._EXAMPLE_MODEL_DIR / "national_scale" / "model.yaml",
+            add_pathways_math=False,
+        )
+        with pytest.raises(ValueError, match="requires a model with `investsteps`"):
+            myopic.solve_myopic(model)
+
+    def test_no_foresight(self):
+        with pytest.raises(ValueError, match="Foresight must be at least one"):
+            myopic.solve_myopic(models.national_scale(), foresight=0)
+
+
+def test_limit_rate_by_previous_flow_cap():
+    math = models.national_scale().math.copy()
+    myopic._limit_rate_by_previous_flow_cap(math)
+    sub_expression = math.constraints.limit_flow_cap_new_max_rate.sub_expressions
+    assert sub_expression.prev_flow_cap[1].expression == "myopic_flow_cap_previous"
@@ -7,3 +7,15 @@ def test_solve_model():
     m.solve()
 
     assert m.results.termination_condition == "optimal"
+
+
+def test_unavailable_vintages_not_built():
+    m = calliope_pathways.models.national_scale()
+    m.build()
+    idx = dict(nodes="region1", techs="ccgt", carriers="power")
+    bounding = m.backend.get_constraint("flow_cap_bounding", as_backend_objs=False)
+    body = bounding.body.sel(investsteps="2050", **idx).item()
+    flow_cap_new = m.backend.variables.flow_cap_new.sel(**idx)
+    # The 2020 ccgt vintage is no longer available in 2050.
+    assert str(flow_cap_new.sel(vintagesteps="2020").item()) not in body
+    assert str(flow_cap_new.sel(vintagesteps="2050").item()) in body
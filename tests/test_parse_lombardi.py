@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+import pytest
+from calliope_pathways.model_configs import parse_lombardi
+
+
+@pytest.fixture
+def tech_yml(tmp_path):
+    path = tmp_path / "techs.yaml"
+    path.write_text("techs:\n  short:\n    lifetime: 12\n  long:\n    lifetime: 30\n")
+    return path
+
+
+class TestParseAvailableVintages:
+    @pytest.mark.parametrize("option", ["cut", "share", "weibull"])
+    def test_only_valid_vintages(self, tech_yml, option):
+        df = parse_lombardi.parse_available_vintages(
+            tech_yml, [2020, 2030, 2040], option=option
+        )
+        assert df.columns.names == ["investsteps", "vintagesteps"]
+        assert all(i >= v for i, v in df.columns)
+        assert (df.xs(2020, axis=1, level="vintagesteps")[2020] == 1).all()
+
+    def test_cut(self, tech_yml):
+        df = parse_lombardi.parse_available_vintages(
+            tech_yml, [2020, 2030, 2040], option="cut"
+        )
+        assert df.loc["short"].tolist() == [1, 1, 0, 1, 1, 1]
+        assert df.loc["long"].tolist() == [1, 1, 1, 1, 1, 1]
+
+    def test_share(self, tech_yml):
+        df = parse_lombardi.parse_available_vintages(
+            tech_yml, [2020, 2030, 2040], option="share"
+        )
+        assert df.loc["short"].tolist() == [1, 1, 0.2, 1, 1, 1]
+
+    def test_share_irregular_spacing(self, tech_yml):
+        """The share of the final investstep depends on the years since the previous investstep."""
+        df = parse_lombardi.parse_available_vintages(
+            tech_yml, [2020, 2025, 2035, 2050], option="share"
+        )
+        assert df.loc["short", (2035, 2020)] == pytest.approx(0.7)
+        assert df.loc["short", (2050, 2035)] == pytest.approx(0.8)
+        assert df.loc["short", (2050, 2025)] == pytest.approx(2 / 15)
+        assert df.loc["long", (2050, 2020)] == 0
+
+    def test_weibull(self, tech_yml):
+        df = parse_lombardi.parse_available_vintages(
+            tech_yml, [2020, 2030, 2040, 2050], option="weibull"
+        )
+        from_2020 = df.xs(2020, axis=1, level="vintagesteps")
+        assert (np.diff(from_2020.values, axis=1) <= 0).all()
+        assert (from_2020.loc["short"] <= from_2020.loc["long"]).all()
+        assert ((df >= 0) & (df <= 1)).all(axis=None)
+
+    def test_invalid_option(self, tech_yml):
+        with pytest.raises(ValueError, match="Invalid option specified."):
+            parse_lombardi.parse_available_vintages(
+                tech_yml, [2020, 2030], option="foo"
+            )
+
+
+class TestParseAvailableInitialCap:
+    @pytest.fixture
+    def ini_cap_csv(self, tmp_path):
+        path = tmp_path / "ini_cap.csv"
+        path.write_text(
+            "nodes,techs,parameters,values\n"
+            "A,short,flow_cap_initial,1\n"
+            "A,short,storage_cap_initial,2\n"
+            "A,long,flow_cap_initial,1\n"
+            "B,long,flow_cap_initial,1\n"
+        )
+        return path
+
+    def test_single_sample(self, tech_yml, ini_cap_csv):
+        years = [2020, 2030, 2040]
+        df = parse_lombardi.parse_available_initial_cap(tech_yml, ini_cap_csv, years)
+        assert df.columns.tolist() == ["nodes", "techs", *years]
+        assert len(df) == 3
+        assert (df[2020] == 1).all()
+        assert (df[years].diff(axis=1).iloc[:, 1:] <= 0).all(axis=None)
+
+    def test_seeded(self, tech_yml, ini_cap_csv):
+        years = [2020, 2030, 2040]
+        df1 = parse_lombardi.parse_available_initial_cap(tech_yml, ini_cap_csv, years)
+        df2 = parse_lombardi.parse_available_initial_cap(tech_yml, ini_cap_csv, years)
+        assert df1.equals(df2)
+
+    def test_multiple_samples(self, tech_yml, ini_cap_csv):
+        years = [2020, 2030, 2040]
+        df = parse_lombardi.parse_available_initial_cap(
+            tech_yml, ini_cap_csv, years, samples=50
+        )
+        assert df.columns.tolist() == ["nodes", "techs", "samples", *years]
+        assert len(df) == 150
+        assert df["samples"].nunique() == 50
+        assert df.groupby(["nodes", "techs"])[2030].nunique().gt(1).all()
+
+    def test_in_memory(self, tech_yml, ini_cap_csv):
+        years = [2020, 2030, 2040]
+        df = parse_lombardi.parse_available_initial_cap(
+            tech_yml, pd.read_csv(ini_cap_csv), years
+        )
+        expected = parse_lombardi.parse_available_initial_cap(
+            tech_yml, ini_cap_csv, years
+        )
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_matches_scalar_weibull(self, tech_yml, ini_cap_csv):
+        years = [2020, 2030]
+        df = parse_lombardi.parse_available_initial_cap(
+            tech_yml, ini_cap_csv, years, samples=2
+        )
+        rng = np.random.default_rng(parse_lombardi.SEED)
+        shape = rng.uniform(parse_lombardi.BETA_MIN, parse_lombardi.BETA_MAX, (2, 3))
+        life = rng.uniform(
+            parse_lombardi.AGE_FACTOR_MIN, parse_lombardi.AGE_FACTOR_MAX, (2, 3)
+        )
+        expected = parse_lombardi._weibull(10, 12 * life[1, 0], shape[1, 0])
+        assert df.loc[3, 2030] == pytest.approx(expected)
+
+
+class TestParseCapMax:
+    def test_initial_cap_unchanged(self):
+        ini_cap = pd.DataFrame(
+            {
+                "nodes": ["A", "A", "B"],
+                "techs": ["short", "short", "long"],
+                "parameters": [
+                    "flow_cap_initial",
+                    "storage_cap_initial",
+                    "flow_cap_initial",
+                ],
+                "values": [1, 2, 3],
+            }
+        )
+        cap_max = parse_lombardi.parse_cap_max(ini_cap, ["short"])
+        assert cap_max.parameters.tolist() == ["flow_cap_max", "storage_cap_max"]
+        assert ini_cap.parameters.tolist()[0] == "flow_cap_initial"
+
+
+class TestTransform:
+    def test_transform_series(self):
+        series = pd.Series(["a", "b", "c", "a"], name="foo")
+        transformed = parse_lombardi.transform_series(
+            series, {"x": ["a", "b"], "y": ["c"]}
+        )
+        assert transformed.tolist() == ["x", "x", "y", "x"]
+        assert transformed.dtype == "string"
+
+    def test_transform_series_unmapped(self):
+        series = pd.Series(["a", "b", "b", "c"], name="foo")
+        with pytest.raises(ValueError, match=r"`foo`.*\{'b': 2, 'c': 1\}"):
+            parse_lombardi.transform_series(series, {"x": ["a"]})
+
+    def test_overlapping_groups(self):
+        with pytest.raises(ValueError, match="`a` is in more than one group"):
+            parse_lombardi.invert_grouping({"x": ["a"], "y": ["b", "a"]})
+
+    def test_transform_frame(self):
+        df = pd.DataFrame(
+            {"fuel": ["gas", "gas", "coal", "gas"], "tech": ["ccgt", "", "st", "st"]}
+        )
+        grouping = {
+            "ccgt": {"fuel": "gas", "tech": ["ccgt", ""], "other": True},
+            "coal": {"fuel": ["coal"], "tech": ["st"]},
+            "ocgt": {"fuel": "gas", "tech": "st"},
+        }
+        transformed = parse_lombardi.transform_frame(df, grouping, ["fuel", "tech"])
+        assert transformed.tolist() == ["ccgt", "ccgt", "coal", "ocgt"]
+
+    def test_transform_frame_unmapped(self):
+        df = pd.DataFrame({"fuel": ["gas", "oil", "oil"], "tech": ["ccgt", "st", "st"]})
+        grouping = {"ccgt": {"fuel": "gas", "tech": "ccgt"}}
+        with pytest.raises(ValueError, match=r"\{\('oil', 'st'\): 2\}"):
+            parse_lombardi.transform_frame(df, grouping, ["fuel", "tech"])
+
+
+class TestRunStages:
+    YEARS = [2020, 2030, 2040]
+
+    @pytest.mark.parametrize("processes", [True, False])
+    def test_independent_stages(self, processes):
+        stages = [
+            "vintage_availability_techs",
+            "vintage_availability_transmission",
+            "investstep_resolution",
+        ]
+        outputs, timings = parse_lombardi.run_stages(
+            self.YEARS, stages, processes=processes
+        )
+        assert set(outputs) == set(timings) == set(stages)
+        pd.testing.assert_frame_equal(
+            outputs["investstep_resolution"],
+            parse_lombardi.parse_investstep_resolution(self.YEARS),
+        )
+        pd.testing.assert_frame_equal(
+            outputs["vintage_availability_techs"],
+            parse_lombardi._vintage_availability_techs(self.YEARS),
+        )
+
+    def test_dependencies_first(self):
+        assert parse_lombardi._with_dependencies(
+            ["available_initial_cap_techs", "maximum_tech_capacities"]
+        ) == [
+            "initial_tech_capacities",
+            "available_initial_cap_techs",
+            "maximum_tech_capacities",
+        ]
+
+    def test_all_data_sources(self):
+        assert set(parse_lombardi.STAGES) == set(parse_lombardi.OUTPUT_FILES)
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError, match=r"\['foo'\]"):
+            parse_lombardi.run_stages(self.YEARS, ["foo"])
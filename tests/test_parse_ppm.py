@@ -0,0 +1,182 @@
+import ast
+import importlib
+import sys
+import types
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+import shapely
+from calliope_pathways import cache
+from calliope_pathways.model_configs import parse_lombardi
+
+MODULE = "calliope_pathways.model_configs.italy.pre_processing.parse_ppm"
+PPM_URL = "https://example.com/powerplants_{tag}.csv"
+
+
+def _set_column_name(df, name):
+    df.columns.name = name
+    return df
+
+
+@pytest.fixture(scope="module")
+def parse_ppm():
+    """`parse_ppm`, importable without `powerplantmatching` and with `parse_lombardi` imported as a script would."""
+    ppm = types.ModuleType("powerplantmatching")
+    ppm.__version__ = "0.0.0"
+    ppm.get_config = lambda: {"matched_data_url": PPM_URL}
+    ppm.utils = types.ModuleType("powerplantmatching.utils")
+    # As in powerplantmatching v0.5.
+    ppm.utils.projectID_to_dict = lambda df: df.assign(
+        projectID=df.projectID.apply(ast.literal_eval)
+    )
+    ppm.utils.set_column_name = _set_column_name
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, "powerplantmatching", ppm)
+        mp.setitem(sys.modules, "powerplantmatching.utils", ppm.utils)
+        mp.setitem(sys.modules, "parse_lombardi", parse_lombardi)
+        yield importlib.import_module(MODULE)
+        sys.modules.pop(MODULE)
+
+
+def _write_nuts(path, north="ITC4", south="ITF3"):
+    gpd.GeoDataFrame(
+        {
+            "NUTS_ID": ["IT", north, south],
+            "CNTR_CODE": ["IT", "IT", "IT"],
+            "LEVL_CODE": [0, 2, 2],
+            "NAME_LATN": ["Italia", north, south],
+        },
+        geometry=[
+            shapely.box(6, 36, 19, 47),
+            shapely.box(9, 45, 10, 46),
+            shapely.box(14, 40, 15, 41),
+        ],
+        crs="epsg:4326",
+    ).to_file(path, driver="GeoJSON")
+    return str(path)
+
+
+@pytest.fixture
+def nuts_file(tmp_path):
+    return _write_nuts(tmp_path / "nuts.geojson")
+
+
+@pytest.fixture
+def ppm_mirror(tmp_path, monkeypatch):
+    """The matched powerplantmatching dataset, resolved from a local mirror."""
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    pd.DataFrame(
+        {
+            "Name": ["Plant A", "Plant B"],
+            "Fueltype": ["Natural Gas", "Hydro"],
+            "Technology": ["CCGT", "Run-Of-River"],
+            "Country": ["Italy", "Italy"],
+            "Capacity": [400.0, 20.0],
+            "DateIn": [1990.0, np.nan],
+            "DateOut": [np.nan, np.nan],
+            "lat": [45.5, 40.5],
+            "lon": [9.5, 14.5],
+            "Volume_Mm3": [0.0, 1.5],
+            "projectID": ["{'OPSD': {'OEU1'}}", "{'JRC': {'H1', 'H2'}}"],
+        },
+        index=pd.Index([1, 2], name="id"),
+    ).to_csv(mirror / "powerplants_v0.0.0.csv")
+    monkeypatch.setenv("CALLIOPE_PATHWAYS_MIRRORS", str(mirror))
+    monkeypatch.setenv("CALLIOPE_PATHWAYS_OFFLINE", "1")
+    monkeypatch.setenv("CALLIOPE_PATHWAYS_CACHE_DIR", str(tmp_path / "cache"))
+    return mirror
+
+
+@pytest.fixture
+def plants():
+    return pd.DataFrame(
+        {
+            "Country": ["Italy"] * 3,
+            "lat": [45.5, 40.5, np.nan],
+            "lon": [9.5, 14.5, np.nan],
+        },
+        index=pd.Index([1, 2, 3], name="id"),
+    )
+
+
+def _assignments(nuts_file, nuts_level=2, countries=("IT",)):
+    key = cache.fingerprint(cache.file_hash(nuts_file), nuts_level, sorted(countries))
+    return pd.read_csv(
+        cache.cache_root() / "nuts_assignments" / key / "assignments.csv"
+    )
+
+
+class TestTransformPpmAddNuts:
+    def test_assigned(self, parse_ppm, plants, nuts_file):
+        result = parse_ppm.transform_ppm_add_nuts(plants, nuts_file)
+        assert result["NUTS_ID"].tolist()[:2] == ["ITC4", "ITF3"]
+
+    def test_assignments_reused(self, parse_ppm, plants, nuts_file, monkeypatch):
+        first = parse_ppm.transform_ppm_add_nuts(plants.iloc[:2], nuts_file)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("Stored assignments should be reused.")
+
+        monkeypatch.setattr(parse_ppm.gpd, "sjoin_nearest", _fail)
+        second = parse_ppm.transform_ppm_add_nuts(plants.iloc[:2], nuts_file)
+        pd.testing.assert_series_equal(first["NUTS_ID"], second["NUTS_ID"])
+
+    def test_nuts_content_changed(self, parse_ppm, plants, nuts_file):
+        parse_ppm.transform_ppm_add_nuts(plants, nuts_file)
+        _write_nuts(nuts_file, north="ITC1", south="ITF6")
+        result = parse_ppm.transform_ppm_add_nuts(plants, nuts_file)
+        assert result["NUTS_ID"].tolist()[:2] == ["ITC1", "ITF6"]
+
+    def test_nan_coordinates(self, parse_ppm, plants, nuts_file):
+        """Plants without a region are neither stored nor duplicated over repeated runs."""
+        for _ in range(3):
+            result = parse_ppm.transform_ppm_add_nuts(plants, nuts_file)
+            assert len(result) == len(plants)
+            assert result["NUTS_ID"].isna().tolist() == [False, False, True]
+        stored = _assignments(nuts_file)
+        assert stored["id"].tolist() == [1, 2]
+        assert stored["NUTS_ID"].notnull().all()
+
+
+class TestIngestPpm:
+    def test_units_in_schema(self, parse_ppm, ppm_mirror):
+        schema = pq.read_schema(parse_ppm.ingest_ppm())
+        assert schema.field("Capacity").metadata == {b"unit": b"MW"}
+        assert schema.field("Volume").metadata == {b"unit": b"m^3"}
+        assert schema.field("Country").metadata is None
+
+    def test_ingested_once(self, parse_ppm, ppm_mirror, monkeypatch):
+        path = parse_ppm.ingest_ppm()
+        monkeypatch.setattr(parse_ppm.pd, "read_csv", None)
+        assert parse_ppm.ingest_ppm() == path
+
+
+class TestExtractPpm:
+    def test_columns(self, parse_ppm, ppm_mirror):
+        plants = parse_ppm.extract_ppm(["Country", "Capacity"])
+        assert plants.columns.tolist() == ["Country", "Capacity"]
+        assert plants.columns.name == "Matched Data"
+        assert plants["Capacity"].pint.units == "megawatt"
+        assert plants["Capacity"].pint.magnitude.tolist() == [400.0, 20.0]
+
+    def test_project_ids(self, parse_ppm, ppm_mirror):
+        plants = parse_ppm.extract_ppm()
+        assert plants.loc[2, "projectID"] == {"JRC": {"H1", "H2"}}
+        assert plants["DateIn"].pint.units == "year"
+
+
+class TestIngestNuts:
+    def test_geoparquet(self, parse_ppm, nuts_file):
+        regions = gpd.read_parquet(parse_ppm.ingest_nuts(nuts_file))
+        assert regions["NUTS_ID"].tolist() == ["IT", "ITC4", "ITF3"]
+        assert regions.crs == "epsg:4326"
+
+    def test_load_level(self, parse_ppm, nuts_file):
+        regions = parse_ppm._load_nuts_regions(nuts_file, nuts_level=2)
+        assert regions["NUTS_ID"].tolist() == ["ITC4", "ITF3"]
+        assert regions.columns.tolist() == parse_ppm.NUTS_COLUMNS
+        assert regions.crs == "epsg:3857"
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from calliope_pathways import models, profiling
+
+GROUPS = ["variables", "global_expressions", "constraints", "objectives"]
+
+
+@pytest.fixture(scope="module")
+def profiled(tmp_path_factory):
+    path = tmp_path_factory.mktemp("profile") / "profile.json"
+    model = models.national_scale()
+    profile = profiling.profile_build(model, path=path, memory=False)
+    return model, profile, path
+
+
+class TestProfileBuild:
+    def test_all_components_profiled(self, profiled):
+        model, profile, _ = profiled
+        expected = ["inputs"] + [
+            name for group in GROUPS for name in model.backend.inputs.math[group]
+        ]
+        assert profile.index.tolist() == expected
+
+    def test_objects(self, profiled):
+        model, profile, _ = profiled
+        for name in model.backend.constraints:
+            assert (
+                profile.objects[name] == model.backend.constraints[name].notnull().sum()
+            )
+        assert profile.objects["min_cost_optimisation"] == 1
+
+    def test_where_elements(self, profiled):
+        model, profile, _ = profiled
+        assert profile.where_elements["flow_cap"] == (
+            model.inputs.sizes["nodes"]
+            * model.inputs.sizes["techs"]
+            * model.inputs.sizes["carriers"]
+            * model.inputs.sizes["investsteps"]
+        )
+        assert (profile.objects <= profile.where_elements.fillna(profile.objects)).all()
+
+    def test_no_memory(self, profiled):
+        _, profile, _ = profiled
+        assert "memory" not in profile.columns
+        assert (profile.time > 0).all()
+
+    def test_json(self, profiled):
+        _, profile, path = profiled
+        records = json.loads(path.read_text())
+        assert [record["component"] for record in records] == profile.index.tolist()
+
+    def test_model_built(self, profiled):
+        model, _, _ = profiled
+        assert model._is_built
+        with pytest.raises(ValueError, match="already has a built"):
+            profiling.profile_build(model)
+
+    def test_memory(self):
+        model = models.national_scale()
+        model._model_data = model._model_data.isel(timesteps=slice(0, 7))
+        profile = profiling.profile_build(model)
+        assert (profile.peak_memory >= profile.memory).all()
+        assert profile.peak_memory["inputs"] > 0
+
+    def test_operate_mode(self):
+        with pytest.raises(ValueError, match="not available in `operate` mode"):
+            profiling.profile_build(models.national_scale(), mode="operate")
@@ -0,0 +1,81 @@
+import numpy as np
+import pyomo.environ as pe
+import pytest
+
+from calliope_pathways import clustering, models, resampling
+
+RESOLUTIONS = {2040: "4h", 2050: "24h"}
+SCALE = {"timesteps": 72, "storage_techs": 1}
+
+
+def _objective(model):
+    model.build()
+    model.solve()
+    assert model.results.attrs["termination_condition"] == "optimal"
+    return pe.value(model.backend.objectives.min_cost_optimisation.item())
+
+
+@pytest.fixture(scope="module")
+def resampled():
+    return resampling.resample_investsteps(models.synthetic(SCALE), RESOLUTIONS)
+
+
+class TestApplyInveststepResolutions:
+    def test_timesteps_per_investstep(self, resampled):
+        n_timesteps = resampled.inputs.timestep_resolution.notnull().sum("timesteps")
+        assert n_timesteps.values.tolist() == [72, 72, 18, 3]
+
+    def test_resolution_covers_all_hours(self, resampled):
+        np.testing.assert_allclose(
+            resampled.inputs.timestep_resolution.sum("timesteps"), 72
+        )
+
+    def test_previous_timestep_lookup(self, resampled):
+        previous = resampled.inputs.lookup_investstep_previous_timestep.sel(
+            investsteps="2050-01-01"
+        ).dropna("timesteps")
+        assert previous.dt.day.values.tolist() == [3, 1, 2]
+
+    def test_final_timestep_lookup(self, resampled):
+        final = resampled.inputs.lookup_investstep_final_timestep.to_series().dropna()
+        assert len(final) == 4
+        assert final.index.get_level_values("timesteps").nunique() == 1
+
+    def test_finer_resolution(self):
+        with pytest.raises(ValueError, match="finer than the model resolution"):
+            resampling.resample_investsteps(
+                models.synthetic(
+                    SCALE, override_dict={"config.init.time_resample": "4h"}
+                ),
+                {2050: "1h"},
+            )
+
+    def test_clustered(self):
+        model = clustering.cluster_days(models.synthetic(SCALE), 2)
+        with pytest.raises(ValueError, match="clustered timeseries"):
+            resampling.resample_investsteps(model, RESOLUTIONS)
+
+
+class TestResampleInveststeps:
+    def test_same_as_uniform_resampling(self):
+        uniform = models.synthetic(
+            SCALE, override_dict={"config.init.time_resample": "4h"}
+        )
+        per_investstep = resampling.resample_investsteps(
+            models.synthetic(SCALE), {year: "4h" for year in [2020, 2030, 2040, 2050]}
+        )
+        assert np.isclose(_objective(per_investstep), _objective(uniform))
+
+    def test_smaller_problem(self, resampled):
+        _objective(resampled)
+        storage = resampled.backend.variables.storage.notnull()
+        assert storage.sum(["nodes", "techs", "timesteps"]).values.tolist() == [
+            4 * 72,
+            4 * 72,
+            4 * 18,
+            4 * 3,
+        ]
+
+    def test_built_model(self, resampled):
+        with pytest.raises(ValueError, match="before building a model"):
+            resampling.resample_investsteps(resampled, RESOLUTIONS)
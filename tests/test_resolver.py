@@ -0,0 +1,102 @@
+import hashlib
+import json
+
+import pytest
+
+from calliope_pathways import resolver
+
+URL = "https://example.com/data/locations.yaml"
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror_dir = tmp_path / "mirror"
+    mirror_dir.mkdir()
+    (mirror_dir / "locations.yaml").write_text("foo: 1")
+    return mirror_dir
+
+
+@pytest.fixture
+def offline_resolver(tmp_path, mirror):
+    return resolver.InputResolver(
+        store_dir=tmp_path / "store", mirrors=[mirror], offline=True
+    )
+
+
+class TestInputResolver:
+    def test_local_path(self, offline_resolver, mirror):
+        path = mirror / "locations.yaml"
+        assert offline_resolver.resolve(path) == path
+        assert offline_resolver.resolve(path.as_uri()) == path
+
+    def test_from_flat_mirror(self, offline_resolver):
+        path = offline_resolver.resolve(URL)
+        assert path.read_text() == "foo: 1"
+        assert path.is_relative_to(offline_resolver.store_dir)
+
+    def test_from_url_layout_mirror(self, tmp_path):
+        mirror_file = tmp_path / "mirror" / "example.com" / "data" / "locations.yaml"
+        mirror_file.parent.mkdir(parents=True)
+        mirror_file.write_text("bar: 2")
+        resolver_ = resolver.InputResolver(
+            store_dir=tmp_path / "store",
+            mirrors=[(tmp_path / "mirror").as_uri()],
+            offline=True,
+        )
+        assert resolver_.resolve(URL).read_text() == "bar: 2"
+
+    def test_store_used_without_mirror(self, offline_resolver, mirror, tmp_path):
+        """Once stored, mirrors and network are no longer needed."""
+        stored = offline_resolver.resolve(URL)
+        (mirror / "locations.yaml").unlink()
+        assert offline_resolver.resolve(URL) == stored
+
+    def test_offline_missing(self, tmp_path):
+        resolver_ = resolver.InputResolver(store_dir=tmp_path, offline=True)
+        with pytest.raises(FileNotFoundError, match="working offline"):
+            resolver_.resolve(URL)
+
+    def test_checksum_match(self, offline_resolver):
+        offline_resolver.register(URL, hashlib.sha256(b"foo: 1").hexdigest())
+        assert offline_resolver.resolve(URL).read_text() == "foo: 1"
+
+    def test_checksum_mismatch(self, offline_resolver):
+        offline_resolver.register(URL, "0" * 64)
+        with pytest.raises(ValueError, match="expected 0000"):
+            offline_resolver.resolve(URL)
+
+    def test_corrupted_store(self, offline_resolver):
+        offline_resolver.resolve(URL).write_text("foo: 2")
+        with pytest.raises(ValueError, match="SHA-256 hash"):
+            offline_resolver.resolve(URL)
+
+    def test_refresh_revalidates_remote_before_mirrors(
+        self, tmp_path, mirror, monkeypatch
+    ):
+        requests = pytest.importorskip("requests")
+        online_resolver = resolver.InputResolver(
+            store_dir=tmp_path / "store", mirrors=[mirror]
+        )
+        stored = online_resolver.resolve(URL)
+        metadata = resolver._read_metadata(stored.parent)
+        metadata["etag"] = '"v1"'
+        (stored.parent / "metadata.json").write_text(json.dumps(metadata))
+        (mirror / "locations.yaml").write_text("foo: stale")
+        calls = []
+
+        class NotModified:
+            status_code = 304
+
+        def get(url, headers, timeout):
+            calls.append(headers)
+            return NotModified()
+
+        monkeypatch.setattr(requests, "get", get)
+        assert online_resolver.resolve(URL, refresh=True).read_text() == "foo: 1"
+        assert calls == [{"If-None-Match": '"v1"'}]
+
+
+def test_resolver_from_env(monkeypatch, mirror):
+    monkeypatch.setenv("CALLIOPE_PATHWAYS_MIRRORS", str(mirror))
+    monkeypatch.setenv("CALLIOPE_PATHWAYS_OFFLINE", "1")
+    assert resolver.resolve(URL).read_text() == "foo: 1"
@@ -0,0 +1,73 @@
+import pytest
+
+from calliope_pathways import models, scenarios
+
+OVERRIDES = {
+    "techs.ccgt.flow_out_eff": 0.4,
+    "parameters.flow_cap_new_max_rate": {
+        "data": 2,
+        "index": [2020, 2030, 2040, 2050],
+        "dims": "investsteps",
+    },
+}
+
+
+def _objective(model):
+    return model.backend.objectives.min_cost_optimisation.item().expr()
+
+
+@pytest.fixture(scope="module")
+def model():
+    model = models.national_scale()
+    model.build()
+    model.solve()
+    return model
+
+
+@pytest.fixture(scope="module")
+def changed(model):
+    changed = scenarios.apply_scenario(model, override_dict=OVERRIDES)
+    model.solve(force=True)
+    return changed
+
+
+@pytest.fixture(scope="module")
+def expected():
+    model = models.national_scale(override_dict=OVERRIDES)
+    model.build()
+    model.solve()
+    return model
+
+
+class TestApplyScenario:
+    def test_changed(self, changed):
+        assert changed == ["flow_cap_new_max_rate", "flow_out_eff"]
+
+    def test_inputs_updated(self, model, changed):
+        assert model.inputs.flow_out_eff.sel(techs="ccgt") == 0.4
+        assert "flow_cap_new_max_rate" in model.inputs
+
+    def test_constraint_built(self, model, changed):
+        assert "limit_flow_cap_new_max_rate" in model.backend.constraints
+
+    def test_same_as_new_model(self, model, changed, expected):
+        assert _objective(model) == pytest.approx(_objective(expected))
+        assert sorted(model.backend.constraints) == sorted(expected.backend.constraints)
+
+    def test_change_build_config(self, model, changed):
+        with pytest.raises(ValueError, match="change the build configuration"):
+            scenarios.apply_scenario(
+                model, override_dict={"config.build.ensure_feasibility": False}
+            )
+
+    def test_not_built(self):
+        with pytest.raises(ValueError, match="to a built model"):
+            scenarios.apply_scenario(models.national_scale())
+
+
+def test_dependent_components():
+    math = models.national_scale().math
+    components = scenarios._dependent_components(math, {"cost_flow_cap"})
+    assert {"cost_investment_flow_cap", "cost_investment", "cost"}.issubset(components)
+    assert "min_cost_optimisation" in components
+    assert "flow_out_max" not in components
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from calliope_pathways import models, snapshots
+from calliope_pathways.util import src_dir_ref
+
+
+@pytest.fixture(scope="module")
+def model():
+    return models.national_scale()
+
+
+@pytest.fixture(scope="module")
+def snapshot_model():
+    models.national_scale(snapshot=True)
+    return models.national_scale(snapshot=True)
+
+
+class TestLoadOrInit:
+    def test_equal_to_initialised(self, model, snapshot_model):
+        xr.testing.assert_equal(snapshot_model._model_data, model._model_data)
+        assert snapshot_model.config == model.config
+        assert set(snapshot_model.math.constraints) == set(model.math.constraints)
+
+    def test_memmapped(self, snapshot_model):
+        assert isinstance(snapshot_model.inputs.flow_cap_max.values.base, np.memmap)
+
+    def test_reinitialisable(self, model, snapshot_model):
+        assert snapshot_model._model_def_path == model._model_def_path
+        assert snapshot_model._init_kwargs == model._init_kwargs
+
+    def test_init_only_on_miss(self, model):
+        calls = []
+
+        def init():
+            calls.append(1)
+            return model
+
+        key = snapshots.snapshot_key(
+            src_dir_ref("model_configs") / "national_scale", "test_init"
+        )
+        snapshots.load_or_init(key, init)
+        snapshots.load_or_init(key, init)
+        assert len(calls) == 1
+
+
+class TestSnapshotKey:
+    @pytest.fixture
+    def model_dir(self, tmp_path):
+        (tmp_path / "data_sources").mkdir()
+        (tmp_path / "model.yaml").write_text("foo: 1")
+        (tmp_path / "data_sources" / "data.csv").write_text("a,b\n1,2")
+        return tmp_path
+
+    def test_stable(self, model_dir):
+        assert snapshots.snapshot_key(model_dir, x=1) == snapshots.snapshot_key(
+            model_dir, x=1
+        )
+
+    def test_kwargs(self, model_dir):
+        assert snapshots.snapshot_key(model_dir, x=1) != snapshots.snapshot_key(
+            model_dir, x=2
+        )
+
+    def test_parts(self, model_dir):
+        assert snapshots.snapshot_key(model_dir, "a") != snapshots.snapshot_key(
+            model_dir, "b"
+        )
+
+    def test_file_contents(self, model_dir):
+        key = snapshots.snapshot_key(model_dir)
+        (model_dir / "data_sources" / "data.csv").write_text("a,b\n1,3")
+        assert snapshots.snapshot_key(model_dir) != key
+
+    def test_not_serialisable(self, model_dir):
+        with pytest.raises(ValueError, match="JSON-serialisable"):
+            snapshots.snapshot_key(model_dir, data_source_dfs={"a": pd.DataFrame()})
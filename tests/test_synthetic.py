@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from calliope_pathways import models, synthetic
+
+SCALE = {"nodes": 3, "carriers": 2, "conversion_techs": 1, "timesteps": 48}
+
+
+@pytest.fixture(scope="module")
+def model():
+    return models.synthetic(SCALE)
+
+
+class TestModelDefinition:
+    def test_deterministic(self):
+        _, first = synthetic.model_definition(**SCALE)
+        _, second = synthetic.model_definition(**SCALE)
+        for name, df in first.items():
+            pd.testing.assert_frame_equal(df, second[name])
+
+    def test_seed(self):
+        _, first = synthetic.model_definition(**SCALE)
+        _, second = synthetic.model_definition(**SCALE, seed=1)
+        assert not first["timeseries"].equals(second["timeseries"])
+
+    @pytest.mark.parametrize(
+        ("scale", "n_techs"),
+        [
+            ({}, 1 + 3 + 1 + 4),
+            ({"nodes": 2}, 1 + 3 + 1 + 1),
+            ({"nodes": 4, "transmission_links": 6}, 1 + 3 + 1 + 6),
+            ({"carriers": 3, "conversion_techs": 2}, 3 + 3 + 1 + 2 + 3 * 4),
+        ],
+    )
+    def test_techs(self, scale, n_techs):
+        definition, _ = synthetic.model_definition(**scale)
+        assert len(definition.techs) == n_techs
+
+    def test_capacity_factors(self):
+        _, data_sources = synthetic.model_definition(timesteps=8760)
+        capacity_factors = data_sources["timeseries"].xs(
+            "source_use_max", level="parameters", axis=1
+        )
+        assert capacity_factors.min().min() >= 0
+        assert capacity_factors.max().max() <= 1
+
+    @pytest.mark.parametrize(
+        ("vintage_pattern", "expected"),
+        [("lifetime", [1, 1, 0]), ("linear", [1, 0.5, 0]), ("permanent", [1, 1, 1])],
+    )
+    def test_vintage_pattern(self, vintage_pattern, expected):
+        available = synthetic._vintage_availability(
+            {"tech": 20}, [2020, 2030, 2040], vintage_pattern
+        )
+        assert available.loc["tech", 2020].tolist() == expected
+
+    @pytest.mark.parametrize(
+        ("scale", "message"),
+        [
+            ({"nodes": 0}, "at least one node"),
+            ({"conversion_techs": 1}, "at least two carriers"),
+            ({"nodes": 3, "transmission_links": 4}, "Cannot connect 3 nodes"),
+            ({"vintage_pattern": "foo"}, "Unknown vintage pattern"),
+        ],
+    )
+    def test_invalid(self, scale, message):
+        with pytest.raises(ValueError, match=message):
+            synthetic.model_definition(**scale)
+
+
+class TestSyntheticModel:
+    def test_dims(self, model):
+        assert model.inputs.sizes["nodes"] == 3
+        assert model.inputs.sizes["carriers"] == 2
+        assert model.inputs.sizes["timesteps"] == 48
+        assert model.inputs.sizes["investsteps"] == 4
+
+    def test_write(self, model, tmp_path):
+        path = synthetic.write(tmp_path, **SCALE)
+        loaded = models.load(path, add_pathways_math=False)
+        xr.testing.assert_equal(loaded.inputs, model.inputs)
+
+    def test_solve(self, model):
+        model.build()
+        model.solve()
+        assert model.results.attrs["termination_condition"] == "optimal"
+        assert np.isclose(model.results.unmet_demand.sum(), 0)
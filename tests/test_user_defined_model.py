@@ -1,6 +1,6 @@
 import calliope
 import pytest
-from calliope_pathways import models
+from calliope_pathways import models, util
 
 
 @pytest.fixture
@@ -16,6 +16,7 @@ def load_example_model():
 
 @pytest.fixture
 def schema_defaults():
+    util.register_extensions()
     return calliope.util.schema.extract_from_schema(
         calliope.util.schema.MODEL_SCHEMA, "default"
     )
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from calliope_pathways import models, validation
+
+YEARS = pd.to_datetime(["2020", "2030", "2040"])
+
+
+@pytest.fixture
+def inputs():
+    vintages = np.tril(np.ones((3, 3)))
+    return xr.Dataset(
+        {
+            "investstep_resolution": ("investsteps", [10.0, 10.0, 10.0]),
+            "available_initial_cap": (("techs", "investsteps"), [[1, 0.5, 0]]),
+            "available_vintages": (
+                ("techs", "investsteps", "vintagesteps"),
+                vintages[np.newaxis],
+            ),
+            "flow_cap_new_max": ("techs", [10.0]),
+        },
+        coords={"techs": ["a"], "investsteps": YEARS, "vintagesteps": YEARS},
+    )
+
+
+class TestValidateInputs:
+    def test_valid(self, inputs):
+        assert validation.validate_inputs(inputs) == []
+
+    def test_no_investsteps(self):
+        assert validation.validate_inputs(xr.Dataset({"foo": ("techs", [-1])})) == []
+
+    def test_missing_investstep_resolution(self, inputs):
+        inputs["investstep_resolution"][-1] = np.nan
+        assert validation.validate_inputs(inputs) == [
+            "investstep_resolution: missing at [investsteps=2040].",
+            "available_initial_cap: defined outside the investment horizon (without an `investstep_resolution`) at [investsteps=2040].",
+            "available_vintages: defined outside the investment horizon (without an `investstep_resolution`) at [investsteps=2040].",
+            "available_vintages: defined outside the investment horizon (without an `investstep_resolution`) at [vintagesteps=2040].",
+        ]
+
+    def test_undefined_investstep_resolution(self, inputs):
+        violations = validation.validate_inputs(
+            inputs.drop_vars("investstep_resolution")
+        )
+        assert violations == [
+            "investstep_resolution: not defined, so every investstep would represent a single year."
+        ]
+
+    def test_fractions(self, inputs):
+        inputs["available_initial_cap"][0, 0] = 1.5
+        assert validation.validate_inputs(inputs) == [
+            "available_initial_cap: outside [0, 1] at [techs=a, investsteps=2020]."
+        ]
+
+    def test_vintages_before_built(self, inputs):
+        inputs["available_vintages"][0, 0, 1:] = 0.5
+        assert validation.validate_inputs(inputs) == [
+            "available_vintages: vintage available before it is built at "
+            "[techs=a, investsteps=2020, vintagesteps=2030]; [techs=a, investsteps=2020, vintagesteps=2040]."
+        ]
+
+    def test_negative_scalar(self, inputs):
+        inputs["flow_cap_new_max_rate"] = -1.0
+        assert validation.validate_inputs(inputs) == [
+            "flow_cap_new_max_rate: negative."
+        ]
+
+    def test_coords_truncated(self, inputs):
+        inputs["available_initial_cap"] = xr.DataArray(
+            np.full((20, 3), 2.0), coords={"nodes": range(20), "investsteps": YEARS}
+        )
+        (violation,) = validation.validate_inputs(inputs)
+        assert violation.count("[nodes=") == validation.MAX_COORDS
+        assert violation.endswith("[... (60 in total)].")
+
+
+class TestCheckInputs:
+    def test_all_violations_raised(self, inputs):
+        inputs["investstep_resolution"][:] = -1
+        inputs["available_initial_cap"][0, 0] = -1
+        with pytest.raises(ValueError, match=r"2 violation\(s\)") as excinfo:
+            validation.check_inputs(inputs)
+        assert "investstep_resolution: not positive" in str(excinfo.value)
+        assert "available_initial_cap: outside [0, 1]" in str(excinfo.value)
+
+    def test_on_init(self):
+        """Data indexed over years outside the investment horizon fails on initialisation."""
+        with pytest.raises(ValueError, match="investsteps=2060"):
+            models.national_scale(
+                override_dict={
+                    "parameters.flow_cap_new_max_rate": {
+                        "data": 0.5,
+                        "index": [2060],
+                        "dims": "investsteps",
+                    }
+                }
+            )